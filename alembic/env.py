@@ -13,6 +13,16 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# DATABASE_URL (as used by the API/worker) overrides alembic.ini. Migrations
+# run synchronously, so async drivers are swapped for their sync counterparts.
+if os.getenv("DATABASE_URL"):
+    sync_url = (
+        os.environ["DATABASE_URL"]
+        .replace("+aiosqlite", "")
+        .replace("+asyncpg", "+psycopg2")
+    )
+    config.set_main_option("sqlalchemy.url", sync_url)
+
 target_metadata = None
 
 
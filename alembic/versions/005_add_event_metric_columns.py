@@ -0,0 +1,76 @@
+"""Add typed metric columns to session_stats
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Promote the commonly aggregated fields of the JSON `data` blob to real
+    # columns so cost/token rollups can use SUM/GROUP BY in SQL
+    op.add_column('session_stats', sa.Column('cost', sa.Float(), nullable=True))
+    op.add_column('session_stats', sa.Column('tokens', sa.Integer(), nullable=True))
+    op.add_column('session_stats', sa.Column('model', sa.Text(), nullable=True))
+    op.add_column('session_stats', sa.Column('backend', sa.Text(), nullable=True))
+    op.add_column('session_stats', sa.Column('duration_ms', sa.Integer(), nullable=True))
+    op.add_column('session_stats', sa.Column('phase', sa.Text(), nullable=True))
+    op.add_column('session_stats', sa.Column('tier', sa.Integer(), nullable=True))
+
+    # Backfill existing rows from the JSON blob
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("""
+            UPDATE session_stats
+            SET cost = (data::jsonb ->> 'cost')::float,
+                tokens = (data::jsonb ->> 'tokens')::integer,
+                model = data::jsonb ->> 'model',
+                backend = data::jsonb ->> 'backend',
+                duration_ms = (data::jsonb ->> 'duration_ms')::integer,
+                phase = data::jsonb ->> 'phase',
+                tier = (data::jsonb -> 'extra' ->> 'tier')::integer
+            WHERE data IS NOT NULL
+        """)
+    else:
+        # SQLite JSON1 functions
+        op.execute("""
+            UPDATE session_stats
+            SET cost = json_extract(data, '$.cost'),
+                tokens = json_extract(data, '$.tokens'),
+                model = json_extract(data, '$.model'),
+                backend = json_extract(data, '$.backend'),
+                duration_ms = json_extract(data, '$.duration_ms'),
+                phase = json_extract(data, '$.phase'),
+                tier = json_extract(data, '$.extra.tier')
+            WHERE data IS NOT NULL AND json_valid(data)
+        """)
+
+    op.create_index(
+        'idx_session_stats_type_timestamp', 'session_stats', ['event_type', 'timestamp']
+    )
+    op.create_index('idx_session_stats_model', 'session_stats', ['model'])
+    op.create_index('idx_session_stats_backend', 'session_stats', ['backend'])
+    op.create_index('idx_session_stats_phase', 'session_stats', ['phase'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_session_stats_phase', table_name='session_stats')
+    op.drop_index('idx_session_stats_backend', table_name='session_stats')
+    op.drop_index('idx_session_stats_model', table_name='session_stats')
+    op.drop_index('idx_session_stats_type_timestamp', table_name='session_stats')
+    op.drop_column('session_stats', 'tier')
+    op.drop_column('session_stats', 'phase')
+    op.drop_column('session_stats', 'duration_ms')
+    op.drop_column('session_stats', 'backend')
+    op.drop_column('session_stats', 'model')
+    op.drop_column('session_stats', 'tokens')
+    op.drop_column('session_stats', 'cost')
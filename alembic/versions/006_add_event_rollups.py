@@ -0,0 +1,86 @@
+"""Add materialized LLM call rollup tables
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from bisect import bisect_left
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match LATENCY_BUCKET_EDGES_MS in api/services/database.py
+LATENCY_BUCKET_EDGES_MS = [50.0 * 1.25 ** i for i in range(43)]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'event_rollups',
+        sa.Column('day', sa.Text(), nullable=False),
+        sa.Column('backend', sa.Text(), nullable=False, server_default=''),
+        sa.Column('model', sa.Text(), nullable=False, server_default=''),
+        sa.Column('phase', sa.Text(), nullable=False, server_default=''),
+        sa.Column('calls', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('tokens', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('cost', sa.Float(), nullable=False, server_default='0.0'),
+        sa.Column('duration_ms', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('day', 'backend', 'model', 'phase'),
+    )
+
+    histogram = op.create_table(
+        'event_latency_histogram',
+        sa.Column('day', sa.Text(), nullable=False),
+        sa.Column('backend', sa.Text(), nullable=False, server_default=''),
+        sa.Column('model', sa.Text(), nullable=False, server_default=''),
+        sa.Column('phase', sa.Text(), nullable=False, server_default=''),
+        sa.Column('bucket', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('day', 'backend', 'model', 'phase', 'bucket'),
+    )
+
+    # Backfill from existing cost_update events (uses the typed columns from 005)
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        day_expr = "to_char(timestamp, 'YYYY-MM-DD')"
+    else:
+        day_expr = "date(timestamp)"
+
+    op.execute(f"""
+        INSERT INTO event_rollups (day, backend, model, phase, calls, tokens, cost, duration_ms)
+        SELECT {day_expr},
+               COALESCE(backend, ''), COALESCE(model, ''), COALESCE(phase, ''),
+               COUNT(*), COALESCE(SUM(tokens), 0), COALESCE(SUM(cost), 0.0),
+               COALESCE(SUM(duration_ms), 0)
+        FROM session_stats
+        WHERE event_type = 'cost_update'
+        GROUP BY 1, 2, 3, 4
+    """)
+
+    counts = {}
+    result = bind.execute(sa.text(f"""
+        SELECT {day_expr}, COALESCE(backend, ''), COALESCE(model, ''),
+               COALESCE(phase, ''), duration_ms
+        FROM session_stats
+        WHERE event_type = 'cost_update' AND duration_ms IS NOT NULL
+    """))
+    for day, backend, model, phase, duration_ms in result:
+        key = (day, backend, model, phase, bisect_left(LATENCY_BUCKET_EDGES_MS, duration_ms))
+        counts[key] = counts.get(key, 0) + 1
+
+    if counts:
+        op.bulk_insert(histogram, [
+            {"day": d, "backend": b, "model": m, "phase": p, "bucket": k, "count": c}
+            for (d, b, m, p, k), c in counts.items()
+        ])
+
+
+def downgrade() -> None:
+    op.drop_table('event_latency_histogram')
+    op.drop_table('event_rollups')
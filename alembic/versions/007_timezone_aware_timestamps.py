@@ -0,0 +1,50 @@
+"""Use timezone-aware timestamp columns on PostgreSQL
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The service layer writes timezone-aware UTC datetimes. SQLite stores them
+# as text either way; PostgreSQL needs TIMESTAMP WITH TIME ZONE to accept them.
+TIMESTAMP_COLUMNS = {
+    'jobs': ['queued_at', 'started_at', 'completed_at', 'error_timestamp', 'last_heartbeat'],
+    'session_stats': ['timestamp'],
+    'config': ['updated_at'],
+}
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table, column,
+                type_=sa.DateTime(timezone=True),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table, column,
+                type_=sa.DateTime(),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
@@ -0,0 +1,30 @@
+"""Add shared rate-limit buckets
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'rate_limits',
+        sa.Column('bucket', sa.Text(), nullable=False),
+        sa.Column('request_tat', sa.Float(), nullable=False, server_default='0.0'),
+        sa.Column('token_tat', sa.Float(), nullable=False, server_default='0.0'),
+        sa.PrimaryKeyConstraint('bucket'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rate_limits')
@@ -0,0 +1,28 @@
+"""Add structured SEO metadata to jobs
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Validated SEO phase output, stored as JSON (see api.models.job.SEOMetadata)
+    op.add_column(
+        'jobs',
+        sa.Column('seo_metadata', sa.Text(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('jobs', 'seo_metadata')
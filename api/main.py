@@ -108,12 +108,12 @@ async def health():
 
 
 # Register routers
-from api.routers import jobs, queue, config
+from api.routers import jobs, queue, config, analytics
 app.include_router(queue.router, prefix="/api/queue", tags=["queue"])
 app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
 app.include_router(config.router, prefix="/api", tags=["config"])
+app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
 
 # Additional routers will be added here as they're implemented:
-# from api.routers import system, analytics
+# from api.routers import system
 # app.include_router(system.router, prefix="/api/system", tags=["system"])
-# app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
@@ -89,6 +89,15 @@ class PhaseUpdate(BaseModel):
     metadata: Optional[Dict[str, Any]] = None
 
 
+class SEOMetadata(BaseModel):
+    """Structured SEO phase output, validated before it is stored."""
+    title: str = Field(..., min_length=1, max_length=60, description="Keyword-rich title")
+    short_description: str = Field(..., min_length=1, max_length=150, description="1-2 sentence summary")
+    long_description: str = Field(..., min_length=1, description="2-3 paragraph description")
+    tags: List[str] = Field(..., min_length=1, max_length=20, description="Search keywords")
+    categories: List[str] = Field(default_factory=list, description="Content categories")
+
+
 class JobUpdate(BaseModel):
     """Schema for partial job updates (PATCH /jobs/{id})."""
     status: Optional[JobStatus] = None
@@ -103,6 +112,7 @@ class JobUpdate(BaseModel):
     airtable_record_id: Optional[str] = None
     airtable_url: Optional[str] = None
     media_id: Optional[str] = None
+    seo_metadata: Optional[SEOMetadata] = None
     phases: Optional[List[JobPhase]] = Field(None, description="Replace all phases")
     phase_update: Optional[PhaseUpdate] = Field(None, description="Update a single phase")
 
@@ -144,6 +154,7 @@ class Job(BaseModel):
     airtable_record_id: Optional[str] = Field(None, description="Airtable record ID (e.g., 'recXXXXXXXXXXXXXX')")
     airtable_url: Optional[str] = Field(None, description="Full URL to the Airtable record")
     media_id: Optional[str] = Field(None, description="Extracted media ID from filename (e.g., '2WLI1209HD')")
+    seo_metadata: Optional[SEOMetadata] = Field(None, description="Validated SEO phase output")
     outputs: Optional[JobOutputs] = Field(None, description="Output files from manifest")
 
     class Config:
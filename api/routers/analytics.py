@@ -0,0 +1,96 @@
+"""Analytics router for Editorial Assistant v3.0 API.
+
+Provides spend and throughput trends for LLM calls. All endpoints read the
+materialized rollup tables only, so response time does not grow with the
+number of logged events.
+"""
+from typing import Optional, List, Literal
+
+from fastapi import APIRouter, Query
+from pydantic import BaseModel
+
+from api.services import analytics
+
+
+router = APIRouter()
+
+
+class AnalyticsRow(BaseModel):
+    """Aggregated LLM call metrics for one group."""
+    day: Optional[str] = None
+    backend: Optional[str] = None
+    model: Optional[str] = None
+    phase: Optional[str] = None
+    calls: int
+    tokens: int
+    cost: float
+    avg_latency_ms: Optional[float] = None
+    p50_latency_ms: Optional[float] = None
+    p95_latency_ms: Optional[float] = None
+
+
+class AnalyticsResponse(BaseModel):
+    """Analytics rows for a time window."""
+    days: int
+    rows: List[AnalyticsRow]
+
+
+@router.get("/summary", response_model=AnalyticsRow)
+async def get_summary(
+    days: int = Query(default=30, ge=1, le=366, description="Window size in days"),
+) -> AnalyticsRow:
+    """Get total calls, tokens, cost and latency percentiles for the window.
+
+    Args:
+        days: Number of days to include, counting today
+
+    Returns:
+        Single aggregate row across all backends, models and phases
+    """
+    rows = await analytics.aggregate_rollups(group_by=(), days=days)
+    return AnalyticsRow(**rows[0])
+
+
+@router.get("/daily", response_model=AnalyticsResponse)
+async def get_daily(
+    days: int = Query(default=30, ge=1, le=366, description="Window size in days"),
+    backend: Optional[str] = Query(default=None, description="Filter by backend"),
+    model: Optional[str] = Query(default=None, description="Filter by model"),
+    phase: Optional[str] = Query(default=None, description="Filter by phase"),
+) -> AnalyticsResponse:
+    """Get per-day spend and throughput.
+
+    Args:
+        days: Number of days to include, counting today
+        backend: Optional backend filter
+        model: Optional model filter
+        phase: Optional phase filter
+
+    Returns:
+        One row per day that had LLM calls, oldest first
+    """
+    rows = await analytics.aggregate_rollups(
+        group_by=("day",), days=days, backend=backend, model=model, phase=phase,
+    )
+    return AnalyticsResponse(days=days, rows=[AnalyticsRow(**r) for r in rows])
+
+
+@router.get("/breakdown", response_model=AnalyticsResponse)
+async def get_breakdown(
+    group_by: Literal["backend", "model", "phase"] = Query(
+        default="model",
+        description="Dimension to group by",
+    ),
+    days: int = Query(default=30, ge=1, le=366, description="Window size in days"),
+) -> AnalyticsResponse:
+    """Get spend and throughput broken down by backend, model or phase.
+
+    Args:
+        group_by: Dimension to group by
+        days: Number of days to include, counting today
+
+    Returns:
+        One row per distinct value of the chosen dimension
+    """
+    rows = await analytics.aggregate_rollups(group_by=(group_by,), days=days)
+    return AnalyticsResponse(days=days, rows=[AnalyticsRow(**r) for r in rows])
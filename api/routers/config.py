@@ -4,8 +4,9 @@ Provides endpoints for viewing and updating LLM routing configuration.
 """
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 import json
+import os
 from pathlib import Path
 
 from api.services.llm import get_llm_client
@@ -71,7 +72,7 @@ class PhaseBackendsResponse(BaseModel):
 
 class RoutingConfigResponse(BaseModel):
     """Response with current routing configuration."""
-    tiers: List[str]
+    tiers: List[Union[str, List[str]]]  # A list entry holds equivalent backends
     tier_labels: List[str]
     duration_thresholds: List[DurationThreshold]
     phase_base_tiers: Dict[str, int]
@@ -91,12 +92,15 @@ def _save_config(config: dict) -> None:
     try:
         # Ensure directory exists
         CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with open(CONFIG_PATH, 'w') as f:
+        # Write then rename, so workers watching the file never read it half-written
+        tmp_path = CONFIG_PATH.with_suffix(".json.tmp")
+        with open(tmp_path, 'w') as f:
             json.dump(config, f, indent=2)
+        os.replace(tmp_path, CONFIG_PATH)
     except (IOError, OSError) as e:
         raise HTTPException(status_code=500, detail=f"Failed to save config: {e}")
 
-    # Reload the LLM client's config
+    # Reload this process's LLM client; workers pick the change up from the file
     llm = get_llm_client()
     llm.reload_config()
 
@@ -8,13 +8,14 @@ from pathlib import Path
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import PlainTextResponse
-from typing import List
+from typing import List, Optional
 
 from api.models.job import Job, JobUpdate, JobStatus
 from api.models.events import SessionEvent
 from api.services.database import (
     get_job,
     update_job,
+    transition_job,
     get_events_for_job,
 )
 
@@ -33,6 +34,35 @@ CANCELLABLE_STATES = {
 }
 
 
+async def _transition_or_raise(
+    job_id: int,
+    allowed_from: set,
+    to: JobStatus,
+    action: str,
+    done: str,
+    fields: Optional[dict] = None,
+) -> Job:
+    """Apply a control transition, mapping failure to 404/400.
+
+    The transition is a single conditional UPDATE; the job is only re-read
+    when it fails, to tell a missing job from an invalid state.
+    """
+    updated_job = await transition_job(job_id, allowed_from, to, fields)
+    if updated_job is not None:
+        return updated_job
+
+    job = await get_job(job_id)
+
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    raise HTTPException(
+        status_code=400,
+        detail=f"Cannot {action} job in status '{job.status}'. "
+               f"Only {', '.join(s.value for s in allowed_from)} jobs can be {done}."
+    )
+
+
 @router.get("/{job_id}", response_model=Job)
 async def get_job_detail(job_id: int):
     """Retrieve full details for a specific job.
@@ -93,22 +123,9 @@ async def pause_job(job_id: int):
     Raises:
         HTTPException: 404 if job not found, 400 if invalid state transition
     """
-    job = await get_job(job_id)
-
-    if job is None:
-        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
-
-    if job.status not in PAUSEABLE_STATES:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Cannot pause job in status '{job.status}'. "
-                   f"Only {', '.join(s.value for s in PAUSEABLE_STATES)} jobs can be paused."
-        )
-
-    job_update = JobUpdate(status=JobStatus.paused)
-    updated_job = await update_job(job_id, job_update)
-
-    return updated_job
+    return await _transition_or_raise(
+        job_id, PAUSEABLE_STATES, JobStatus.paused, "pause", "paused"
+    )
 
 
 @router.post("/{job_id}/resume", response_model=Job)
@@ -127,22 +144,9 @@ async def resume_job(job_id: int):
     Raises:
         HTTPException: 404 if job not found, 400 if invalid state transition
     """
-    job = await get_job(job_id)
-
-    if job is None:
-        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
-
-    if job.status not in RESUMABLE_STATES:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Cannot resume job in status '{job.status}'. "
-                   f"Only {', '.join(s.value for s in RESUMABLE_STATES)} jobs can be resumed."
-        )
-
-    job_update = JobUpdate(status=JobStatus.pending)
-    updated_job = await update_job(job_id, job_update)
-
-    return updated_job
+    return await _transition_or_raise(
+        job_id, RESUMABLE_STATES, JobStatus.pending, "resume", "resumed"
+    )
 
 
 @router.post("/{job_id}/retry", response_model=Job)
@@ -161,27 +165,11 @@ async def retry_job(job_id: int):
     Raises:
         HTTPException: 404 if job not found, 400 if invalid state transition
     """
-    job = await get_job(job_id)
-
-    if job is None:
-        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
-
-    if job.status not in RETRYABLE_STATES:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Cannot retry job in status '{job.status}'. "
-                   f"Only {', '.join(s.value for s in RETRYABLE_STATES)} jobs can be retried."
-        )
-
-    # Reset to pending and clear error
-    job_update = JobUpdate(
-        status=JobStatus.pending,
-        error_message="",  # Clear error message
-        current_phase=None,  # Reset phase
+    # Reset to pending, clear error and phase
+    return await _transition_or_raise(
+        job_id, RETRYABLE_STATES, JobStatus.pending, "retry", "retried",
+        fields={"error_message": "", "current_phase": None},
     )
-    updated_job = await update_job(job_id, job_update)
-
-    return updated_job
 
 
 @router.post("/{job_id}/cancel", response_model=Job)
@@ -200,22 +188,9 @@ async def cancel_job(job_id: int):
     Raises:
         HTTPException: 404 if job not found, 400 if invalid state transition
     """
-    job = await get_job(job_id)
-
-    if job is None:
-        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
-
-    if job.status not in CANCELLABLE_STATES:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Cannot cancel job in status '{job.status}'. "
-                   f"Only {', '.join(s.value for s in CANCELLABLE_STATES)} jobs can be cancelled."
-        )
-
-    job_update = JobUpdate(status=JobStatus.cancelled)
-    updated_job = await update_job(job_id, job_update)
-
-    return updated_job
+    return await _transition_or_raise(
+        job_id, CANCELLABLE_STATES, JobStatus.cancelled, "cancel", "cancelled"
+    )
 
 
 @router.get("/{job_id}/events", response_model=List[SessionEvent])
@@ -2,14 +2,17 @@
 
 Provides CRUD operations for the job queue.
 """
+import asyncio
 import logging
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
 from api.models.job import Job, JobCreate, JobStatus, JobUpdate
 from api.services import database
 from api.services.airtable import AirtableClient
+from api.services.llm import get_llm_client
+from api.services.paths import find_transcript
 from api.services.utils import extract_media_id
 
 logger = logging.getLogger(__name__)
@@ -25,6 +28,51 @@ class DuplicateJobResponse(BaseModel):
     action_required: str
 
 
+class TranscriptEstimate(BaseModel):
+    """Pre-flight token, cost and latency estimate for one transcript."""
+    transcript_file: str
+    input_tokens: int
+    output_tokens: int
+    estimated_cost: float
+    estimated_seconds: float
+    estimated_duration_minutes: float
+    exceeds_cost_cap: bool
+    phases: Dict[str, Dict[str, Any]]
+
+
+class EstimateRequest(BaseModel):
+    """Transcripts to estimate (POST /queue/estimate)."""
+    transcript_files: List[str]
+
+
+class EstimateResponse(BaseModel):
+    """Per-transcript estimates and batch totals."""
+    estimates: List[TranscriptEstimate]
+    missing: List[str]
+    total_cost: float
+    total_seconds: float
+
+
+def _read_transcript_file(transcript_file: str) -> Optional[str]:
+    """Read a queued transcript file, or None if it can't be found."""
+    path = find_transcript(transcript_file)
+    if path is None:
+        return None
+    return path.read_text(encoding="utf-8", errors="replace")
+
+
+async def _estimate_transcript_file(transcript_file: str) -> Optional[dict]:
+    """Estimate processing a transcript file, or None if it can't be found.
+
+    The file is read in a worker thread so a large transcript doesn't block
+    the event loop.
+    """
+    transcript = await asyncio.to_thread(_read_transcript_file, transcript_file)
+    if transcript is None:
+        return None
+    return get_llm_client().estimate_transcript(transcript)
+
+
 class PaginatedJobsResponse(BaseModel):
     """Paginated response with jobs and metadata."""
     jobs: List[Job]
@@ -152,6 +200,19 @@ async def add_to_queue(
     # Create the job first
     job = await database.create_job(job_create)
 
+    # Record the pre-flight cost estimate
+    try:
+        estimate = await _estimate_transcript_file(job_create.transcript_file)
+        if estimate is not None:
+            job = await database.update_job(job.id, JobUpdate(estimated_cost=estimate["estimated_cost"]))
+            if estimate["exceeds_cost_cap"]:
+                logger.warning(
+                    f"Job {job.id}: Estimated cost ${estimate['estimated_cost']:.2f} exceeds the run cost cap"
+                )
+    except Exception as e:
+        # An estimate is informational - never fail job creation over it
+        logger.warning(f"Job {job.id}: Cost estimate failed - {e}")
+
     # Attempt to auto-link SST record from Airtable
     try:
         # Extract media ID from filename
@@ -189,6 +250,36 @@ async def add_to_queue(
     return job
 
 
+@router.post("/estimate", response_model=EstimateResponse)
+async def estimate_queue(request: EstimateRequest) -> EstimateResponse:
+    """Estimate tokens, cost and processing time for a batch of transcripts.
+
+    Nothing is queued and no LLM is called; estimates come from a local
+    token approximation priced on the backends routing would pick today.
+
+    Args:
+        request: Transcript files, as they would be passed to POST /queue
+
+    Returns:
+        Per-transcript estimates, files that could not be found, and totals
+    """
+    estimates = []
+    missing = []
+    for transcript_file in request.transcript_files:
+        estimate = await _estimate_transcript_file(transcript_file)
+        if estimate is None:
+            missing.append(transcript_file)
+        else:
+            estimates.append(TranscriptEstimate(transcript_file=transcript_file, **estimate))
+
+    return EstimateResponse(
+        estimates=estimates,
+        missing=missing,
+        total_cost=sum(e.estimated_cost for e in estimates),
+        total_seconds=sum(e.estimated_seconds for e in estimates),
+    )
+
+
 class BulkDeleteResponse(BaseModel):
     """Response for bulk delete operations."""
     deleted_count: int
@@ -6,11 +6,19 @@ Provides read-only access to the PBS Wisconsin SST (Single Source of Truth) tabl
 CRITICAL: This service is intentionally READ-ONLY. No write operations are permitted.
 """
 
+import copy
 import os
 from typing import Optional
 import httpx
 from datetime import datetime
 
+from api.services.single_flight import SingleFlight
+
+
+# Concurrent identical lookups (e.g. several jobs for one SST record) share
+# one request. Module-level, as a client is created per use.
+_flights = SingleFlight()
+
 
 class AirtableClient:
     """
@@ -52,6 +60,8 @@ class AirtableClient:
         """
         Search SST table by Media ID field.
 
+        Concurrent searches for the same Media ID share one request.
+
         Args:
             media_id: The Media ID to search for (e.g., "3092977804")
 
@@ -62,6 +72,13 @@ class AirtableClient:
         Raises:
             httpx.HTTPError: On network or API errors (except 404/empty results)
         """
+        record, shared = await _flights.do(
+            ("search", self.api_key, media_id),
+            lambda: self._search_sst_by_media_id(media_id),
+        )
+        return copy.deepcopy(record) if shared else record
+
+    async def _search_sst_by_media_id(self, media_id: str) -> Optional[dict]:
         url = f"{self.API_BASE_URL}/{self.BASE_ID}/{self.TABLE_ID}"
 
         # Use filterByFormula to search by Media ID field
@@ -96,6 +113,8 @@ class AirtableClient:
         """
         Fetch a specific SST record by Airtable record ID.
 
+        Concurrent fetches of the same record share one request.
+
         Args:
             record_id: Airtable record ID (e.g., "recXXXXXXXXXXXXXX")
 
@@ -106,6 +125,13 @@ class AirtableClient:
         Raises:
             httpx.HTTPError: On network or API errors (except 404)
         """
+        record, shared = await _flights.do(
+            ("record", self.api_key, record_id),
+            lambda: self._get_sst_record(record_id),
+        )
+        return copy.deepcopy(record) if shared else record
+
+    async def _get_sst_record(self, record_id: str) -> Optional[dict]:
         url = f"{self.API_BASE_URL}/{self.BASE_ID}/{self.TABLE_ID}/{record_id}"
 
         async with httpx.AsyncClient(timeout=30.0) as client:
@@ -0,0 +1,163 @@
+"""Analytics service for Editorial Assistant v3.0.
+
+Aggregates the materialized LLM call rollups (see event_rollups and
+event_latency_histogram in database.py) into spend and throughput reports.
+Never touches raw session_stats rows.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, Sequence, Tuple
+
+import numpy as np
+
+from api.services.database import (
+    LATENCY_BUCKET_EDGES_MS,
+    get_event_rollups,
+    get_latency_histograms,
+)
+
+
+GROUP_BY_DIMENSIONS = ("day", "backend", "model", "phase")
+
+# Lower/upper latency bound (ms) for each histogram bucket, including the
+# overflow bucket which is assumed to span one more 25% step
+_BUCKET_UPPER = np.array(LATENCY_BUCKET_EDGES_MS + [LATENCY_BUCKET_EDGES_MS[-1] * 1.25])
+_BUCKET_LOWER = np.concatenate(([0.0], _BUCKET_UPPER[:-1]))
+
+
+def histogram_percentiles(counts: np.ndarray, quantiles: Sequence[float]) -> np.ndarray:
+    """Estimate latency percentiles from histogram bucket counts.
+
+    Vectorized over groups: each row of `counts` is one group's histogram.
+    Values are linearly interpolated within the bucket containing the rank.
+
+    Args:
+        counts: Array of shape (groups, buckets) with call counts per bucket
+        quantiles: Quantiles in [0, 1], e.g. (0.5, 0.95)
+
+    Returns:
+        Array of shape (groups, len(quantiles)) in milliseconds; NaN for
+        groups with no recorded calls
+    """
+    counts = np.atleast_2d(np.asarray(counts, dtype=float))
+    q = np.asarray(quantiles, dtype=float)
+
+    cumulative = np.cumsum(counts, axis=1)
+    totals = cumulative[:, -1:]
+    targets = totals * q[None, :]  # (groups, quantiles)
+
+    # First bucket whose cumulative count reaches each target rank
+    reached = cumulative[:, None, :] >= targets[:, :, None]  # (groups, quantiles, buckets)
+    idx = np.argmax(reached, axis=2)
+
+    rows = np.arange(counts.shape[0])[:, None]
+    below = np.where(idx > 0, cumulative[rows, idx - 1], 0.0)
+    in_bucket = counts[rows, idx]
+    fraction = np.divide(
+        targets - below, in_bucket, out=np.zeros_like(targets), where=in_bucket > 0
+    )
+
+    lower = _BUCKET_LOWER[idx]
+    upper = _BUCKET_UPPER[idx]
+    result = lower + np.clip(fraction, 0.0, 1.0) * (upper - lower)
+
+    return np.where(totals > 0, result, np.nan)
+
+
+def _window(days: int) -> Tuple[str, str]:
+    """Return (since, until) day strings covering the last `days` UTC days."""
+    today = datetime.now(timezone.utc).date()
+    since = today - timedelta(days=max(days, 1) - 1)
+    return since.isoformat(), today.isoformat()
+
+
+def _key(row: Dict[str, Any], group_by: Sequence[str]) -> tuple:
+    return tuple(row[dim] for dim in group_by)
+
+
+def _percentiles_by_group(
+    histograms: List[Dict[str, Any]],
+    keys: List[tuple],
+    group_by: Sequence[str],
+) -> Dict[tuple, Tuple[Optional[float], Optional[float]]]:
+    """Sum histogram rows into one histogram per group and compute p50/p95."""
+    index = {key: i for i, key in enumerate(keys)}
+    counts = np.zeros((len(keys), len(_BUCKET_UPPER)))
+
+    rows = [h for h in histograms if _key(h, group_by) in index]
+    if rows:
+        group_idx = np.fromiter((index[_key(h, group_by)] for h in rows), dtype=np.intp, count=len(rows))
+        bucket_idx = np.fromiter((h["bucket"] for h in rows), dtype=np.intp, count=len(rows))
+        bucket_idx = np.minimum(bucket_idx, counts.shape[1] - 1)
+        values = np.fromiter((h["count"] for h in rows), dtype=float, count=len(rows))
+        np.add.at(counts, (group_idx, bucket_idx), values)
+
+    if not keys:
+        return {}
+
+    pct = histogram_percentiles(counts, (0.5, 0.95))
+    return {
+        key: tuple(None if np.isnan(v) else round(float(v), 1) for v in pct[i])
+        for i, key in enumerate(keys)
+    }
+
+
+async def aggregate_rollups(
+    group_by: Sequence[str],
+    days: int = 30,
+    backend: Optional[str] = None,
+    model: Optional[str] = None,
+    phase: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Aggregate rollups over the last `days` days, grouped by the given dimensions.
+
+    Args:
+        group_by: Subset of GROUP_BY_DIMENSIONS; empty for a single total row
+        days: Window size in days (including today)
+        backend: Optional backend filter
+        model: Optional model filter
+        phase: Optional phase filter
+
+    Returns:
+        One dict per group with the group dimensions plus calls, tokens, cost,
+        avg_latency_ms, p50_latency_ms and p95_latency_ms
+    """
+    for dim in group_by:
+        if dim not in GROUP_BY_DIMENSIONS:
+            raise ValueError(f"Invalid group_by dimension: {dim}")
+
+    since, until = _window(days)
+    filters = dict(since=since, until=until, backend=backend, model=model, phase=phase)
+    rollups = await get_event_rollups(**filters)
+    histograms = await get_latency_histograms(**filters)
+
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for row in rollups:
+        key = _key(row, group_by)
+        group = groups.setdefault(key, {"calls": 0, "tokens": 0, "cost": 0.0, "duration_ms": 0})
+        group["calls"] += row["calls"]
+        group["tokens"] += row["tokens"]
+        group["cost"] += row["cost"]
+        group["duration_ms"] += row["duration_ms"]
+
+    if not group_by and not groups:
+        groups[()] = {"calls": 0, "tokens": 0, "cost": 0.0, "duration_ms": 0}
+
+    keys = sorted(groups)
+    percentiles = _percentiles_by_group(histograms, keys, group_by)
+
+    results = []
+    for key in keys:
+        group = groups[key]
+        p50, p95 = percentiles.get(key, (None, None))
+        entry = {dim: (value or None) for dim, value in zip(group_by, key)}
+        entry.update({
+            "calls": group["calls"],
+            "tokens": group["tokens"],
+            "cost": round(group["cost"], 6),
+            "avg_latency_ms": round(group["duration_ms"] / group["calls"], 1) if group["calls"] else None,
+            "p50_latency_ms": p50,
+            "p95_latency_ms": p95,
+        })
+        results.append(entry)
+
+    return results
@@ -0,0 +1,137 @@
+"""Record/replay cassettes for LLM calls.
+
+In record mode every LLMClient.chat() call is journaled, request key plus
+response (or error) and its latency, to a gzip-compressed JSON-lines file.
+In replay mode the same calls are answered from the cassette without
+touching any provider, either with the recorded latency or at full speed.
+This gives reproducible end-to-end runs of the worker pipeline and
+separates worker/database overhead from model latency.
+
+Calls are matched on what the caller asked for (phase, messages, model and
+preset overrides, parameters), not on the backend routing picked, so a
+replay is not thrown off by telemetry-driven backend selection. Repeated
+identical requests are answered in recorded order.
+
+Enable with environment variables (or run_worker.py --record/--replay):
+
+    LLM_CASSETTE=path/to/run.jsonl.gz
+    LLM_CASSETTE_MODE=record|replay
+    LLM_CASSETTE_LATENCY=recorded|none     (replay only; default recorded)
+
+Record with a single worker process per cassette file.
+"""
+import gzip
+import hashlib
+import json
+import os
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+
+CASSETTE_RECORD = "record"
+CASSETTE_REPLAY = "replay"
+CASSETTE_MODES = (CASSETTE_RECORD, CASSETTE_REPLAY)
+
+LATENCY_RECORDED = "recorded"
+LATENCY_NONE = "none"
+
+
+class CassetteMissError(Exception):
+    """Raised in replay mode when a request is not on the cassette."""
+    pass
+
+
+class ReplayedError(RuntimeError):
+    """A recorded call failure, raised again during replay."""
+    pass
+
+
+def cassette_key(
+    messages: List[Dict[str, Any]],
+    model: Optional[str],
+    preset: Optional[str],
+    params: Dict[str, Any],
+    phase: Optional[str],
+) -> str:
+    """Return the key a chat() request is recorded and replayed under."""
+    payload = json.dumps(
+        {"messages": messages, "model": model, "preset": preset, "params": params, "phase": phase},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """A journal of LLM calls, opened for recording or replay."""
+
+    def __init__(self, path: Path, mode: str, latency: str = LATENCY_RECORDED):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if latency not in (LATENCY_RECORDED, LATENCY_NONE):
+            raise ValueError(f"Unknown cassette latency: {latency}")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency
+        self._entries: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._file = None
+
+        if mode == CASSETTE_REPLAY:
+            self._load()
+
+    @classmethod
+    def from_env(cls) -> Optional["Cassette"]:
+        """Build a cassette from LLM_CASSETTE* variables, or None if unset."""
+        path = os.getenv("LLM_CASSETTE")
+        if not path:
+            return None
+        return cls(
+            Path(path),
+            os.getenv("LLM_CASSETTE_MODE", CASSETTE_REPLAY),
+            os.getenv("LLM_CASSETTE_LATENCY", LATENCY_RECORDED),
+        )
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == CASSETTE_RECORD
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == CASSETTE_REPLAY
+
+    def _load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[entry["key"]].append(entry)
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        """Append an entry (must include "key") to the cassette."""
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = gzip.open(self.path, "at", encoding="utf-8")
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        # Sync-flush so a crashed run still leaves a readable cassette
+        self._file.flush()
+
+    def next(self, key: str) -> Dict[str, Any]:
+        """Return the next recorded entry for key.
+
+        Raises:
+            CassetteMissError: If the request was not recorded (or has been
+                replayed as many times as it was recorded)
+        """
+        entries = self._entries.get(key)
+        if not entries:
+            raise CassetteMissError(f"No recorded LLM call for request {key[:12]}")
+        return entries.popleft()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,206 @@
+"""Fit phase prompt inputs to per-phase token budgets.
+
+Later phases embed earlier phases' outputs (the manager gets the analyst
+report, the formatted transcript and the SEO report), so without a cap
+their prompts grow with transcript length. Each phase input can be given a
+token budget and a strategy for fitting it:
+
+    head      keep the beginning, cut at a line or sentence boundary
+    sections  keep whole markdown sections in order while they fit and
+              list the headings that were left out
+    sample    evenly spaced excerpts from across the text
+
+Fitting is deterministic, so the same inputs always give the same prompt
+(and the same response cache and cassette keys). Budgets live under
+"context_budgets" in llm-config.json, per phase and input, as either a
+token count or {"tokens": N, "strategy": "..."}; null removes a default.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from api.services.estimator import count_tokens
+
+
+DEFAULT_CONTEXT_BUDGETS: Dict[str, Dict[str, Dict[str, Any]]] = {
+    "formatter": {
+        "analyst_output": {"tokens": 3000, "strategy": "sections"},
+    },
+    "seo": {
+        "analyst_output": {"tokens": 3000, "strategy": "sections"},
+        "formatter_output": {"tokens": 500, "strategy": "head"},
+    },
+    "copy_editor": {},
+    "manager": {
+        "transcript": {"tokens": 750, "strategy": "head"},
+        "analyst_output": {"tokens": 3000, "strategy": "sections"},
+        "formatter_output": {"tokens": 8000, "strategy": "sample"},
+        "seo_output": {"tokens": 2000, "strategy": "head"},
+    },
+}
+
+FIT_STRATEGIES = ("head", "sections", "sample")
+
+SAMPLE_EXCERPTS = 5
+
+# Budget held back for each omission marker
+MARKER_TOKENS = 15
+
+_HEADING = re.compile(r"^#{1,6}\s")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# Lines longer than this are cut into sentences, so transcripts without
+# line breaks can still be trimmed
+LONG_LINE_TOKENS = 100
+
+
+def _split_units(text: str) -> List[str]:
+    """Split text into lines, breaking long lines into sentences."""
+    units = []
+    for line in text.splitlines():
+        if count_tokens(line) > LONG_LINE_TOKENS:
+            units.extend(_SENTENCE_END.split(line))
+        else:
+            units.append(line)
+    return units
+
+
+def _fit_lines(lines: List[str], max_tokens: int) -> int:
+    """Return how many leading lines fit in max_tokens."""
+    used = 0
+    for i, line in enumerate(lines):
+        used += count_tokens(line) + 1
+        if used > max_tokens:
+            return i
+    return len(lines)
+
+
+def _fit_head(text: str, max_tokens: int) -> Tuple[str, Dict[str, Any]]:
+    lines = _split_units(text)
+    kept = _fit_lines(lines, max_tokens - MARKER_TOKENS)
+    omitted = len(lines) - kept
+    return "\n".join(lines[:kept] + [f"[... {omitted} more lines omitted ...]"]), {}
+
+
+def _fit_sections(text: str, max_tokens: int) -> Tuple[str, Dict[str, Any]]:
+    sections: List[List[str]] = [[]]  # Preamble, then one per heading
+    for line in text.splitlines():
+        if _HEADING.match(line):
+            sections.append([])
+        sections[-1].append(line)
+
+    budget = max_tokens - MARKER_TOKENS
+    kept: List[str] = []
+    omitted: List[str] = []
+    for section in sections:
+        if not section:
+            continue
+        cost = count_tokens("\n".join(section)) + len(section)
+        if cost <= budget:
+            kept.extend(section)
+            budget -= cost
+        elif _HEADING.match(section[0]):
+            omitted.append(section[0].lstrip("#").strip())
+        else:
+            omitted.append("(introduction)")
+
+    if not kept:
+        return _fit_head(text, max_tokens)
+    kept.append(f"[... omitted sections: {', '.join(omitted)} ...]")
+    return "\n".join(kept), {"omitted_sections": omitted}
+
+
+def _fit_sample(text: str, max_tokens: int) -> Tuple[str, Dict[str, Any]]:
+    lines = _split_units(text)
+    excerpts = min(SAMPLE_EXCERPTS, len(lines))
+    per_excerpt = (max_tokens - MARKER_TOKENS * excerpts) // max(excerpts, 1)
+    if per_excerpt <= 0:
+        return _fit_head(text, max_tokens)
+
+    parts: List[str] = []
+    position = 0
+    for i in range(excerpts):
+        start = max(len(lines) * i // excerpts, position)
+        if start > position:
+            parts.append(f"[... {start - position} lines omitted ...]")
+        count = _fit_lines(lines[start:], per_excerpt)
+        parts.extend(lines[start:start + count])
+        position = start + count
+    if position < len(lines):
+        parts.append(f"[... {len(lines) - position} lines omitted ...]")
+    return "\n".join(parts), {"excerpts": excerpts}
+
+
+_FITTERS = {"head": _fit_head, "sections": _fit_sections, "sample": _fit_sample}
+
+
+def fit_to_budget(
+    text: str,
+    max_tokens: int,
+    strategy: str = "head",
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Fit text into max_tokens using a strategy.
+
+    Args:
+        text: Text to fit
+        max_tokens: Token budget
+        strategy: One of FIT_STRATEGIES
+
+    Returns:
+        Tuple of (fitted text, trim record or None if text already fit)
+    """
+    if strategy not in _FITTERS:
+        raise ValueError(f"Unknown context fit strategy: {strategy}")
+
+    original_tokens = count_tokens(text)
+    if original_tokens <= max_tokens:
+        return text, None
+
+    fitted, details = _FITTERS[strategy](text, max_tokens)
+    return fitted, {
+        "strategy": strategy,
+        "original_tokens": original_tokens,
+        "kept_tokens": count_tokens(fitted),
+        **details,
+    }
+
+
+def merge_context_budgets(
+    phase: str,
+    overrides: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Return a phase's input budgets: config overrides over the defaults."""
+    budgets = {name: dict(budget) for name, budget in DEFAULT_CONTEXT_BUDGETS.get(phase, {}).items()}
+    for name, budget in (overrides or {}).items():
+        if budget is None:
+            budgets.pop(name, None)
+        elif isinstance(budget, dict):
+            budgets[name] = {**budgets.get(name, {"strategy": "head"}), **budget}
+        else:
+            budgets[name] = {**budgets.get(name, {"strategy": "head"}), "tokens": int(budget)}
+    return budgets
+
+
+def fit_phase_context(
+    context: Dict[str, Any],
+    budgets: Dict[str, Dict[str, Any]],
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """Fit a phase's context inputs to their budgets.
+
+    Args:
+        context: Worker phase context (transcript, <phase>_output, ...)
+        budgets: Input name -> {"tokens", "strategy"} (see merge_context_budgets)
+
+    Returns:
+        Tuple of (context with fitted inputs, input name -> trim record for
+        each input that was trimmed)
+    """
+    fitted = dict(context)
+    trimmed = {}
+    for name, budget in budgets.items():
+        value = context.get(name)
+        if not isinstance(value, str) or not value:
+            continue
+        fitted[name], record = fit_to_budget(value, budget["tokens"], budget.get("strategy", "head"))
+        if record is not None:
+            trimmed[name] = record
+    return fitted, trimmed
@@ -0,0 +1,124 @@
+"""Offline token estimates for transcripts and LLM requests.
+
+Approximates BPE tokenizer counts without loading a tokenizer: common words
+are one token, long words split every few characters, digits group in threes
+and each punctuation mark is its own token. That is within ~10-15% of the
+real tokenizers for English transcripts, which is close enough to cost a
+job before it runs and to reserve rate-limit and cost-cap headroom.
+
+Per-phase estimates mirror what the worker sends: each phase's system
+prompt, the transcript and earlier phases' outputs (capped at their context
+budgets), with output sizes modelled as a fraction of the transcript (see
+PHASE_OUTPUT_ESTIMATES).
+"""
+import re
+from typing import Any, Dict, List, Optional
+
+from api.services.paths import AGENTS_DIR
+
+# Phases a queued job runs (see database.create_job)
+ESTIMATED_PHASES = ["analyst", "formatter", "seo", "manager"]
+
+# Used when a phase has no prompt file (the worker's built-in fallbacks are
+# all shorter than this)
+DEFAULT_SYSTEM_PROMPT_TOKENS = 300
+
+# Instructions and separators the worker wraps around each phase's inputs
+PROMPT_OVERHEAD_TOKENS = 100
+
+# Expected output tokens per phase: ratio of transcript tokens, clamped
+PHASE_OUTPUT_ESTIMATES: Dict[str, Dict[str, Optional[float]]] = {
+    "analyst": {"ratio": 0.15, "min": 800, "max": 4000},
+    "formatter": {"ratio": 1.1, "min": 500, "max": None},
+    "seo": {"ratio": 0.0, "min": 800, "max": 800},
+    "manager": {"ratio": 0.0, "min": 1500, "max": 1500},
+    "copy_editor": {"ratio": 1.1, "min": 500, "max": None},
+}
+
+# Context each phase's prompt carries besides its system prompt
+PHASE_INPUTS: Dict[str, List[str]] = {
+    "analyst": ["transcript"],
+    "formatter": ["transcript", "analyst_output"],
+    "seo": ["analyst_output", "formatter_output"],
+    "manager": ["transcript", "analyst_output", "formatter_output", "seo_output"],
+    "copy_editor": ["formatter_output"],
+}
+
+
+_TOKEN_PATTERN = re.compile(r"[^\W\d_]+|\d{1,3}|[^\w\s]|_")
+_WORD_PIECE_CHARS = 6
+
+
+def count_tokens(text: str) -> int:
+    """Approximate the number of tokens in text."""
+    tokens = 0
+    for piece in _TOKEN_PATTERN.findall(text):
+        if piece[0].isalpha():
+            tokens += 1 + (len(piece) - 1) // _WORD_PIECE_CHARS
+        else:
+            tokens += 1
+    return tokens
+
+
+def count_message_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Approximate the prompt tokens of chat messages (text blocks included)."""
+    total = 0
+    for message in messages:
+        content = message.get("content", "")
+        if isinstance(content, list):
+            content = "".join(block.get("text", "") for block in content if isinstance(block, dict))
+        total += count_tokens(content) + 4  # Role and message framing
+    return total
+
+
+def system_prompt_tokens(phase: str) -> int:
+    """Token count of a phase's system prompt."""
+    prompt_file = AGENTS_DIR / f"{phase}.md"
+    if prompt_file.exists():
+        return count_tokens(prompt_file.read_text(errors="replace"))
+    return DEFAULT_SYSTEM_PROMPT_TOKENS
+
+
+def _output_tokens(phase: str, transcript_tokens: int) -> int:
+    profile = PHASE_OUTPUT_ESTIMATES.get(phase, PHASE_OUTPUT_ESTIMATES["manager"])
+    tokens = max(int(transcript_tokens * profile["ratio"]), int(profile["min"]))
+    if profile["max"] is not None:
+        tokens = min(tokens, int(profile["max"]))
+    return tokens
+
+
+def estimate_phase_tokens(
+    transcript: str,
+    phases: Optional[List[str]] = None,
+    budgets: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None,
+) -> Dict[str, Dict[str, int]]:
+    """Estimate input and output tokens for each phase of a job.
+
+    Args:
+        transcript: Transcript text
+        phases: Phases to estimate (default: ESTIMATED_PHASES)
+        budgets: Phase -> input name -> {"tokens": N}; inputs are capped at
+            their budget, as the worker's context builder would trim them
+
+    Returns:
+        Dict of phase -> {"input_tokens", "output_tokens"}
+    """
+    transcript_tokens = count_tokens(transcript)
+    sizes = {"transcript": transcript_tokens}
+    for phase in ("analyst", "formatter", "seo"):
+        sizes[f"{phase}_output"] = _output_tokens(phase, transcript_tokens)
+
+    estimates = {}
+    for phase in phases or ESTIMATED_PHASES:
+        phase_budgets = (budgets or {}).get(phase, {})
+        inputs = 0
+        for name in PHASE_INPUTS.get(phase, ["transcript"]):
+            size = sizes[name]
+            if name in phase_budgets:
+                size = min(size, phase_budgets[name]["tokens"])
+            inputs += size
+        estimates[phase] = {
+            "input_tokens": system_prompt_tokens(phase) + PROMPT_OVERHEAD_TOKENS + inputs,
+            "output_tokens": _output_tokens(phase, transcript_tokens),
+        }
+    return estimates
@@ -3,17 +3,35 @@
 Provides unified interface for LLM API calls with cost tracking,
 model selection, and event logging.
 """
+import asyncio
+import importlib.util
 import os
 import json
+import logging
+import random
 import time
 import httpx
+from collections import deque
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, List, Tuple
+from dataclasses import asdict, dataclass, field, replace
 from pathlib import Path
+from urllib.parse import urlsplit
 
 from api.models.events import EventType, EventCreate, EventData
-from api.services.database import log_event
+from api.services.database import log_event, reserve_rate_limit, adjust_rate_limit
+from api.services.response_cache import ResponseCache, response_cache_key
+from api.services.estimator import ESTIMATED_PHASES, count_message_tokens, count_tokens, estimate_phase_tokens
+from api.services.context_budget import merge_context_budgets
+from api.services.utils import calculate_transcript_metrics
+from api.services.cassette import LATENCY_RECORDED, Cassette, ReplayedError, cassette_key
+from api.services.single_flight import SingleFlight
+from api.services.routing import RoutingTable
+from api.services.structured_output import StructuredOutputError, parse_structured_output
+
+
+logger = logging.getLogger(__name__)
 
 
 # Cost cap and safety configuration - can be overridden via environment
@@ -24,6 +42,399 @@ DEFAULT_MAX_COST_PER_1K_TOKENS = 0.05  # $0.05 per 1K tokens max
 # Empty list means all models allowed
 DEFAULT_MODEL_ALLOWLIST: List[str] = []
 
+# HTTP connection defaults; override under "http" in llm-config.json or
+# per backend. "timeout" (read/write/pool) comes from each backend entry.
+DEFAULT_HTTP_SETTINGS: Dict[str, Any] = {
+    "timeout": 180.0,
+    "connect_timeout": 10.0,
+    "max_connections": 10,
+    "max_keepalive_connections": 5,
+    "keepalive_expiry": 60.0,
+    "http2": True,
+}
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Transport-level retry defaults; override under "retry" in llm-config.json
+# or per backend. Delays are in seconds.
+DEFAULT_RETRY_SETTINGS: Dict[str, Any] = {
+    "max_attempts": 4,
+    "base_delay": 1.0,
+    "max_delay": 30.0,
+    # A Retry-After longer than this is not waited out; the error is raised
+    # so the worker can escalate instead
+    "max_retry_after": 60.0,
+}
+
+# Rate limits and transient upstream failures. Other 4xx responses (bad
+# request, auth, not found) fail immediately.
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Return True if an HTTP error is transient and worth retrying.
+
+    Read timeouts are not retried: the backend already used its full
+    timeout, and escalation is the better response to a slow tier.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    if isinstance(error, httpx.ReadTimeout):
+        return False
+    return isinstance(error, httpx.TransportError)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Full-jitter exponential backoff for a 0-based retry attempt."""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+# Circuit breaker defaults; override under "circuit_breaker" in
+# llm-config.json or per backend
+DEFAULT_CIRCUIT_BREAKER_SETTINGS: Dict[str, Any] = {
+    "consecutive_failures": 5,     # Open after this many failures in a row
+    "failure_rate": 0.5,           # ...or this failure rate over the window
+    "window_size": 20,             # Recent calls considered for failure_rate
+    "min_calls": 10,               # Calls needed before failure_rate applies
+    # Successful calls slower than this count as failures. Off by default:
+    # long phases legitimately take minutes, so set it per backend, above
+    # that backend's normal call time
+    "slow_call_ms": None,
+    "open_seconds": 30.0,          # Time open before a half-open probe is allowed
+}
+
+# Shared rate-limit defaults; override under "rate_limit" in llm-config.json
+# or per backend. Limits are off unless a per-minute value is set. Backends
+# with the same "bucket" (default: the backend name) share one limit, e.g.
+# several OpenRouter tiers drawing on one API key.
+DEFAULT_RATE_LIMIT_SETTINGS: Dict[str, Any] = {
+    "requests_per_minute": None,
+    "tokens_per_minute": None,
+    "burst_seconds": 60.0,         # Bucket capacity, in seconds of refill
+    "bucket": None,
+}
+
+
+def estimate_request_tokens(messages: List[Dict[str, Any]], max_tokens: Optional[int] = None) -> int:
+    """Estimate the tokens a request will consume (prompt plus output cap)."""
+    return count_message_tokens(messages) + (max_tokens or 0)
+
+
+# Output token caps (max_tokens) per phase: a ratio of the transcript's
+# tokens clamped to [min, max], so the formatter can return the whole
+# transcript while short-output phases can't ramble. Override per phase
+# under "max_tokens" in llm-config.json with a number (fixed cap) or a
+# partial {"ratio", "min", "max"}; a backend's "max_output_tokens" caps
+# whatever is requested of it. The larger plans exceed what most models can
+# produce in one response, so every backend should set max_output_tokens
+# (a longer output is completed by continuation calls).
+DEFAULT_MAX_TOKENS_PLAN: Dict[str, Dict[str, float]] = {
+    "analyst": {"ratio": 0.3, "min": 2000, "max": 8000},
+    "formatter": {"ratio": 1.5, "min": 2000, "max": 64000},
+    "seo": {"ratio": 0.0, "min": 1500, "max": 1500},
+    "manager": {"ratio": 0.0, "min": 4000, "max": 4000},
+    "copy_editor": {"ratio": 1.5, "min": 2000, "max": 64000},
+}
+
+# Truncated outputs are completed with follow-up calls that carry the
+# partial output; override under "continuation" in llm-config.json.
+# max_output_tokens bounds the combined output (None = no bound beyond
+# max_continuations).
+DEFAULT_CONTINUATION_SETTINGS: Dict[str, Any] = {
+    "enabled": True,
+    "max_continuations": 3,
+    "max_output_tokens": None,
+}
+
+CONTINUATION_PROMPT = (
+    "Your previous response was cut off at the length limit. Continue exactly "
+    "where it stopped, without repeating any of it or adding commentary."
+)
+
+# A continuation that restates the end of the partial output has the
+# repeat dropped; shorter matches are treated as coincidence
+CONTINUATION_OVERLAP_CHARS = (20, 200)
+
+
+# Reasoning controls per phase for thinking models: "effort" (none, minimal,
+# low, medium, high), "max_tokens" (reasoning token budget) and "exclude"
+# (drop the reasoning text from the response). Override per phase under
+# "reasoning" in llm-config.json; null removes a default. OpenRouter backends
+# take these natively; set "reasoning": true on an anthropic, gemini, openai
+# or ollama backend whose model thinks (other models reject the parameters).
+DEFAULT_REASONING_SETTINGS: Dict[str, Dict[str, Any]] = {
+    "formatter": {"effort": "low", "exclude": True},
+    "seo": {"effort": "low", "exclude": True},
+    "copy_editor": {"effort": "low", "exclude": True},
+}
+
+# Share of max_tokens an effort level may spend on reasoning, where a
+# backend takes a token budget rather than an effort (as OpenRouter does)
+REASONING_EFFORT_RATIOS: Dict[str, float] = {
+    "none": 0.0,
+    "minimal": 0.1,
+    "low": 0.2,
+    "medium": 0.5,
+    "high": 0.8,
+}
+
+# Smallest thinking budget Anthropic accepts
+ANTHROPIC_MIN_THINKING_TOKENS = 1024
+
+
+def reasoning_budget(reasoning: Dict[str, Any], max_tokens: int) -> Optional[int]:
+    """Reasoning token budget for a request, or None if reasoning sets none."""
+    if reasoning.get("max_tokens") is not None:
+        return int(reasoning["max_tokens"])
+    effort = reasoning.get("effort")
+    if effort is None:
+        return None
+    return int(max_tokens * REASONING_EFFORT_RATIOS.get(effort, REASONING_EFFORT_RATIOS["medium"]))
+
+
+def json_schema_response_format(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """OpenAI-style response_format for a {"name", "schema"} response_schema.
+
+    Not strict: strict mode rejects schema keywords such as maxLength, and
+    the caller validates the result anyway.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": schema["name"], "schema": schema["schema"], "strict": False},
+    }
+
+
+def join_continuation(partial: str, continuation: str) -> str:
+    """Append a continuation, dropping any restated tail of the partial."""
+    shortest, longest = CONTINUATION_OVERLAP_CHARS
+    for size in range(min(len(partial), len(continuation), longest), shortest - 1, -1):
+        if partial.endswith(continuation[:size]):
+            return partial + continuation[size:]
+    return partial + continuation
+
+
+# Minimum seconds between checks of llm-config.json for changes
+CONFIG_CHECK_INTERVAL = 1.0
+
+
+# Output throughput assumed for latency estimates when a backend has no
+# recent telemetry
+DEFAULT_OUTPUT_TOKENS_PER_SECOND = 40.0
+
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreaker:
+    """Per-backend circuit breaker shared by all calls in a process.
+
+    Closed: calls flow normally while outcomes are recorded. Open: calls
+    fail fast (or fail over) for open_seconds. Half-open: a single probe
+    call is let through; its outcome closes or re-opens the circuit.
+    """
+    consecutive_failures: int = 5
+    failure_rate: float = 0.5
+    window_size: int = 20
+    min_calls: int = 10
+    slow_call_ms: Optional[int] = None
+    open_seconds: float = 30.0
+    state: str = CIRCUIT_CLOSED
+    failures_in_row: int = 0
+    opened_at: float = 0.0
+    probe_in_flight: bool = False
+    outcomes: deque = field(default_factory=deque)
+
+    def can_attempt(self) -> bool:
+        """Return True if a call could be made now (does not claim the probe)."""
+        if self.state == CIRCUIT_CLOSED:
+            return True
+        if self.state == CIRCUIT_OPEN:
+            return time.monotonic() - self.opened_at >= self.open_seconds
+        return not self.probe_in_flight
+
+    def begin_call(self) -> bool:
+        """Claim permission for a call, moving open -> half-open when due."""
+        if not self.can_attempt():
+            return False
+        if self.state != CIRCUIT_CLOSED:
+            self.state = CIRCUIT_HALF_OPEN
+            self.probe_in_flight = True
+        return True
+
+    def record_success(self, duration_ms: Optional[int] = None) -> None:
+        """Record a completed call; slow calls count as failures."""
+        if self.slow_call_ms is not None and duration_ms is not None and duration_ms > self.slow_call_ms:
+            self.record_failure()
+            return
+        self.failures_in_row = 0
+        self._add_outcome(True)
+        if self.state == CIRCUIT_HALF_OPEN:
+            self.state = CIRCUIT_CLOSED
+            self.outcomes.clear()
+        self.probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call and open the circuit if a threshold is crossed."""
+        self.failures_in_row += 1
+        self._add_outcome(False)
+        self.probe_in_flight = False
+
+        if self.state == CIRCUIT_HALF_OPEN or self._should_open():
+            self.state = CIRCUIT_OPEN
+            self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Give back a claimed probe without recording an outcome."""
+        if self.state == CIRCUIT_HALF_OPEN and self.probe_in_flight:
+            self.state = CIRCUIT_OPEN
+        self.probe_in_flight = False
+
+    def _add_outcome(self, ok: bool) -> None:
+        self.outcomes.append(ok)
+        while len(self.outcomes) > self.window_size:
+            self.outcomes.popleft()
+
+    def _should_open(self) -> bool:
+        if self.failures_in_row >= self.consecutive_failures:
+            return True
+        if len(self.outcomes) < self.min_calls:
+            return False
+        failures = sum(1 for ok in self.outcomes if not ok)
+        return failures / len(self.outcomes) >= self.failure_rate
+
+
+def is_backend_failure(error: BaseException) -> bool:
+    """Return True if an error says the backend is unhealthy.
+
+    Non-retryable HTTP status errors (bad request, auth) mean the backend
+    answered, so they do not count against its circuit.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return is_retryable_error(error)
+    return True
+
+
+# Telemetry-driven selection among equivalent backends in one routing tier
+# (a tier written as a list of backend names); override under
+# "latency_routing" in llm-config.json
+DEFAULT_LATENCY_ROUTING_SETTINGS: Dict[str, Any] = {
+    "enabled": True,
+    "window_size": 20,             # Recent calls kept per backend
+    "min_samples": 3,              # Calls needed before a backend is ranked
+    "max_age_seconds": 900.0,      # Samples older than this are dropped
+}
+
+
+@dataclass
+class BackendStats:
+    """Rolling latency, throughput and error telemetry for one backend.
+
+    Fed from the same call outcomes that produce cost_update events.
+    """
+    window_size: int = 20
+    max_age_seconds: float = 900.0
+    samples: deque = field(default_factory=deque)  # (monotonic time, duration_ms, output_tokens, ok)
+
+    def record_success(self, duration_ms: int, output_tokens: int) -> None:
+        self._add((time.monotonic(), duration_ms, output_tokens, True))
+
+    def record_failure(self, duration_ms: int) -> None:
+        self._add((time.monotonic(), duration_ms, 0, False))
+
+    def _add(self, sample: Tuple[float, int, int, bool]) -> None:
+        self.samples.append(sample)
+        while len(self.samples) > self.window_size:
+            self.samples.popleft()
+
+    def _recent(self) -> List[Tuple[float, int, int, bool]]:
+        cutoff = time.monotonic() - self.max_age_seconds
+        while self.samples and self.samples[0][0] < cutoff:
+            self.samples.popleft()
+        return list(self.samples)
+
+    @property
+    def calls(self) -> int:
+        return len(self._recent())
+
+    def latency_percentile(self, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """Return a successful-call latency percentile (ms), or None if too few."""
+        durations = sorted(s[1] for s in self._recent() if s[3])
+        if len(durations) < max(min_samples, 1):
+            return None
+        index = min(len(durations) - 1, int(len(durations) * percentile / 100))
+        return float(durations[index])
+
+    def summary(self) -> Dict[str, Any]:
+        """Return calls, error_rate, mean_latency_ms and tokens_per_second."""
+        samples = self._recent()
+        ok = [s for s in samples if s[3]]
+        duration_ms = sum(s[1] for s in ok)
+        tokens = sum(s[2] for s in ok)
+        return {
+            "calls": len(samples),
+            "error_rate": 1 - len(ok) / len(samples) if samples else 0.0,
+            "mean_latency_ms": duration_ms / len(ok) if ok else None,
+            "tokens_per_second": tokens * 1000 / duration_ms if duration_ms else None,
+        }
+
+    def score(self) -> float:
+        """Higher is better: throughput discounted by the error rate.
+
+        Output tokens per second where known, else calls per second from
+        mean latency; a backend with no successes scores 0.
+        """
+        summary = self.summary()
+        if summary["tokens_per_second"]:
+            throughput = summary["tokens_per_second"]
+        elif summary["mean_latency_ms"]:
+            throughput = 1000 / summary["mean_latency_ms"]
+        else:
+            return 0.0
+        return throughput * (1 - summary["error_rate"])
+
+
+# Hedged requests: if a call outlasts the backend's recent latency percentile
+# for its phase, send a second request to an alternate backend and take the
+# first to finish. Off by default; override under "hedging" in llm-config.json.
+DEFAULT_HEDGING_SETTINGS: Dict[str, Any] = {
+    "enabled": False,
+    "percentile": 95,
+    "min_samples": 10,             # Successful calls needed before hedging
+    "min_delay_ms": 5000,          # Never hedge sooner than this
+}
+
+
+# On-disk response cache; override under "response_cache" in llm-config.json.
+# Only calls made for the listed phases are cached. Clear the directory after
+# changing an OpenRouter preset: keys name the preset, not the model behind it.
+DEFAULT_RESPONSE_CACHE_SETTINGS: Dict[str, Any] = {
+    "enabled": False,
+    "directory": ".cache/llm-responses",
+    "max_mb": 512,
+    "phases": [],
+}
+
 
 class CostCapExceededError(Exception):
     """Raised when a request would exceed the run cost cap."""
@@ -40,8 +451,23 @@ class TokenCostTooHighError(Exception):
     pass
 
 
+class CircuitOpenError(Exception):
+    """Raised when a backend's circuit is open and no fallback is available."""
+    pass
+
+
+# Recorded failures of these types replay as the same type; any other
+# recorded failure replays as ReplayedError
+REPLAYABLE_ERRORS = {
+    cls.__name__: cls
+    for cls in (CostCapExceededError, ModelNotAllowedError, TokenCostTooHighError, CircuitOpenError)
+}
+
+
 # Pricing per 1M tokens (input/output) - updated Dec 2024
-# These are fallback values; OpenRouter returns actual costs
+# These are fallback values; OpenRouter returns actual costs.
+# Optional "cached_input" / "cache_write" keys price prompt-cache reads and
+# writes; models without them use the default multipliers below.
 MODEL_PRICING: Dict[str, Dict[str, float]] = {
     # OpenRouter free tier models (cheapskate preset)
     "xiaomi/mimo-v2-flash:free": {"input": 0.0, "output": 0.0},
@@ -53,22 +479,61 @@ MODEL_PRICING: Dict[str, Dict[str, float]] = {
     "google/gemini-3-flash-preview": {"input": 0.15, "output": 0.60},
     "google/gemini-3-pro-preview": {"input": 1.25, "output": 5.00},
     "google/gemini-pro-1.5": {"input": 1.25, "output": 5.00},
-    "anthropic/claude-3.5-sonnet": {"input": 3.00, "output": 15.00},
-    "anthropic/claude-sonnet-4.5": {"input": 3.00, "output": 15.00},
-    "openai/gpt-4o": {"input": 2.50, "output": 10.00},
-    "openai/gpt-4o-mini": {"input": 0.15, "output": 0.60},
+    "anthropic/claude-3.5-sonnet": {"input": 3.00, "output": 15.00, "cached_input": 0.30, "cache_write": 3.75},
+    "anthropic/claude-sonnet-4.5": {"input": 3.00, "output": 15.00, "cached_input": 0.30, "cache_write": 3.75},
+    "openai/gpt-4o": {"input": 2.50, "output": 10.00, "cached_input": 1.25},
+    "openai/gpt-4o-mini": {"input": 0.15, "output": 0.60, "cached_input": 0.075},
     "xai/grok-4.1-fast": {"input": 2.00, "output": 8.00},
     "moonshotai/kimi-k2-0711:free": {"input": 0.0, "output": 0.0},
     # Direct API models
-    "gpt-4o": {"input": 2.50, "output": 10.00},
-    "gpt-4o-mini": {"input": 0.15, "output": 0.60},
-    "claude-3-5-sonnet-latest": {"input": 3.00, "output": 15.00},
+    "gpt-4o": {"input": 2.50, "output": 10.00, "cached_input": 1.25},
+    "gpt-4o-mini": {"input": 0.15, "output": 0.60, "cached_input": 0.075},
+    "claude-3-5-sonnet-latest": {"input": 3.00, "output": 15.00, "cached_input": 0.30, "cache_write": 3.75},
     "gemini-1.5-flash": {"input": 0.075, "output": 0.30},
     "gemini-1.5-flash-8b": {"input": 0.0375, "output": 0.15},
     "gemini-1.5-pro": {"input": 1.25, "output": 5.00},
 }
 
 
+# Prompt caching: cache reads bill at a fraction of the input rate, cache
+# writes at (or above) it. Used when a model has no explicit cache pricing.
+DEFAULT_CACHE_READ_MULTIPLIER = 0.25
+DEFAULT_CACHE_WRITE_MULTIPLIER = 1.0
+
+# Marker for the end of a cacheable prompt prefix (Anthropic-style; OpenRouter
+# forwards it to Anthropic and Gemini models)
+CACHE_CONTROL_EPHEMERAL: Dict[str, str] = {"type": "ephemeral"}
+
+# OpenRouter model families that need explicit cache_control breakpoints;
+# the rest (OpenAI, DeepSeek, Grok, ...) cache matching prefixes automatically.
+# Presets ("@preset/...") may route to any of them, so they keep the markers;
+# OpenRouter drops cache_control for providers that don't take it.
+OPENROUTER_CACHE_CONTROL_PREFIXES: Tuple[str, ...] = ("anthropic/", "google/gemini", "@preset/")
+
+
+def flatten_content(content: Any) -> str:
+    """Collapse a list of text content blocks into a plain string."""
+    if isinstance(content, list):
+        return "".join(
+            block.get("text", "") for block in content if isinstance(block, dict)
+        )
+    return content
+
+
+def strip_cache_markers(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return messages with content blocks flattened to plain strings.
+
+    The prompt prefix is unchanged, so backends with automatic prefix caching
+    (OpenAI, Gemini implicit caching, Ollama's KV cache) still reuse it.
+    """
+    return [{**msg, "content": flatten_content(msg["content"])} for msg in messages]
+
+
+# Finish reasons meaning the output hit the token limit (OpenAI-style,
+# Anthropic, Gemini)
+TRUNCATED_FINISH_REASONS = {"length", "max_tokens", "MAX_TOKENS"}
+
+
 @dataclass
 class LLMResponse:
     """Response from an LLM API call."""
@@ -81,6 +546,19 @@ class LLMResponse:
     duration_ms: int
     backend: str
     raw_response: Optional[Dict[str, Any]] = None
+    cached_tokens: int = 0  # Input tokens read from the provider's prompt cache
+    cache_write_tokens: int = 0  # Input tokens written to the prompt cache
+    cache_hit: bool = False  # Served from the local response cache at no cost
+    finish_reason: Optional[str] = None  # As reported by the provider
+    continuations: int = 0  # Follow-up calls made to complete a truncated output
+    reasoning_tokens: int = 0  # Output tokens spent on reasoning (included in output_tokens)
+    reasoning: Optional[str] = None  # Reasoning text, unless excluded or not returned
+    coalesced: bool = False  # Shared from an identical call already in flight, at no cost
+
+    @property
+    def truncated(self) -> bool:
+        """Whether generation stopped at the output token limit."""
+        return self.finish_reason in TRUNCATED_FINISH_REASONS
 
 
 @dataclass
@@ -91,7 +569,11 @@ class RunCostTracker:
     total_input_tokens: int = 0
     total_output_tokens: int = 0
     total_tokens: int = 0
+    total_cached_tokens: int = 0
+    total_reasoning_tokens: int = 0
     call_count: int = 0
+    cache_hits: int = 0
+    cache_saved_cost: float = 0.0
     calls: List[Dict[str, Any]] = field(default_factory=list)
     start_time: Optional[datetime] = None
 
@@ -101,15 +583,24 @@ class RunCostTracker:
         self.total_input_tokens += response.input_tokens
         self.total_output_tokens += response.output_tokens
         self.total_tokens += response.total_tokens
+        self.total_cached_tokens += response.cached_tokens
+        self.total_reasoning_tokens += response.reasoning_tokens
         self.call_count += 1
         self.calls.append({
             "model": response.model,
             "backend": response.backend,
             "tokens": response.total_tokens,
+            "cached_tokens": response.cached_tokens,
+            "reasoning_tokens": response.reasoning_tokens,
             "cost": response.cost,
             "duration_ms": response.duration_ms,
         })
 
+    def add_cache_hit(self, saved_cost: float) -> None:
+        """Count a response served from the local response cache."""
+        self.cache_hits += 1
+        self.cache_saved_cost += saved_cost
+
     def to_dict(self) -> Dict[str, Any]:
         """Return summary dict for logging."""
         return {
@@ -118,7 +609,11 @@ class RunCostTracker:
             "total_input_tokens": self.total_input_tokens,
             "total_output_tokens": self.total_output_tokens,
             "total_tokens": self.total_tokens,
+            "total_cached_tokens": self.total_cached_tokens,
+            "total_reasoning_tokens": self.total_reasoning_tokens,
             "call_count": self.call_count,
+            "cache_hits": self.cache_hits,
+            "cache_saved_cost": round(self.cache_saved_cost, 6),
         }
 
 
@@ -164,7 +659,10 @@ async def end_run_tracking() -> Optional[Dict[str, Any]]:
             extra={
                 "input_tokens": tracker.total_input_tokens,
                 "output_tokens": tracker.total_output_tokens,
+                "cached_tokens": tracker.total_cached_tokens,
+                "reasoning_tokens": tracker.total_reasoning_tokens,
                 "call_count": tracker.call_count,
+                "cache_hits": tracker.cache_hits,
             }
         ),
     ))
@@ -178,6 +676,8 @@ def calculate_cost(
     input_tokens: int,
     output_tokens: int,
     openrouter_cost: Optional[float] = None,
+    cached_tokens: int = 0,
+    cache_write_tokens: int = 0,
 ) -> float:
     """Calculate cost for an API call.
 
@@ -186,9 +686,11 @@ def calculate_cost(
 
     Args:
         model: Model identifier
-        input_tokens: Number of input tokens
+        input_tokens: Number of input tokens, including cached ones
         output_tokens: Number of output tokens
         openrouter_cost: Cost reported by OpenRouter (if available)
+        cached_tokens: Input tokens read from the prompt cache
+        cache_write_tokens: Input tokens written to the prompt cache
 
     Returns:
         Cost in USD
@@ -197,18 +699,40 @@ def calculate_cost(
     if openrouter_cost is not None:
         return openrouter_cost
 
+    # Free-tier models are free whether or not they're in the pricing table
+    if model.endswith(":free"):
+        return 0.0
+
     # Look up pricing
     pricing = MODEL_PRICING.get(model)
     if pricing is None:
         # Unknown model - estimate conservatively
         pricing = {"input": 1.0, "output": 3.0}  # $1/M input, $3/M output
 
-    input_cost = (input_tokens / 1_000_000) * pricing["input"]
+    cached_tokens = min(cached_tokens, input_tokens)
+    cache_write_tokens = min(cache_write_tokens, input_tokens - cached_tokens)
+    uncached_tokens = input_tokens - cached_tokens - cache_write_tokens
+
+    cache_read_price = pricing.get("cached_input", pricing["input"] * DEFAULT_CACHE_READ_MULTIPLIER)
+    cache_write_price = pricing.get("cache_write", pricing["input"] * DEFAULT_CACHE_WRITE_MULTIPLIER)
+
+    input_cost = (
+        uncached_tokens * pricing["input"]
+        + cached_tokens * cache_read_price
+        + cache_write_tokens * cache_write_price
+    ) / 1_000_000
     output_cost = (output_tokens / 1_000_000) * pricing["output"]
 
     return input_cost + output_cost
 
 
+def _context_duration(context: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Return the transcript duration routing should use, None without context."""
+    if not context:
+        return None
+    return context.get("transcript_metrics", {}).get("estimated_duration_minutes", 0)
+
+
 class LLMClient:
     """Unified client for LLM API calls with cost tracking."""
 
@@ -223,7 +747,36 @@ class LLMClient:
 
         self.config_path = Path(config_path)
         self.config = self._load_config()
-        self._http_client: Optional[httpx.AsyncClient] = None
+        self.routing = RoutingTable.compile(self.config)
+
+        # Config file version seen by the last reload, and when it was last
+        # checked; see _maybe_reload()
+        self._config_mtime = self._stat_config()
+        self._config_checked_at = time.monotonic()
+        # One connection pool per backend, so a slow big-brain call never
+        # holds connections needed by cheap-tier calls
+        self._http_clients: Dict[str, httpx.AsyncClient] = {}
+        self._http_client_settings: Dict[str, Tuple] = {}
+        # Clients replaced after a settings change; other calls may still be
+        # using them, so they are only closed by close()
+        self._retired_http_clients: List[httpx.AsyncClient] = []
+
+        # Circuit breaker per backend, shared by every job in this process
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+        # Local response cache, built on first use from "response_cache"
+        self._response_cache: Optional[ResponseCache] = None
+
+        # Record/replay journal of chat() calls (LLM_CASSETTE*, or run_worker
+        # --record/--replay)
+        self.cassette: Optional[Cassette] = Cassette.from_env()
+
+        # Identical chat() calls for a job in flight at once share one provider call
+        self._flights = SingleFlight()
+
+        # Rolling telemetry per (backend, phase) for choosing within a tier
+        # and hedging; phase None aggregates all of a backend's calls
+        self._backend_stats: Dict[Tuple[str, Optional[str]], BackendStats] = {}
 
         # Track active model/preset for health endpoint
         self.active_backend: Optional[str] = None
@@ -323,6 +876,118 @@ class LLMClient:
                 f"Increase LLM_RUN_COST_CAP or use a cheaper model."
             )
 
+    def estimate_call_cost(
+        self,
+        backend_name: str,
+        model_id: str,
+        input_tokens: int,
+        output_tokens: int,
+    ) -> float:
+        """Estimate a call's cost from token counts, before it is made.
+
+        Local (ollama) backends and ":free" models cost nothing; OpenRouter
+        presets are priced as the backend's fallback model, unless the
+        backend is configured with a cost_per_project of 0 (a preset of
+        free models).
+        """
+        backend_config = self.get_backend_config(backend_name)
+        if backend_config.get("type") == "ollama" or model_id.endswith(":free"):
+            return 0.0
+        if model_id.startswith("@preset/"):
+            if backend_config.get("cost_per_project") == 0:
+                return 0.0
+            model_id = backend_config.get("fallback_model") or ""
+        return calculate_cost(model_id, input_tokens, output_tokens)
+
+    def check_call_cost(
+        self,
+        backend_name: str,
+        model_id: str,
+        messages: List[Dict[str, Any]],
+        max_tokens: Optional[int] = None,
+    ) -> None:
+        """Check that a call's estimated cost fits under the run cost cap.
+
+        Unlike check_run_cost_cap this trips before the money is spent. The
+        estimate is the prompt plus max_tokens of output, if set.
+
+        Raises:
+            CostCapExceededError: If the call would take the run past the cap
+        """
+        if not self.enforce_guards:
+            return
+
+        tracker = get_run_tracker()
+        if tracker is None:
+            return
+
+        estimate = self.estimate_call_cost(
+            backend_name, model_id, count_message_tokens(messages), max_tokens or 0
+        )
+        if tracker.total_cost + estimate > self.run_cost_cap:
+            raise CostCapExceededError(
+                f"Call to {model_id} is estimated at ${estimate:.4f}, which would take run cost "
+                f"${tracker.total_cost:.4f} past the cap of ${self.run_cost_cap:.2f}. "
+                f"Increase LLM_RUN_COST_CAP or use a cheaper model."
+            )
+
+    def estimate_transcript(
+        self,
+        transcript: str,
+        phases: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Estimate tokens, cost and latency of processing a transcript.
+
+        Each phase is priced on the backend routing would pick for it today.
+        Latency uses the backend's recent throughput where known, else
+        DEFAULT_OUTPUT_TOKENS_PER_SECOND.
+
+        Args:
+            transcript: Transcript text
+            phases: Phases to estimate (default: the queued job phases)
+
+        Returns:
+            Dict with totals (input_tokens, output_tokens, estimated_cost,
+            estimated_seconds, exceeds_cost_cap) and per-phase breakdown
+        """
+        context = {"transcript_metrics": calculate_transcript_metrics(
+            transcript,
+            long_form_threshold_minutes=self.routing.long_form_threshold_minutes,
+        )}
+
+        phases = phases or ESTIMATED_PHASES
+        budgets = {phase: self.get_context_budgets(phase) for phase in phases}
+        breakdown = {}
+        for phase, tokens in estimate_phase_tokens(transcript, phases, budgets).items():
+            backend_name = self.get_backend_for_phase(phase, context)
+            backend_config = self.get_backend_config(backend_name)
+            model_id = backend_config.get("model") or backend_config.get("fallback_model") or ""
+            throughput = (
+                self.get_backend_stats(backend_name, phase).summary()["tokens_per_second"]
+                or self.get_backend_stats(backend_name).summary()["tokens_per_second"]
+                or DEFAULT_OUTPUT_TOKENS_PER_SECOND
+            )
+            breakdown[phase] = {
+                **tokens,
+                "backend": backend_name,
+                "model": model_id,
+                "estimated_cost": self.estimate_call_cost(
+                    backend_name, model_id, tokens["input_tokens"], tokens["output_tokens"]
+                ),
+                "estimated_seconds": round(tokens["output_tokens"] / throughput, 1),
+            }
+
+        estimated_cost = sum(p["estimated_cost"] for p in breakdown.values())
+        return {
+            "input_tokens": sum(p["input_tokens"] for p in breakdown.values()),
+            "output_tokens": sum(p["output_tokens"] for p in breakdown.values()),
+            "estimated_cost": estimated_cost,
+            "estimated_seconds": round(sum(p["estimated_seconds"] for p in breakdown.values()), 1),
+            "estimated_duration_minutes": context["transcript_metrics"]["estimated_duration_minutes"],
+            "exceeds_cost_cap": estimated_cost > self.run_cost_cap,
+            "phases": breakdown,
+        }
+
     def _load_config(self) -> Dict[str, Any]:
         """Load LLM configuration from file."""
         if not self.config_path.exists():
@@ -333,19 +998,632 @@ class LLMClient:
 
     def reload_config(self) -> None:
         """Reload configuration from file."""
-        self.config = self._load_config()
+        self._config_mtime = self._stat_config()
+        self._apply_config(self._load_config())
+
+    def compile_routing(self) -> None:
+        """Recompile the routing table from self.config.
+
+        Needed only after changing self.config in place; reloads from the
+        config file compile it themselves.
+        """
+        self.routing = RoutingTable.compile(self.config)
+
+    def _apply_config(self, config: Dict[str, Any]) -> None:
+        """Swap in a new config and its compiled routing table.
+
+        Circuit breakers are reset only for backends whose config (or the
+        shared "circuit_breaker" settings) changed, so saving an unrelated
+        setting doesn't reopen traffic to a backend that is known down.
+        """
+        routing = RoutingTable.compile(config)
+        previous = self.config
+        # No await between the two assignments, so no call on this event
+        # loop sees a config and routing table from different versions
+        self.config, self.routing = config, routing
+
+        breaker_settings_changed = previous.get("circuit_breaker") != config.get("circuit_breaker")
+        old_backends = previous.get("backends", {})
+        new_backends = config.get("backends", {})
+        for name in list(self._breakers):
+            if breaker_settings_changed or old_backends.get(name) != new_backends.get(name):
+                del self._breakers[name]
+
+    def _stat_config(self) -> Optional[int]:
+        """Return the config file's mtime in ns, or None if it is unreadable."""
+        try:
+            return self.config_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _maybe_reload(self) -> None:
+        """Reload the config if the file changed on disk.
+
+        Lets routing changes made through /api/config (or by editing
+        llm-config.json) reach worker processes without a restart. The
+        file is checked at most every CONFIG_CHECK_INTERVAL seconds. A file
+        that fails to parse (e.g. caught mid-write) is logged and retried
+        on the next check; the current config stays in use meanwhile.
+        """
+        now = time.monotonic()
+        if now - self._config_checked_at < CONFIG_CHECK_INTERVAL:
+            return
+        self._config_checked_at = now
+
+        mtime = self._stat_config()
+        if mtime is None or mtime == self._config_mtime:
+            return
+        try:
+            with open(self.config_path) as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable LLM config {self.config_path}: {e}")
+            return
+        self._config_mtime = mtime
+        self._apply_config(config)
+        logger.info(f"Reloaded LLM config from {self.config_path}")
 
-    async def get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client."""
-        if self._http_client is None or self._http_client.is_closed:
-            self._http_client = httpx.AsyncClient(timeout=180.0)
-        return self._http_client
+    def get_http_settings(self, backend_name: Optional[str] = None) -> Dict[str, Any]:
+        """Get connection settings for a backend.
+
+        Precedence: backend entry, then the top-level "http" section, then
+        DEFAULT_HTTP_SETTINGS.
+        """
+        backend_config = self.get_backend_config(backend_name)
+        settings = {**DEFAULT_HTTP_SETTINGS, **self.config.get("http", {})}
+        for key in DEFAULT_HTTP_SETTINGS:
+            if key in backend_config:
+                settings[key] = backend_config[key]
+        settings["http2"] = bool(settings["http2"]) and HTTP2_AVAILABLE
+        return settings
+
+    async def get_client(self, backend_name: Optional[str] = None) -> httpx.AsyncClient:
+        """Get or create the HTTP client for a backend.
+
+        Clients are rebuilt when their settings change (e.g. after
+        reload_config()). The old client is left open for requests still
+        using it and closed by close().
+
+        Args:
+            backend_name: Backend name, or None for primary backend
+        """
+        if backend_name is None:
+            backend_name = self.config.get("primary_backend", "openrouter")
+
+        settings = self.get_http_settings(backend_name)
+        settings_key = tuple(sorted(settings.items()))
+
+        client = self._http_clients.get(backend_name)
+        if client is not None and not client.is_closed:
+            if self._http_client_settings.get(backend_name) == settings_key:
+                return client
+            self._retired_http_clients.append(client)
+
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings["timeout"], connect=settings["connect_timeout"]),
+            limits=httpx.Limits(
+                max_connections=settings["max_connections"],
+                max_keepalive_connections=settings["max_keepalive_connections"],
+                keepalive_expiry=settings["keepalive_expiry"],
+            ),
+            http2=settings["http2"],
+        )
+        self._http_clients[backend_name] = client
+        self._http_client_settings[backend_name] = settings_key
+        return client
+
+    def get_retry_settings(self, backend_name: Optional[str] = None) -> Dict[str, Any]:
+        """Get retry settings for a backend.
+
+        Precedence: backend "retry" entry, then the top-level "retry"
+        section, then DEFAULT_RETRY_SETTINGS.
+        """
+        backend_config = self.get_backend_config(backend_name)
+        return {
+            **DEFAULT_RETRY_SETTINGS,
+            **self.config.get("retry", {}),
+            **backend_config.get("retry", {}),
+        }
+
+    def get_rate_limit_settings(self, backend_name: Optional[str] = None) -> Dict[str, Any]:
+        """Get shared rate-limit settings for a backend.
+
+        Precedence: backend "rate_limit" entry, then the top-level
+        "rate_limit" section, then DEFAULT_RATE_LIMIT_SETTINGS.
+        """
+        backend_name = backend_name or self.config.get("primary_backend", "openrouter")
+        backend_config = self.get_backend_config(backend_name)
+        settings = {
+            **DEFAULT_RATE_LIMIT_SETTINGS,
+            **self.config.get("rate_limit", {}),
+            **backend_config.get("rate_limit", {}),
+        }
+        settings["bucket"] = settings["bucket"] or backend_name
+        return settings
+
+    async def _acquire_rate_limit(
+        self,
+        backend_name: str,
+        messages: List[Dict[str, Any]],
+        max_tokens: Optional[int] = None,
+    ) -> Optional[Tuple[str, float, int]]:
+        """Wait for capacity in the backend's shared rate-limit bucket.
+
+        The bucket lives in the database, so every worker process draws on
+        the same budget. If the database is unavailable the call proceeds
+        unthrottled rather than failing.
+
+        Returns:
+            (bucket, tokens_per_minute, reserved_tokens) for settling the
+            token reservation after the call, or None if no limit applies
+        """
+        settings = self.get_rate_limit_settings(backend_name)
+        rpm = settings["requests_per_minute"]
+        tpm = settings["tokens_per_minute"]
+        if not rpm and not tpm:
+            return None
+
+        reserved_tokens = estimate_request_tokens(messages, max_tokens) if tpm else 0
+        try:
+            wait = await reserve_rate_limit(
+                settings["bucket"],
+                request_cost=60.0 / rpm if rpm else 0.0,
+                token_cost=reserved_tokens * 60.0 / tpm if tpm else 0.0,
+                burst_seconds=settings["burst_seconds"],
+            )
+        except Exception as e:
+            logger.warning(f"Rate limiter unavailable for {backend_name}: {e}")
+            return None
+
+        reservation = (settings["bucket"], tpm, reserved_tokens) if tpm else None
+        if wait > 0:
+            logger.info(f"Rate limit: waiting {wait:.1f}s for {settings['bucket']}")
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # Never sent, so nothing was used
+                await self._settle_rate_limit(reservation, 0)
+                raise
+
+        return reservation
+
+    async def _settle_rate_limit(
+        self,
+        reservation: Optional[Tuple[str, float, int]],
+        actual_tokens: int,
+    ) -> None:
+        """Replace a token reservation's estimate with the actual usage."""
+        if reservation is None:
+            return
+        bucket, tpm, reserved_tokens = reservation
+        if actual_tokens == reserved_tokens:
+            return
+        try:
+            await adjust_rate_limit(bucket, (actual_tokens - reserved_tokens) * 60.0 / tpm)
+        except Exception as e:
+            logger.warning(f"Rate limiter unavailable for {bucket}: {e}")
+
+    async def _post(
+        self,
+        client: httpx.AsyncClient,
+        backend_name: Optional[str],
+        url: str,
+        **kwargs,
+    ) -> httpx.Response:
+        """POST with retries on rate limits and transient failures.
+
+        Retries use jittered exponential backoff, or the server's
+        Retry-After when given. Non-retryable errors, and the last error
+        once attempts run out, are raised to the caller unchanged.
+        """
+        settings = self.get_retry_settings(backend_name)
+        max_attempts = max(1, int(settings["max_attempts"]))
+
+        for attempt in range(max_attempts):
+            retry_after = None
+            try:
+                response = await client.post(url, **kwargs)
+                response.raise_for_status()
+                return response
+            except httpx.HTTPError as e:
+                last_attempt = attempt == max_attempts - 1
+                if last_attempt or not is_retryable_error(e):
+                    raise
+                if isinstance(e, httpx.HTTPStatusError):
+                    retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+                    if retry_after is not None and retry_after > settings["max_retry_after"]:
+                        raise
+                error = e
+
+            delay = backoff_delay(attempt, settings["base_delay"], settings["max_delay"])
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+
+            logger.warning(
+                f"Retrying {backend_name} request in {delay:.1f}s "
+                f"(attempt {attempt + 1}/{max_attempts}): {error}"
+            )
+            await asyncio.sleep(delay)
+
+    def get_breaker(self, backend_name: str) -> CircuitBreaker:
+        """Get or create the circuit breaker for a backend.
+
+        Settings precedence: backend "circuit_breaker" entry, then the
+        top-level "circuit_breaker" section, then the defaults.
+        """
+        breaker = self._breakers.get(backend_name)
+        if breaker is None:
+            backend_config = self.get_backend_config(backend_name)
+            settings = {
+                **DEFAULT_CIRCUIT_BREAKER_SETTINGS,
+                **self.config.get("circuit_breaker", {}),
+                **backend_config.get("circuit_breaker", {}),
+            }
+            breaker = CircuitBreaker(**settings)
+            self._breakers[backend_name] = breaker
+        return breaker
+
+    def get_backend_stats(self, backend_name: str, phase: Optional[str] = None) -> BackendStats:
+        """Return (creating on first use) the telemetry for a backend/phase."""
+        stats = self._backend_stats.get((backend_name, phase))
+        if stats is None:
+            settings = {
+                **DEFAULT_LATENCY_ROUTING_SETTINGS,
+                **self.config.get("latency_routing", {}),
+            }
+            stats = BackendStats(
+                window_size=settings["window_size"],
+                max_age_seconds=settings["max_age_seconds"],
+            )
+            self._backend_stats[(backend_name, phase)] = stats
+        return stats
+
+    def _record_stats(
+        self,
+        backend_name: str,
+        phase: Optional[str],
+        duration_ms: int,
+        output_tokens: Optional[int] = None,
+    ) -> None:
+        """Record a call outcome (output_tokens None = failure)."""
+        keys = [None, phase] if phase else [None]
+        for key in keys:
+            stats = self.get_backend_stats(backend_name, key)
+            if output_tokens is None:
+                stats.record_failure(duration_ms)
+            else:
+                stats.record_success(duration_ms, output_tokens)
+
+    def plan_max_tokens(self, phase: str, transcript_tokens: int) -> Optional[int]:
+        """Plan a phase's output token cap from its transcript size.
+
+        Args:
+            phase: Phase name
+            transcript_tokens: Tokens in the job's transcript
+
+        Returns:
+            max_tokens for the phase's calls, or None if the phase has no plan
+        """
+        override = self.config.get("max_tokens", {}).get(phase)
+        if isinstance(override, (int, float)):
+            return int(override)
+
+        plan = {**DEFAULT_MAX_TOKENS_PLAN.get(phase, {}), **(override or {})}
+        if not plan:
+            return None
+        tokens = max(int(transcript_tokens * plan.get("ratio", 0.0)), int(plan.get("min", 0)))
+        if plan.get("max") is not None:
+            tokens = min(tokens, int(plan["max"]))
+        return tokens
+
+    def get_reasoning_settings(self, phase: str) -> Optional[Dict[str, Any]]:
+        """Get a phase's reasoning controls, or None to leave the model's default.
+
+        A phase entry under "reasoning" in the config merges over
+        DEFAULT_REASONING_SETTINGS; null drops the phase's default.
+        """
+        overrides = self.config.get("reasoning", {})
+        if phase in overrides and overrides[phase] is None:
+            return None
+        settings = {**DEFAULT_REASONING_SETTINGS.get(phase, {}), **(overrides.get(phase) or {})}
+        return settings or None
+
+    def get_context_budgets(self, phase: str) -> Dict[str, Dict[str, Any]]:
+        """Get a phase's context input budgets ("context_budgets" over the defaults)."""
+        return merge_context_budgets(phase, self.config.get("context_budgets", {}).get(phase))
+
+    def get_response_cache_settings(self) -> Dict[str, Any]:
+        """Get response cache settings ("response_cache" over the defaults)."""
+        return {**DEFAULT_RESPONSE_CACHE_SETTINGS, **self.config.get("response_cache", {})}
+
+    def get_response_cache(self, phase: Optional[str]) -> Optional[ResponseCache]:
+        """Return the response cache if enabled for this phase, else None."""
+        settings = self.get_response_cache_settings()
+        if not settings["enabled"] or phase is None or phase not in settings["phases"]:
+            return None
+
+        directory = Path(settings["directory"])
+        max_bytes = int(settings["max_mb"] * 1024 * 1024)
+        cache = self._response_cache
+        if cache is None or cache.directory != directory or cache.max_bytes != max_bytes:
+            cache = self._response_cache = ResponseCache(directory, max_bytes)
+        return cache
+
+    def _cacheable(self, response: LLMResponse, phase: Optional[str], kwargs: Dict[str, Any]) -> bool:
+        """Return True if a response may be stored in the response cache.
+
+        Structured output that fails validation is not stored, so a rerun
+        asks again rather than replaying it.
+        """
+        if kwargs.get("response_schema") is None or phase is None:
+            return True
+        try:
+            parse_structured_output(phase, response.content)
+        except StructuredOutputError:
+            return False
+        return True
+
+    async def _serve_cached_response(
+        self,
+        entry: Dict[str, Any],
+        cache_key: str,
+        job_id: Optional[int],
+        phase: Optional[str],
+        tier: Optional[int] = None,
+    ) -> LLMResponse:
+        """Build a response from a cache entry and account the hit."""
+        response = LLMResponse(**entry)
+        saved_cost = response.cost
+        response.cost = 0.0
+        response.duration_ms = 0
+        response.cache_hit = True
+
+        if _current_run_tracker is not None:
+            _current_run_tracker.add_cache_hit(saved_cost)
+
+        # api_call rather than cost_update, so hits stay out of the cost
+        # rollups and latency telemetry
+        await log_event(EventCreate(
+            job_id=job_id,
+            event_type=EventType.api_call,
+            data=EventData(
+                cost=0.0,
+                tokens=response.total_tokens,
+                model=response.model,
+                backend=response.backend,
+                phase=phase,
+                extra={
+                    "cache_hit": True, "saved_cost": saved_cost, "cache_key": cache_key,
+                    **({"tier": tier} if tier is not None else {}),
+                },
+            ),
+        ))
+        return response
+
+    def get_hedging_settings(self) -> Dict[str, Any]:
+        """Get hedging settings ("hedging" section over DEFAULT_HEDGING_SETTINGS)."""
+        return {**DEFAULT_HEDGING_SETTINGS, **self.config.get("hedging", {})}
+
+    def get_hedge_delay(self, backend_name: str, phase: Optional[str] = None) -> Optional[float]:
+        """Return seconds to wait before hedging a call, or None to not hedge.
+
+        Uses the backend's latency percentile for the phase (or across all
+        phases if the phase has too few samples), floored at min_delay_ms.
+        """
+        settings = self.get_hedging_settings()
+        if not settings["enabled"]:
+            return None
+
+        latency_ms = None
+        for key in ([phase, None] if phase else [None]):
+            latency_ms = self.get_backend_stats(backend_name, key).latency_percentile(
+                settings["percentile"], settings["min_samples"]
+            )
+            if latency_ms is not None:
+                break
+        if latency_ms is None:
+            return None
+        return max(latency_ms, settings["min_delay_ms"]) / 1000
+
+    def get_hedge_backend(self, backend_name: str) -> Optional[str]:
+        """Return the alternate backend for a hedged call.
+
+        Precedence: the backend's "hedge_backend" entry, then another backend
+        in the same routing tier, then the next tier's backend.
+        """
+        explicit = self.get_backend_config(backend_name).get("hedge_backend")
+        if explicit:
+            return explicit if explicit in self.config.get("backends", {}) else None
+
+        tiers = self.routing.tiers
+        for tier, names in enumerate(tiers):
+            if backend_name not in names:
+                continue
+            peers = [name for name in names if name != backend_name]
+            alternate = self.select_backend(peers) if peers else None
+            if alternate is None and tier + 1 < len(tiers):
+                alternate = self.get_backend_for_tier(tier + 1)
+            if alternate is not None and alternate != backend_name:
+                return alternate
+        return None
+
+    def select_backend(self, candidates: List[str]) -> Optional[str]:
+        """Pick the best of several equivalent backends.
+
+        Unavailable backends (unknown, disabled, or with an open circuit) are
+        skipped. Any backend without min_samples recent calls is tried first
+        so every candidate gets measured; after that the highest
+        BackendStats.score() wins, ties going to config order.
+
+        Returns:
+            Backend name, or None if no candidate is configured
+        """
+        backends = self.config.get("backends", {})
+        configured = [
+            name for name in candidates
+            if name in backends and backends[name].get("enabled", True)
+        ]
+        if not configured:
+            return None
+
+        available = [name for name in configured if self.get_breaker(name).can_attempt()]
+        settings = {**DEFAULT_LATENCY_ROUTING_SETTINGS, **self.config.get("latency_routing", {})}
+        if len(available) <= 1 or not settings["enabled"]:
+            # chat() routes around an open circuit if nothing is available
+            return (available or configured)[0]
+
+        for name in available:
+            if self.get_backend_stats(name).calls < settings["min_samples"]:
+                return name
+
+        return max(available, key=lambda name: self.get_backend_stats(name).score())
+
+    def get_tier_backends(self, tier: int) -> List[str]:
+        """Return the backend names listed for a routing tier.
+
+        A tier entry is a backend name or a list of equivalent backends.
+        """
+        return self.routing.tier_backends(tier)
+
+    def get_fallback_chain(
+        self,
+        tier: int,
+        backend_name: str,
+    ) -> Tuple[List[Dict[str, Optional[str]]], Dict[str, Any]]:
+        """Return the ordered candidates to try within a tier, and its budget.
+
+        The first candidate is the tier's selected backend with its
+        configured model. Fallbacks come from routing.fallback_chains, keyed
+        by tier label (or index), e.g.
+
+            "cheapskate": {
+                "chain": ["mistralai/devstral-2-2512:free",
+                          {"backend": "openrouter", "model": "google/gemini-2.5-flash"}],
+                "max_attempts": 3,
+                "max_seconds": 300
+            }
+
+        A plain string is a model on the tier's backend.
+
+        Returns:
+            (candidates, budget) where each candidate is a dict with
+            "backend" and "model" (None = backend default)
+        """
+        chain = self.routing.fallback_chain(tier)
+
+        candidates = [{"backend": backend_name, "model": None}]
+        backends = self.config.get("backends", {})
+        for backend, model in chain.entries:
+            candidate = {"backend": backend or backend_name, "model": model}
+            if candidate["backend"] in backends and candidate not in candidates:
+                candidates.append(candidate)
+
+        return candidates, dict(chain.budget)
+
+    def get_backend_for_tier(self, tier: int) -> Optional[str]:
+        """Return the backend to use for a routing tier, or None if unconfigured."""
+        return self.select_backend(self.get_tier_backends(tier))
+
+    def get_fallback_backend(self, backend_name: str) -> Optional[str]:
+        """Return the fallback for a backend (its own, else the global one)."""
+        backend_config = self.get_backend_config(backend_name)
+        fallback = backend_config.get("fallback_backend") or self.config.get("fallback_backend")
+        if fallback == backend_name or fallback not in self.config.get("backends", {}):
+            return None
+        return fallback
+
+    async def _route_around_open_circuit(
+        self,
+        backend_name: str,
+        job_id: Optional[int] = None,
+        phase: Optional[str] = None,
+    ) -> str:
+        """Return backend_name, or its fallback if its circuit is open.
+
+        Raises:
+            CircuitOpenError: If the circuit is open and the fallback is
+                unavailable too
+        """
+        if self.get_breaker(backend_name).can_attempt():
+            return backend_name
+
+        fallback = self.get_fallback_backend(backend_name)
+        if fallback is None or not self.get_breaker(fallback).can_attempt():
+            raise CircuitOpenError(
+                f"Backend '{backend_name}' circuit is open"
+                + (f" and fallback '{fallback}' is unavailable" if fallback else "")
+            )
+
+        logger.warning(f"Circuit open for {backend_name}, failing over to {fallback}")
+        await log_event(EventCreate(
+            job_id=job_id,
+            event_type=EventType.model_fallback,
+            data=EventData(
+                backend=fallback,
+                phase=phase,
+                reason=f"circuit open for {backend_name}",
+                extra={"from_backend": backend_name, "to_backend": fallback},
+            ),
+        ))
+        return fallback
+
+    def get_routed_backends(self) -> List[str]:
+        """Return enabled backends referenced by routing, phases, or as primary."""
+        names = self.routing.routed_backends()
+        backends = self.config.get("backends", {})
+        routed = []
+        for name in names:
+            if name in backends and backends[name].get("enabled", True) and name not in routed:
+                routed.append(name)
+        return routed
+
+    async def warm_up(self, backends: Optional[List[str]] = None) -> Dict[str, bool]:
+        """Open a pooled connection to each backend ahead of the first call.
+
+        Sends a HEAD request to the endpoint's origin so DNS, TCP and TLS
+        (and HTTP/2 negotiation) are done before a job needs them. Failures
+        are logged and otherwise ignored.
+
+        Args:
+            backends: Backend names (default: get_routed_backends())
+
+        Returns:
+            Dict of backend name -> whether a connection was established
+        """
+        if backends is None:
+            backends = self.get_routed_backends()
+
+        async def _warm(name: str) -> bool:
+            endpoint = self.get_backend_config(name).get("endpoint")
+            if not endpoint:
+                return False
+            parts = urlsplit(endpoint)
+            client = await self.get_client(name)
+            try:
+                await client.head(f"{parts.scheme}://{parts.netloc}/")
+                return True
+            except httpx.HTTPError as e:
+                logger.warning(f"Connection warm-up failed for {name}: {e}")
+                return False
+
+        results = await asyncio.gather(*(_warm(name) for name in backends))
+        return dict(zip(backends, results))
 
     async def close(self) -> None:
-        """Close HTTP client."""
-        if self._http_client is not None:
-            await self._http_client.aclose()
-            self._http_client = None
+        """Close all HTTP clients and the cassette, if any."""
+        for client in [*self._http_clients.values(), *self._retired_http_clients]:
+            await client.aclose()
+        self._http_clients.clear()
+        self._http_client_settings.clear()
+        self._retired_http_clients.clear()
+        if self.cassette is not None:
+            self.cassette.close()
+
+    def set_cassette(self, cassette: Optional[Cassette]) -> None:
+        """Record to or replay from a cassette (None to call backends normally)."""
+        if self.cassette is not None and self.cassette is not cassette:
+            self.cassette.close()
+        self.cassette = cassette
 
     def get_backend_config(self, backend_name: Optional[str] = None) -> Dict[str, Any]:
         """Get configuration for a specific backend.
@@ -374,6 +1652,8 @@ class LLMClient:
         """Get the configured backend for a specific agent phase.
 
         Supports tiered routing based on transcript duration and explicit tier override.
+        When the selected tier lists several backends, the one with the best
+        recent throughput is chosen (see select_backend).
 
         Args:
             phase: Phase name (e.g., 'analyst', 'formatter', 'seo', 'copy_editor')
@@ -383,48 +1663,23 @@ class LLMClient:
         Returns:
             Backend name to use for this phase
         """
-        routing_config = self.config.get("routing", {})
-        tiers = routing_config.get("tiers", ["openrouter-cheapskate", "openrouter", "openrouter-big-brain"])
-
-        # Get base tier for this phase (default to tier 0 = cheapskate)
-        phase_base_tiers = routing_config.get("phase_base_tiers", {})
-        base_tier = phase_base_tiers.get(phase, 0)
+        self._maybe_reload()
+        routing = self.routing
 
         # If tier override provided, use it directly
         if tier_override is not None:
-            selected_tier = min(tier_override, len(tiers) - 1)
+            selected_tier = min(tier_override, len(routing.tiers) - 1)
         else:
-            # Calculate tier based on transcript duration
-            selected_tier = base_tier
-
-            if context:
-                transcript_metrics = context.get("transcript_metrics", {})
-                estimated_duration = transcript_metrics.get("estimated_duration_minutes", 0)
-
-                # Find appropriate tier based on duration thresholds
-                duration_thresholds = routing_config.get("duration_thresholds", [])
-                for threshold in duration_thresholds:
-                    max_minutes = threshold.get("max_minutes")
-                    tier = threshold.get("tier", 0)
-
-                    if max_minutes is None or estimated_duration <= max_minutes:
-                        # Use the higher of base tier or duration-based tier
-                        selected_tier = max(base_tier, tier)
-                        break
-                else:
-                    # No threshold matched, use max tier
-                    selected_tier = max(base_tier, len(tiers) - 1)
+            selected_tier, _ = routing.tier_for(phase, _context_duration(context))
 
         # Get backend for selected tier
-        if selected_tier < len(tiers):
-            backend = tiers[selected_tier]
-            # Validate backend exists
-            if backend in self.config.get("backends", {}):
+        if selected_tier < len(routing.tiers):
+            backend = self.select_backend(routing.tier_backends(selected_tier))
+            if backend is not None:
                 return backend
 
         # Fall back to phase_backends config or primary backend
-        phase_backends = self.config.get("phase_backends", {})
-        return phase_backends.get(phase, self.config.get("primary_backend", "openrouter"))
+        return routing.phase_backend(phase)
 
     def get_tier_for_phase(
         self,
@@ -457,36 +1712,8 @@ class LLMClient:
         Returns:
             Tuple of (tier index, reason string)
         """
-        routing_config = self.config.get("routing", {})
-        tiers = routing_config.get("tiers", ["openrouter-cheapskate", "openrouter", "openrouter-big-brain"])
-
-        # Get base tier for this phase
-        phase_base_tiers = routing_config.get("phase_base_tiers", {})
-        base_tier = phase_base_tiers.get(phase, 0)
-
-        if not context:
-            return base_tier, f"phase default (base tier {base_tier})"
-
-        transcript_metrics = context.get("transcript_metrics", {})
-        estimated_duration = transcript_metrics.get("estimated_duration_minutes", 0)
-
-        # Find appropriate tier based on duration thresholds
-        duration_thresholds = routing_config.get("duration_thresholds", [])
-        for threshold in duration_thresholds:
-            max_minutes = threshold.get("max_minutes")
-            tier = threshold.get("tier", 0)
-
-            if max_minutes is None or estimated_duration <= max_minutes:
-                selected_tier = max(base_tier, tier)
-                if selected_tier > base_tier:
-                    reason = f"duration {estimated_duration:.0f}min (threshold: ≤{max_minutes}min → tier {tier})"
-                else:
-                    reason = f"phase default (base tier {base_tier})"
-                return selected_tier, reason
-
-        # No threshold matched, use max tier
-        max_tier = len(tiers) - 1
-        return max(base_tier, max_tier), f"duration {estimated_duration:.0f}min exceeds all thresholds"
+        self._maybe_reload()
+        return self.routing.tier_for(phase, _context_duration(context))
 
     def get_next_tier(self, current_tier: int) -> Optional[int]:
         """Get the next escalation tier, or None if at max.
@@ -497,12 +1724,8 @@ class LLMClient:
         Returns:
             Next tier index, or None if already at max
         """
-        routing_config = self.config.get("routing", {})
-        tiers = routing_config.get("tiers", ["openrouter-cheapskate", "openrouter", "openrouter-big-brain"])
-
-        if current_tier < len(tiers) - 1:
-            return current_tier + 1
-        return None
+        self._maybe_reload()
+        return self.routing.next_tier(current_tier)
 
     def get_escalation_config(self) -> Dict[str, Any]:
         """Get escalation configuration.
@@ -510,14 +1733,8 @@ class LLMClient:
         Returns:
             Dict with escalation settings (enabled, on_failure, on_timeout, etc.)
         """
-        routing_config = self.config.get("routing", {})
-        return routing_config.get("escalation", {
-            "enabled": True,
-            "on_failure": True,
-            "on_timeout": True,
-            "timeout_seconds": 120,
-            "max_retries_per_tier": 1
-        })
+        self._maybe_reload()
+        return dict(self.routing.escalation)
 
     def get_api_key(self, backend_config: Dict[str, Any]) -> Optional[str]:
         """Get API key for a backend from environment."""
@@ -533,6 +1750,7 @@ class LLMClient:
         model: Optional[str] = None,
         preset: Optional[str] = None,
         job_id: Optional[int] = None,
+        phase: Optional[str] = None,
         **kwargs,
     ) -> LLMResponse:
         """Make a chat completion request.
@@ -540,19 +1758,357 @@ class LLMClient:
         Args:
             messages: List of message dicts with 'role' and 'content'
             backend: Backend to use (default: primary)
-            model: Model override (default: backend's configured model)
-            preset: OpenRouter preset override (default: backend's configured preset)
+            model: Model override (default: backend's configured preset or model)
+            preset: OpenRouter preset override (default: backend's configured
+                preset, unless a model is given)
             job_id: Job ID for event logging
-            **kwargs: Additional parameters passed to the API
+            phase: Agent phase making the call, recorded for analytics rollups
+            **kwargs: Additional parameters passed to the API. "reasoning"
+                ({"effort", "max_tokens", "exclude"}, see
+                get_reasoning_settings) is translated for backends that
+                support it and dropped for the rest. "response_schema"
+                ({"name", "schema"}) asks for JSON output matching a JSON
+                schema, as far as the backend can enforce it. "tier" (the
+                routing tier the call was made at) is not sent; it is
+                recorded on the call's events for the session_stats tier
+                column. "refresh_cache": True skips the response cache
+                read (the new response is still stored), for retries of
+                output judged bad.
 
         Returns:
             LLMResponse with content, tokens, and cost
+
+        Raises:
+            CircuitOpenError: If the backend's circuit is open and there is
+                no available fallback
+        """
+        self._maybe_reload()
+        backend = backend or self.routing.primary_backend
+
+        cassette = self.cassette
+        if cassette is None:
+            return await self._chat_coalesced(messages, backend, model, preset, job_id, phase, **kwargs)
+
+        key = cassette_key(messages, model, preset, kwargs, phase)
+        if cassette.replaying:
+            return await self._replay_chat(cassette, key, job_id, phase, kwargs.get("tier"))
+
+        start_time = time.time()
+        try:
+            response = await self._chat_coalesced(messages, backend, model, preset, job_id, phase, **kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            cassette.record({
+                "key": key,
+                "phase": phase,
+                "duration_ms": int((time.time() - start_time) * 1000),
+                "error": {"type": type(e).__name__, "message": str(e)},
+            })
+            raise
+        cassette.record({
+            "key": key,
+            "phase": phase,
+            "duration_ms": int((time.time() - start_time) * 1000),
+            "response": {k: v for k, v in asdict(response).items() if k != "raw_response"},
+        })
+        return response
+
+    async def _chat_coalesced(
+        self,
+        messages: List[Dict[str, Any]],
+        backend: str,
+        model: Optional[str],
+        preset: Optional[str],
+        job_id: Optional[int],
+        phase: Optional[str],
+        **kwargs,
+    ) -> LLMResponse:
+        """Make a call, or share an identical one already in flight.
+
+        Only calls for the same job are shared, so each job's cost covers
+        the calls it depends on. The call is accounted to the caller that
+        started it. Callers that join it get a copy marked coalesced at no
+        cost, logged as an api_call so it stays out of the cost rollups.
+        """
+        key = cassette_key(messages, model, preset, {"backend": backend, "job_id": job_id, **kwargs}, phase)
+        response, shared = await self._flights.do(
+            key,
+            lambda: self._chat_complete(messages, backend, model, preset, job_id, phase, **kwargs),
+        )
+        if not shared:
+            return response
+
+        logger.info(f"Joined an identical in-flight request on {response.backend}")
+        await log_event(EventCreate(
+            job_id=job_id,
+            event_type=EventType.api_call,
+            data=EventData(
+                cost=0.0,
+                tokens=response.total_tokens,
+                model=response.model,
+                backend=response.backend,
+                phase=phase,
+                extra={"coalesced": True, "saved_cost": response.cost},
+            ),
+        ))
+        return replace(response, cost=0.0, coalesced=True)
+
+    def get_continuation_settings(self) -> Dict[str, Any]:
+        """Get continuation settings ("continuation" over DEFAULT_CONTINUATION_SETTINGS)."""
+        return {**DEFAULT_CONTINUATION_SETTINGS, **self.config.get("continuation", {})}
+
+    async def _chat_complete(
+        self,
+        messages: List[Dict[str, Any]],
+        backend: str,
+        model: Optional[str],
+        preset: Optional[str],
+        job_id: Optional[int],
+        phase: Optional[str],
+        **kwargs,
+    ) -> LLMResponse:
+        """Make a call, continuing the output while it stops at the length limit.
+
+        Each continuation resends the conversation with the output so far
+        as an assistant turn. Anthropic continues an assistant turn
+        directly; other backends get CONTINUATION_PROMPT. The returned
+        response carries the joined content and the summed usage and cost.
+        """
+        response = await self._chat_routed(messages, backend, model, preset, job_id, phase, **kwargs)
+
+        settings = self.get_continuation_settings()
+        if not settings["enabled"]:
+            return response
+
+        # Picking up mid-output needs no further reasoning (and Anthropic
+        # rejects an assistant prefill with thinking enabled); a JSON mode
+        # would force the remainder to be a whole JSON document of its own
+        continue_kwargs = {k: v for k, v in kwargs.items() if k not in ("reasoning", "response_schema")}
+
+        while response.truncated and response.continuations < settings["max_continuations"]:
+            max_output = settings["max_output_tokens"]
+            if max_output is not None and response.output_tokens >= max_output:
+                break
+
+            backend_name = response.backend
+            partial = response.content
+            if self.get_backend_config(backend_name).get("type") == "anthropic":
+                # Anthropic rejects a final assistant turn ending in whitespace
+                partial = partial.rstrip()
+                follow_up = messages + [{"role": "assistant", "content": partial}]
+            else:
+                follow_up = messages + [
+                    {"role": "assistant", "content": partial},
+                    {"role": "user", "content": CONTINUATION_PROMPT},
+                ]
+
+            logger.info(
+                f"Output truncated at {response.output_tokens} tokens on {backend_name}, "
+                f"continuing ({response.continuations + 1}/{settings['max_continuations']})"
+            )
+            more = await self._chat_routed(follow_up, backend_name, model, preset, job_id, phase, **continue_kwargs)
+
+            response = LLMResponse(
+                content=join_continuation(partial, more.content),
+                model=more.model,
+                input_tokens=response.input_tokens + more.input_tokens,
+                output_tokens=response.output_tokens + more.output_tokens,
+                total_tokens=response.total_tokens + more.total_tokens,
+                cost=response.cost + more.cost,
+                duration_ms=response.duration_ms + more.duration_ms,
+                backend=more.backend,
+                raw_response=more.raw_response,
+                cached_tokens=response.cached_tokens + more.cached_tokens,
+                cache_write_tokens=response.cache_write_tokens + more.cache_write_tokens,
+                finish_reason=more.finish_reason,
+                continuations=response.continuations + 1,
+                reasoning_tokens=response.reasoning_tokens + more.reasoning_tokens,
+                reasoning=response.reasoning,
+            )
+
+        if response.truncated:
+            logger.warning(
+                f"Output still truncated after {response.continuations} continuation(s) on {response.backend}"
+            )
+        return response
+
+    async def _chat_routed(
+        self,
+        messages: List[Dict[str, str]],
+        backend: str,
+        model: Optional[str],
+        preset: Optional[str],
+        job_id: Optional[int],
+        phase: Optional[str],
+        **kwargs,
+    ) -> LLMResponse:
+        """Make a call on backend, hedged if configured for it."""
+        delay = self.get_hedge_delay(backend, phase)
+        if delay is None:
+            return await self._chat_once(messages, backend, model, preset, job_id, phase, **kwargs)
+
+        return await self._hedged_chat(
+            delay, messages, backend, model, preset, job_id, phase, **kwargs
+        )
+
+    async def _replay_chat(
+        self,
+        cassette: Cassette,
+        key: str,
+        job_id: Optional[int],
+        phase: Optional[str],
+        tier: Optional[int] = None,
+    ) -> LLMResponse:
+        """Answer a call from the cassette, accounting it like a live call.
+
+        Raises:
+            CassetteMissError: If the call was not recorded
+        """
+        entry = cassette.next(key)
+        if cassette.latency == LATENCY_RECORDED:
+            await asyncio.sleep(entry["duration_ms"] / 1000)
+
+        error = entry.get("error")
+        if error is not None:
+            error_class = REPLAYABLE_ERRORS.get(error["type"], ReplayedError)
+            raise error_class(error["message"])
+
+        response = LLMResponse(**entry["response"])
+        self.check_run_cost_cap()
+        self.active_backend = response.backend
+        self.active_model = response.model
+        await self._account_call(response, job_id, phase, {"replayed": True}, tier)
+        return response
+
+    async def _hedged_chat(
+        self,
+        delay: float,
+        messages: List[Dict[str, str]],
+        backend: str,
+        model: Optional[str],
+        preset: Optional[str],
+        job_id: Optional[int],
+        phase: Optional[str],
+        **kwargs,
+    ) -> LLMResponse:
+        """Run a call, hedging to an alternate backend after `delay` seconds.
+
+        The first successful response wins and the other call is cancelled.
+        Completed calls are costed as usual; a cancelled call is charged an
+        estimate for its prompt, since providers may bill it regardless.
         """
-        backend_name = backend or self.config.get("primary_backend", "openrouter")
+        primary = asyncio.create_task(
+            self._chat_once(messages, backend, model, preset, job_id, phase, **kwargs)
+        )
+        tasks = {primary: backend}
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            hedge_backend = None if done else self.get_hedge_backend(backend)
+            if hedge_backend is None:
+                return await primary
+
+            logger.info(f"Hedging slow {backend} call ({delay:.1f}s) to {hedge_backend}")
+            await log_event(EventCreate(
+                job_id=job_id,
+                event_type=EventType.model_fallback,
+                data=EventData(
+                    backend=hedge_backend,
+                    phase=phase,
+                    reason=f"hedging call slower than {delay:.1f}s on {backend}",
+                    extra={"from_backend": backend, "to_backend": hedge_backend, "hedge": True},
+                ),
+            ))
+            hedge = asyncio.create_task(
+                self._chat_once(messages, hedge_backend, None, None, job_id, phase, hedge=True, **kwargs)
+            )
+            tasks[hedge] = hedge_backend
+
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        for loser in pending:
+                            loser.cancel()
+                            await self._charge_cancelled_call(tasks[loser], messages, job_id, phase, kwargs.get("tier"))
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _charge_cancelled_call(
+        self,
+        backend_name: str,
+        messages: List[Dict[str, Any]],
+        job_id: Optional[int],
+        phase: Optional[str],
+        tier: Optional[int] = None,
+    ) -> None:
+        """Account an estimated prompt cost for a call abandoned by hedging."""
         backend_config = self.get_backend_config(backend_name)
+        model_id = backend_config.get("model") or backend_config.get("fallback_model") or ""
+        input_tokens = estimate_request_tokens(messages)
+        cost = self.estimate_call_cost(backend_name, model_id, input_tokens, 0)
+
+        if _current_run_tracker is not None:
+            _current_run_tracker.add_call(LLMResponse(
+                content="",
+                model=model_id,
+                input_tokens=input_tokens,
+                output_tokens=0,
+                total_tokens=input_tokens,
+                cost=cost,
+                duration_ms=0,
+                backend=backend_name,
+            ))
 
-        # Determine model - for OpenRouter with preset, use @preset/name syntax
-        preset_name = preset or backend_config.get("preset")
+        await log_event(EventCreate(
+            job_id=job_id,
+            event_type=EventType.cost_update,
+            data=EventData(
+                cost=cost,
+                tokens=input_tokens,
+                model=model_id,
+                backend=backend_name,
+                phase=phase,
+                extra={
+                    "hedge_cancelled": True, "estimated": True,
+                    **({"tier": tier} if tier is not None else {}),
+                },
+            ),
+        ))
+
+    async def _chat_once(
+        self,
+        messages: List[Dict[str, str]],
+        backend: str,
+        model: Optional[str],
+        preset: Optional[str],
+        job_id: Optional[int],
+        phase: Optional[str],
+        hedge: bool = False,
+        **kwargs,
+    ) -> LLMResponse:
+        """Make a single chat request on one backend (see chat())."""
+        # Recorded on this call's events; not request parameters
+        tier = kwargs.pop("tier", None)
+        refresh_cache = kwargs.pop("refresh_cache", False)
+        requested_backend = backend
+        backend_name = await self._route_around_open_circuit(requested_backend, job_id, phase)
+        if backend_name != requested_backend:
+            # Overrides were chosen for the original backend
+            model = preset = None
+        backend_config = self.get_backend_config(backend_name)
+
+        # Determine model - for OpenRouter with preset, use @preset/name syntax.
+        # An explicit model (e.g. from a fallback chain) bypasses the
+        # backend's configured preset.
+        preset_name = preset or (None if model else backend_config.get("preset"))
         if preset_name and backend_config.get("type") == "openrouter":
             model_id = f"@preset/{preset_name}"
             self.active_preset = preset_name
@@ -563,10 +2119,26 @@ class LLMClient:
         self.active_backend = backend_name
         self.active_model = model_id
 
+        # Identical requests are served from the response cache, if enabled
+        # for this phase
+        cache = self.get_response_cache(phase)
+        cache_key = None
+        if cache is not None:
+            cache_key = response_cache_key(backend_name, model_id, messages, kwargs)
+            entry = None if refresh_cache else await asyncio.to_thread(cache.get, cache_key)
+            if entry is not None:
+                return await self._serve_cached_response(entry, cache_key, job_id, phase, tier)
+
+        # Never ask a backend for more output than its model can produce
+        output_limit = backend_config.get("max_output_tokens")
+        if output_limit and kwargs.get("max_tokens") and kwargs["max_tokens"] > output_limit:
+            kwargs["max_tokens"] = output_limit
+
         # Safety guards - check before making request
         self.check_run_cost_cap()
         self.check_model_allowed(model_id)
         self.check_token_cost(model_id)
+        self.check_call_cost(backend_name, model_id, messages, kwargs.get("max_tokens"))
 
         # Get API key
         api_key = self.get_api_key(backend_config)
@@ -574,36 +2146,84 @@ class LLMClient:
         # Build request based on backend type
         backend_type = backend_config.get("type", "openai")
 
-        start_time = time.time()
+        breaker = self.get_breaker(backend_name)
+        if not breaker.begin_call():
+            raise CircuitOpenError(f"Backend '{backend_name}' circuit is open")
 
-        if backend_type == "openrouter":
-            response = await self._call_openrouter(
-                backend_config, model_id, messages, api_key, **kwargs
-            )
-        elif backend_type == "openai":
-            response = await self._call_openai(
-                backend_config, model_id, messages, api_key, **kwargs
+        # Queue behind the fleet-wide rate limit rather than drawing 429s.
+        # Reserved only once the breaker lets the call through, and settled
+        # on every exit: a failed call is charged its prompt only.
+        try:
+            reservation = await self._acquire_rate_limit(
+                backend_name, messages, kwargs.get("max_tokens")
             )
-        elif backend_type == "anthropic":
-            response = await self._call_anthropic(
-                backend_config, model_id, messages, api_key, **kwargs
-            )
-        elif backend_type == "gemini":
-            response = await self._call_gemini(
-                backend_config, model_id, messages, api_key, **kwargs
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+
+        start_time = time.time()
+
+        try:
+            response = await self._dispatch(
+                backend_type, backend_config, model_id, messages, api_key, backend_name, **kwargs
             )
-        else:
-            raise ValueError(f"Unsupported backend type: {backend_type}")
+        except asyncio.CancelledError:
+            # Cancelled by the worker's phase timeout or a pause/cancel; only
+            # a call that was already slow says anything about the backend
+            elapsed_ms = int((time.time() - start_time) * 1000)
+            if breaker.slow_call_ms is not None and elapsed_ms > breaker.slow_call_ms:
+                breaker.record_failure()
+            else:
+                breaker.release()
+            await self._settle_rate_limit(reservation, estimate_request_tokens(messages))
+            raise
+        except Exception as e:
+            if is_backend_failure(e):
+                breaker.record_failure()
+                self._record_stats(backend_name, phase, int((time.time() - start_time) * 1000))
+            else:
+                # Says nothing about backend health either way, so it must
+                # not close a half-open circuit
+                breaker.release()
+            await self._settle_rate_limit(reservation, estimate_request_tokens(messages))
+            raise
 
         duration_ms = int((time.time() - start_time) * 1000)
+        breaker.record_success(duration_ms)
+        self._record_stats(backend_name, phase, duration_ms, response.output_tokens)
         response.duration_ms = duration_ms
         response.backend = backend_name
+        await self._settle_rate_limit(reservation, response.total_tokens)
+
+        if cache_key is not None and self._cacheable(response, phase, kwargs):
+            entry = {k: v for k, v in asdict(response).items() if k not in ("raw_response", "cache_hit")}
+            try:
+                await asyncio.to_thread(cache.put, cache_key, entry)
+            except OSError as e:
+                logger.warning(f"Could not write response cache entry: {e}")
 
-        # Track costs
+        await self._account_call(response, job_id, phase, {"hedge": True} if hedge else {}, tier)
+        return response
+
+    async def _account_call(
+        self,
+        response: LLMResponse,
+        job_id: Optional[int],
+        phase: Optional[str],
+        extra: Dict[str, Any],
+        tier: Optional[int] = None,
+    ) -> None:
+        """Add a completed call to the run tracker and log its cost_update."""
         if _current_run_tracker is not None:
             _current_run_tracker.add_call(response)
 
-        # Log cost_update event
+        extra = dict(extra)
+        if tier is not None:
+            extra["tier"] = tier
+        if response.cached_tokens:
+            extra["cached_tokens"] = response.cached_tokens
+        if response.reasoning_tokens:
+            extra["reasoning_tokens"] = response.reasoning_tokens
         await log_event(EventCreate(
             job_id=job_id,
             event_type=EventType.cost_update,
@@ -611,12 +2231,76 @@ class LLMClient:
                 cost=response.cost,
                 tokens=response.total_tokens,
                 model=response.model,
-                backend=backend_name,
-                duration_ms=duration_ms,
+                backend=response.backend,
+                duration_ms=response.duration_ms,
+                phase=phase,
+                extra=extra or None,
             ),
         ))
 
-        return response
+    def _prepare_messages(
+        self,
+        backend_type: str,
+        config: Dict[str, Any],
+        model: str,
+        messages: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Keep cache_control markers only where the backend honours them.
+
+        Callers may send content as a list of text blocks with a
+        cache_control marker on the stable prefix (see the worker's phase
+        prompts). Anthropic takes these natively and OpenRouter forwards them
+        to Anthropic and Gemini models (and presets, which may use either);
+        every other backend gets plain strings. Set "prompt_caching": false on a backend to always flatten.
+        """
+        if config.get("prompt_caching", True):
+            if backend_type == "anthropic":
+                return messages
+            if backend_type == "openrouter" and model.startswith(OPENROUTER_CACHE_CONTROL_PREFIXES):
+                return messages
+        return strip_cache_markers(messages)
+
+    async def _dispatch(
+        self,
+        backend_type: str,
+        config: Dict[str, Any],
+        model: str,
+        messages: List[Dict[str, str]],
+        api_key: Optional[str],
+        backend_name: str,
+        **kwargs,
+    ) -> LLMResponse:
+        """Call the adapter for a backend type."""
+        messages = self._prepare_messages(backend_type, config, model, messages)
+
+        # Reasoning controls only reach backends that accept them: OpenRouter
+        # ignores them for models that don't reason, direct APIs reject them
+        reasoning = kwargs.pop("reasoning", None)
+        if reasoning and config.get("reasoning", backend_type == "openrouter"):
+            kwargs["reasoning"] = reasoning
+
+        if backend_type == "openrouter":
+            return await self._call_openrouter(
+                config, model, messages, api_key, backend_name, **kwargs
+            )
+        elif backend_type == "openai":
+            return await self._call_openai(
+                config, model, messages, api_key, backend_name, **kwargs
+            )
+        elif backend_type == "anthropic":
+            return await self._call_anthropic(
+                config, model, messages, api_key, backend_name, **kwargs
+            )
+        elif backend_type == "gemini":
+            return await self._call_gemini(
+                config, model, messages, api_key, backend_name, **kwargs
+            )
+        elif backend_type == "ollama":
+            return await self._call_ollama(
+                config, model, messages, api_key, backend_name, **kwargs
+            )
+        else:
+            raise ValueError(f"Unsupported backend type: {backend_type}")
 
     async def _call_openrouter(
         self,
@@ -624,10 +2308,14 @@ class LLMClient:
         model: str,
         messages: List[Dict[str, str]],
         api_key: Optional[str],
+        backend_name: Optional[str] = None,
         **kwargs,
     ) -> LLMResponse:
         """Make OpenRouter API call."""
-        client = await self.get_client()
+        client = await self.get_client(backend_name)
+
+        reasoning = kwargs.pop("reasoning", None)
+        schema = kwargs.pop("response_schema", None)
 
         headers = {
             "Authorization": f"Bearer {api_key}",
@@ -641,13 +2329,21 @@ class LLMClient:
             "messages": messages,
             **kwargs,
         }
-
-        response = await client.post(
+        if reasoning:
+            # OpenRouter takes either an effort or a token budget, not both
+            payload["reasoning"] = {k: v for k, v in reasoning.items() if v is not None}
+            if "max_tokens" in payload["reasoning"]:
+                payload["reasoning"].pop("effort", None)
+        if schema:
+            payload["response_format"] = json_schema_response_format(schema)
+
+        response = await self._post(
+            client,
+            backend_name,
             config["endpoint"],
             headers=headers,
             json=payload,
         )
-        response.raise_for_status()
 
         data = response.json()
 
@@ -656,6 +2352,8 @@ class LLMClient:
         input_tokens = usage.get("prompt_tokens", 0)
         output_tokens = usage.get("completion_tokens", 0)
         total_tokens = usage.get("total_tokens", input_tokens + output_tokens)
+        cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+        reasoning_tokens = (usage.get("completion_tokens_details") or {}).get("reasoning_tokens") or 0
 
         # OpenRouter may report cost directly
         openrouter_cost = None
@@ -667,10 +2365,14 @@ class LLMClient:
         if actual_model.endswith(":free"):
             cost = 0.0
         else:
-            cost = calculate_cost(actual_model, input_tokens, output_tokens, openrouter_cost)
+            cost = calculate_cost(
+                actual_model, input_tokens, output_tokens, openrouter_cost,
+                cached_tokens=cached_tokens,
+            )
 
         # Extract content
-        content = data["choices"][0]["message"]["content"]
+        message = data["choices"][0]["message"]
+        content = message["content"]
         actual_model = data.get("model", model)
 
         return LLMResponse(
@@ -683,6 +2385,10 @@ class LLMClient:
             duration_ms=0,  # Set by caller
             backend="openrouter",
             raw_response=data,
+            cached_tokens=cached_tokens,
+            finish_reason=data["choices"][0].get("finish_reason"),
+            reasoning_tokens=reasoning_tokens,
+            reasoning=message.get("reasoning"),
         )
 
     async def _call_openai(
@@ -691,28 +2397,40 @@ class LLMClient:
         model: str,
         messages: List[Dict[str, str]],
         api_key: Optional[str],
+        backend_name: Optional[str] = None,
         **kwargs,
     ) -> LLMResponse:
-        """Make OpenAI API call."""
-        client = await self.get_client()
+        """Make OpenAI API call.
+
+        Reasoning models take an effort only; their reasoning text is never
+        returned.
+        """
+        client = await self.get_client(backend_name)
 
         headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
         }
 
+        reasoning = kwargs.pop("reasoning", None)
+        schema = kwargs.pop("response_schema", None)
         payload = {
             "model": model,
             "messages": messages,
             **kwargs,
         }
-
-        response = await client.post(
+        if reasoning and reasoning.get("effort"):
+            payload["reasoning_effort"] = reasoning["effort"]
+        if schema:
+            payload["response_format"] = json_schema_response_format(schema)
+
+        response = await self._post(
+            client,
+            backend_name,
             config["endpoint"],
             headers=headers,
             json=payload,
         )
-        response.raise_for_status()
 
         data = response.json()
 
@@ -720,8 +2438,11 @@ class LLMClient:
         input_tokens = usage.get("prompt_tokens", 0)
         output_tokens = usage.get("completion_tokens", 0)
         total_tokens = usage.get("total_tokens", input_tokens + output_tokens)
+        cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
 
-        cost = calculate_cost(model, input_tokens, output_tokens)
+        reasoning_tokens = (usage.get("completion_tokens_details") or {}).get("reasoning_tokens") or 0
+
+        cost = calculate_cost(model, input_tokens, output_tokens, cached_tokens=cached_tokens)
         content = data["choices"][0]["message"]["content"]
 
         return LLMResponse(
@@ -734,6 +2455,9 @@ class LLMClient:
             duration_ms=0,
             backend="openai",
             raw_response=data,
+            cached_tokens=cached_tokens,
+            finish_reason=data["choices"][0].get("finish_reason"),
+            reasoning_tokens=reasoning_tokens,
         )
 
     async def _call_anthropic(
@@ -742,10 +2466,21 @@ class LLMClient:
         model: str,
         messages: List[Dict[str, str]],
         api_key: Optional[str],
+        backend_name: Optional[str] = None,
         **kwargs,
     ) -> LLMResponse:
-        """Make Anthropic API call."""
-        client = await self.get_client()
+        """Make Anthropic API call.
+
+        Reasoning turns on extended thinking with a token budget (at least
+        ANTHROPIC_MIN_THINKING_TOKENS); max_tokens is raised if needed so
+        the budget leaves room for the answer. Anthropic doesn't report
+        thinking tokens separately, so they are counted from the thinking
+        blocks. There is no JSON mode; a response_schema relies on the
+        prompt and the caller's validation.
+        """
+        client = await self.get_client(backend_name)
+        reasoning = kwargs.pop("reasoning", None)
+        kwargs.pop("response_schema", None)
 
         headers = {
             "x-api-key": api_key,
@@ -769,23 +2504,39 @@ class LLMClient:
         }
         if system_msg:
             payload["system"] = system_msg
-
-        response = await client.post(
+        budget = reasoning_budget(reasoning, payload["max_tokens"]) if reasoning else None
+        if budget:
+            budget = max(budget, ANTHROPIC_MIN_THINKING_TOKENS)
+            payload["thinking"] = {"type": "enabled", "budget_tokens": budget}
+            payload["max_tokens"] = max(payload["max_tokens"], budget + ANTHROPIC_MIN_THINKING_TOKENS)
+
+        response = await self._post(
+            client,
+            backend_name,
             config["endpoint"],
             headers=headers,
             json=payload,
         )
-        response.raise_for_status()
 
         data = response.json()
 
+        # Anthropic reports cache reads and writes separately from input_tokens
         usage = data.get("usage", {})
-        input_tokens = usage.get("input_tokens", 0)
+        cached_tokens = usage.get("cache_read_input_tokens") or 0
+        cache_write_tokens = usage.get("cache_creation_input_tokens") or 0
+        input_tokens = usage.get("input_tokens", 0) + cached_tokens + cache_write_tokens
         output_tokens = usage.get("output_tokens", 0)
         total_tokens = input_tokens + output_tokens
 
-        cost = calculate_cost(model, input_tokens, output_tokens)
-        content = data["content"][0]["text"]
+        cost = calculate_cost(
+            model, input_tokens, output_tokens,
+            cached_tokens=cached_tokens,
+            cache_write_tokens=cache_write_tokens,
+        )
+        blocks = data["content"]
+        content = "".join(b.get("text", "") for b in blocks if b.get("type", "text") == "text")
+        thinking = "".join(b.get("thinking", "") for b in blocks if b.get("type") == "thinking")
+        exclude = bool(reasoning and reasoning.get("exclude"))
 
         return LLMResponse(
             content=content,
@@ -797,6 +2548,11 @@ class LLMClient:
             duration_ms=0,
             backend="anthropic",
             raw_response=data,
+            cached_tokens=cached_tokens,
+            cache_write_tokens=cache_write_tokens,
+            finish_reason=data.get("stop_reason"),
+            reasoning_tokens=count_tokens(thinking) if thinking else 0,
+            reasoning=thinking if thinking and not exclude else None,
         )
 
     async def _call_gemini(
@@ -805,18 +2561,32 @@ class LLMClient:
         model: str,
         messages: List[Dict[str, str]],
         api_key: Optional[str],
+        backend_name: Optional[str] = None,
         **kwargs,
     ) -> LLMResponse:
-        """Make Google Gemini API call."""
-        client = await self.get_client()
+        """Make Google Gemini API call.
+
+        Reasoning sets a thinking budget. Thought tokens bill as output, so
+        they are added to output_tokens. A response_schema switches on JSON
+        mode; Gemini's own schema dialect is narrower than JSON schema, so
+        the schema itself is left to the prompt and the caller's validation.
+        """
+        client = await self.get_client(backend_name)
+        reasoning = kwargs.pop("reasoning", None)
+        schema = kwargs.pop("response_schema", None)
 
         # Build endpoint with API key
         endpoint = f"{config['endpoint']}?key={api_key}"
 
-        # Convert messages to Gemini format
+        # Convert messages to Gemini format. The system prompt goes in
+        # systemInstruction, which leads the cacheable prefix.
+        system_parts = []
         contents = []
         for msg in messages:
-            role = "user" if msg["role"] in ("user", "system") else "model"
+            if msg["role"] == "system":
+                system_parts.append({"text": msg["content"]})
+                continue
+            role = "user" if msg["role"] == "user" else "model"
             contents.append({
                 "role": role,
                 "parts": [{"text": msg["content"]}],
@@ -828,23 +2598,39 @@ class LLMClient:
                 "maxOutputTokens": kwargs.get("max_tokens", 8192),
             },
         }
-
-        response = await client.post(
+        if system_parts:
+            payload["systemInstruction"] = {"parts": system_parts}
+        if schema:
+            payload["generationConfig"]["responseMimeType"] = "application/json"
+        if reasoning:
+            thinking_config = {"includeThoughts": not reasoning.get("exclude", False)}
+            budget = reasoning_budget(reasoning, payload["generationConfig"]["maxOutputTokens"])
+            if budget is not None:
+                thinking_config["thinkingBudget"] = budget
+            payload["generationConfig"]["thinkingConfig"] = thinking_config
+
+        response = await self._post(
+            client,
+            backend_name,
             endpoint,
             json=payload,
         )
-        response.raise_for_status()
 
         data = response.json()
 
         # Extract usage metadata
         usage = data.get("usageMetadata", {})
         input_tokens = usage.get("promptTokenCount", 0)
-        output_tokens = usage.get("candidatesTokenCount", 0)
+        reasoning_tokens = usage.get("thoughtsTokenCount", 0)
+        output_tokens = usage.get("candidatesTokenCount", 0) + reasoning_tokens
         total_tokens = usage.get("totalTokenCount", input_tokens + output_tokens)
+        # Implicit cache hits on the shared prompt prefix
+        cached_tokens = usage.get("cachedContentTokenCount", 0)
 
-        cost = calculate_cost(model, input_tokens, output_tokens)
-        content = data["candidates"][0]["content"]["parts"][0]["text"]
+        cost = calculate_cost(model, input_tokens, output_tokens, cached_tokens=cached_tokens)
+        parts = data["candidates"][0]["content"]["parts"]
+        content = "".join(p.get("text", "") for p in parts if not p.get("thought"))
+        thoughts = "".join(p.get("text", "") for p in parts if p.get("thought"))
 
         return LLMResponse(
             content=content,
@@ -856,8 +2642,107 @@ class LLMClient:
             duration_ms=0,
             backend="gemini",
             raw_response=data,
+            cached_tokens=cached_tokens,
+            finish_reason=data["candidates"][0].get("finishReason"),
+            reasoning_tokens=reasoning_tokens,
+            reasoning=thoughts or None,
         )
 
+    async def _call_ollama(
+        self,
+        config: Dict[str, Any],
+        model: str,
+        messages: List[Dict[str, str]],
+        api_key: Optional[str],
+        backend_name: Optional[str] = None,
+        **kwargs,
+    ) -> LLMResponse:
+        """Make Ollama /api/chat call (local inference, no cost).
+
+        Streams by default (set "stream": false on the backend to disable) so
+        the read timeout applies between tokens rather than to the whole
+        generation, which matters for long outputs on slower hardware.
+        """
+        client = await self.get_client(backend_name)
+
+        endpoint = f"{config['endpoint'].rstrip('/')}/api/chat"
+        stream = config.get("stream", True)
+
+        # Ollama takes sampling parameters under "options"
+        reasoning = kwargs.pop("reasoning", None)
+        schema = kwargs.pop("response_schema", None)
+        options = {k: v for k, v in kwargs.items() if k != "max_tokens"}
+        if "max_tokens" in kwargs:
+            options["num_predict"] = kwargs["max_tokens"]
+
+        payload = {
+            "model": model,
+            "messages": messages,
+            "stream": stream,
+        }
+        if options:
+            payload["options"] = options
+        if reasoning and reasoning.get("effort"):
+            # Thinking models only switch thinking on or off
+            payload["think"] = reasoning["effort"] != "none"
+        if schema:
+            payload["format"] = schema["schema"]
+
+        if stream:
+            content, data = await self._stream_ollama(client, endpoint, payload)
+        else:
+            response = await self._post(client, backend_name, endpoint, json=payload)
+            data = response.json()
+            content = data["message"]["content"]
+
+        input_tokens = data.get("prompt_eval_count", 0)
+        output_tokens = data.get("eval_count", 0)
+
+        return LLMResponse(
+            content=content,
+            model=data.get("model", model),
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens,
+            cost=0.0,
+            duration_ms=0,
+            backend="ollama",
+            raw_response=data,
+            finish_reason=data.get("done_reason"),
+        )
+
+    async def _stream_ollama(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: str,
+        payload: Dict[str, Any],
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Read a streamed Ollama chat response.
+
+        Returns:
+            Tuple of (full content, final chunk with usage counts)
+        """
+        parts = []
+        final: Dict[str, Any] = {}
+
+        async with client.stream("POST", endpoint, json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    raise RuntimeError(f"Ollama error: {chunk['error']}")
+                parts.append(chunk.get("message", {}).get("content", ""))
+                if chunk.get("done"):
+                    final = chunk
+                    break
+
+        if not final:
+            raise RuntimeError("Ollama stream ended before completion")
+
+        return "".join(parts), final
+
     def get_status(self) -> Dict[str, Any]:
         """Get current LLM client status for health endpoint.
 
@@ -892,6 +2777,14 @@ class LLMClient:
             "phase_backends": phase_backends,
             "openrouter_presets": openrouter_presets,
             "last_run_totals": last_run,
+            "circuit_breakers": {
+                name: breaker.state for name, breaker in self._breakers.items()
+            },
+            "backend_stats": {
+                name: stats.summary()
+                for (name, phase), stats in self._backend_stats.items()
+                if phase is None
+            },
         }
 
 
@@ -0,0 +1,38 @@
+"""Filesystem locations shared by the worker, estimator and routers.
+
+Kept free of service imports so that any module (including the estimator,
+which llm.py and utils.py import) can use it without an import cycle.
+"""
+import os
+from pathlib import Path
+from typing import Optional
+
+
+OUTPUT_DIR = Path(os.getenv("OUTPUT_DIR", "OUTPUT"))
+TRANSCRIPTS_DIR = Path(os.getenv("TRANSCRIPTS_DIR", "transcripts"))
+TRANSCRIPTS_ARCHIVE_DIR = TRANSCRIPTS_DIR / "archive"
+AGENTS_DIR = Path(".claude/agents")
+
+
+def find_transcript(transcript_file: str, transcripts_dir: Optional[Path] = None) -> Optional[Path]:
+    """Locate a queued transcript file, or None if it can't be found.
+
+    Tries the path as given, then under the transcripts directory (by path
+    and by file name), then its archive folder for re-processed jobs.
+
+    Args:
+        transcript_file: Transcript path as stored on the job
+        transcripts_dir: Transcripts directory (default: TRANSCRIPTS_DIR)
+    """
+    transcripts_dir = TRANSCRIPTS_DIR if transcripts_dir is None else transcripts_dir
+    archive_dir = transcripts_dir / "archive"
+    for path in (
+        Path(transcript_file),
+        transcripts_dir / transcript_file,
+        transcripts_dir / Path(transcript_file).name,
+        archive_dir / transcript_file,
+        archive_dir / Path(transcript_file).name,
+    ):
+        if path.is_file():
+            return path
+    return None
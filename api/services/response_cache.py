@@ -0,0 +1,126 @@
+"""Content-addressed on-disk cache of LLM responses.
+
+Reprocessing a transcript (a force re-queue, or recovery after a failure
+unrelated to the prompts) sends byte-identical requests. Those are served
+from disk instead of being paid for again.
+
+Entries are JSON files named by the SHA-256 of the request (backend, model,
+messages and parameters), sharded by the first two hex digits. The directory
+is bounded by size with LRU eviction: a hit refreshes an entry's mtime, and
+the least recently used entries are removed once the total exceeds
+max_bytes. Writes go through a temp file and rename, so several worker
+processes can share one directory.
+
+Keys name the model as the request does, which for OpenRouter preset
+backends is "@preset/<name>". Re-pointing a preset at another model doesn't
+change its key, so clear the cache directory when a preset changes.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+def response_cache_key(
+    backend: str,
+    model: str,
+    messages: List[Dict[str, Any]],
+    params: Dict[str, Any],
+) -> str:
+    """Return the cache key for a request: SHA-256 of its canonical JSON."""
+    payload = json.dumps(
+        {"backend": backend, "model": model, "messages": messages, "params": params},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of JSON entries in a directory."""
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None  # Scanned lazily
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the entry for key, or None. A hit marks it recently used."""
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable response cache entry {key}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+        return data
+
+    def put(self, key: str, data: Dict[str, Any]) -> None:
+        """Store an entry, evicting least recently used entries if over size."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        encoded = json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(encoded)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(encoded)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        return self.directory.glob("??/*.json")
+
+    def _scan_size(self) -> int:
+        total = 0
+        for entry in self._entries():
+            try:
+                total += entry.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    def _evict(self) -> None:
+        """Delete least recently used entries down to 90% of max_bytes."""
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, entry in entries:
+            if total <= target:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+        self._total_bytes = total
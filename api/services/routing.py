@@ -0,0 +1,195 @@
+"""Compiled routing table for LLMClient.
+
+The "routing", "phase_backends" and "primary_backend" sections of
+llm-config.json are compiled once into an immutable RoutingTable: tier
+backend lists, each phase's tier for every duration bucket, escalation
+settings and per-tier fallback chains. Routing a call is then a couple of
+lookups rather than a walk of the nested config with defaults at every
+level.
+
+A table is never modified; LLMClient compiles a new one when the config
+changes and swaps it in whole. Which backend within a tier is used still
+depends on circuit breakers and latency stats, so that choice is left to
+LLMClient.select_backend.
+"""
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+
+DEFAULT_TIERS = ["openrouter-cheapskate", "openrouter", "openrouter-big-brain"]
+DEFAULT_TIER_LABELS = ["cheapskate", "default", "big-brain"]
+DEFAULT_PRIMARY_BACKEND = "openrouter"
+DEFAULT_LONG_FORM_THRESHOLD_MINUTES = 15
+
+DEFAULT_ESCALATION: Dict[str, Any] = {
+    "enabled": True,
+    "on_failure": True,
+    "on_timeout": True,
+    "timeout_seconds": 120,
+    "max_retries_per_tier": 1,
+}
+
+# In-tier fallback budget; override per tier under
+# routing.fallback_chains.<tier label> in llm-config.json. None = unlimited
+# (max_attempts is then bounded by the chain length).
+DEFAULT_FALLBACK_BUDGET: Dict[str, Any] = {
+    "max_attempts": None,          # Attempts in the tier, including the first
+    "max_seconds": None,           # Wall time in the tier before escalating
+}
+
+
+@dataclass(frozen=True)
+class FallbackChain:
+    """A tier's fallback candidates and budget.
+
+    Each entry is (backend, model); backend None means the backend the
+    tier selected.
+    """
+
+    entries: Tuple[Tuple[Optional[str], Optional[str]], ...]
+    budget: Mapping[str, Any]
+
+
+NO_FALLBACK_CHAIN = FallbackChain(entries=(), budget=MappingProxyType(dict(DEFAULT_FALLBACK_BUDGET)))
+
+
+@dataclass(frozen=True)
+class RoutingTable:
+    """Immutable routing decisions compiled from llm-config.json."""
+
+    tiers: Tuple[Tuple[str, ...], ...]
+    tier_labels: Tuple[str, ...]
+    # (max_minutes, tier) in config order; max_minutes None matches any duration
+    thresholds: Tuple[Tuple[Optional[float], int], ...]
+    phase_base_tiers: Mapping[str, int]
+    # Tier per duration bucket (one per threshold, then "exceeds all"),
+    # for each phase in phase_base_tiers and None for every other phase
+    phase_tiers: Mapping[Optional[str], Tuple[int, ...]]
+    phase_backends: Mapping[str, str]
+    primary_backend: str
+    escalation: Mapping[str, Any]
+    fallback_chains: Tuple[FallbackChain, ...]
+    long_form_threshold_minutes: float
+
+    @classmethod
+    def compile(cls, config: Dict[str, Any]) -> "RoutingTable":
+        """Build a routing table from a parsed llm-config.json."""
+        routing = config.get("routing", {})
+
+        tiers = tuple(
+            tuple(entry) if isinstance(entry, list) else (entry,)
+            for entry in routing.get("tiers", DEFAULT_TIERS)
+        )
+        tier_labels = tuple(routing.get("tier_labels", DEFAULT_TIER_LABELS))
+        thresholds = tuple(
+            (threshold.get("max_minutes"), threshold.get("tier", 0))
+            for threshold in routing.get("duration_thresholds", [])
+        )
+        phase_base_tiers = dict(routing.get("phase_base_tiers", {}))
+
+        max_tier = len(tiers) - 1
+        phase_tiers = {
+            phase: tuple(max(base_tier, tier) for _, tier in thresholds) + (max(base_tier, max_tier),)
+            for phase, base_tier in [*phase_base_tiers.items(), (None, 0)]
+        }
+
+        chains = routing.get("fallback_chains", {})
+        fallback_chains = tuple(
+            _compile_chain(
+                chains.get(tier_labels[tier] if tier < len(tier_labels) else None)
+                or chains.get(str(tier))
+                or {}
+            )
+            for tier in range(len(tiers))
+        )
+
+        return cls(
+            tiers=tiers,
+            tier_labels=tier_labels,
+            thresholds=thresholds,
+            phase_base_tiers=MappingProxyType(phase_base_tiers),
+            phase_tiers=MappingProxyType(phase_tiers),
+            phase_backends=MappingProxyType(dict(config.get("phase_backends", {}))),
+            primary_backend=config.get("primary_backend", DEFAULT_PRIMARY_BACKEND),
+            escalation=MappingProxyType(dict(routing.get("escalation", DEFAULT_ESCALATION))),
+            fallback_chains=fallback_chains,
+            long_form_threshold_minutes=routing.get(
+                "long_form_threshold_minutes", DEFAULT_LONG_FORM_THRESHOLD_MINUTES
+            ),
+        )
+
+    def base_tier(self, phase: str) -> int:
+        """Return a phase's tier before duration is considered."""
+        return self.phase_base_tiers.get(phase, 0)
+
+    def tier_for(self, phase: str, duration_minutes: Optional[float]) -> Tuple[int, str]:
+        """Return (tier, reason) for a phase and transcript duration.
+
+        Args:
+            phase: Phase name
+            duration_minutes: Estimated transcript duration, or None if
+                there is no transcript context
+
+        Returns:
+            Tuple of (tier index, human-readable reason)
+        """
+        base_tier = self.base_tier(phase)
+        if duration_minutes is None:
+            return base_tier, f"phase default (base tier {base_tier})"
+
+        tiers = self.phase_tiers.get(phase) or self.phase_tiers[None]
+        for bucket, (max_minutes, tier) in enumerate(self.thresholds):
+            if max_minutes is None or duration_minutes <= max_minutes:
+                selected_tier = tiers[bucket]
+                if selected_tier > base_tier:
+                    reason = f"duration {duration_minutes:.0f}min (threshold: ≤{max_minutes}min → tier {tier})"
+                else:
+                    reason = f"phase default (base tier {base_tier})"
+                return selected_tier, reason
+
+        return tiers[-1], f"duration {duration_minutes:.0f}min exceeds all thresholds"
+
+    def tier_backends(self, tier: int) -> List[str]:
+        """Return the backends listed for a tier (the last tier if beyond it)."""
+        if not self.tiers:
+            return []
+        return list(self.tiers[min(tier, len(self.tiers) - 1)])
+
+    def next_tier(self, current_tier: int) -> Optional[int]:
+        """Return the next escalation tier, or None if already at the top."""
+        if current_tier < len(self.tiers) - 1:
+            return current_tier + 1
+        return None
+
+    def fallback_chain(self, tier: int) -> FallbackChain:
+        """Return a tier's fallback chain (empty if none is configured)."""
+        if 0 <= tier < len(self.fallback_chains):
+            return self.fallback_chains[tier]
+        return NO_FALLBACK_CHAIN
+
+    def phase_backend(self, phase: str) -> str:
+        """Return the backend for a phase when no tier yields one."""
+        return self.phase_backends.get(phase, self.primary_backend)
+
+    def routed_backends(self) -> List[str]:
+        """Return every backend named by primary, tiers and phase_backends, in order."""
+        names = [self.primary_backend]
+        for entry in self.tiers:
+            names += entry
+        names += list(self.phase_backends.values())
+        return names
+
+
+def _compile_chain(chain_config: Dict[str, Any]) -> FallbackChain:
+    """Compile one routing.fallback_chains entry."""
+    if not chain_config:
+        return NO_FALLBACK_CHAIN
+    entries = []
+    for entry in chain_config.get("chain", []):
+        if isinstance(entry, str):
+            entries.append((None, entry))
+        else:
+            entries.append((entry.get("backend"), entry.get("model")))
+    budget = {key: chain_config.get(key, default) for key, default in DEFAULT_FALLBACK_BUDGET.items()}
+    return FallbackChain(entries=tuple(entries), budget=MappingProxyType(budget))
@@ -0,0 +1,68 @@
+"""Coalesce identical concurrent calls into one.
+
+When several jobs (or retries) make the same request at the same time -
+the same prompt, the same Airtable record - only the first caller's call
+runs; the others await it and share its result or exception. Calls are
+only coalesced while in flight; nothing is cached once one finishes.
+
+The call runs as its own task, so one waiter being cancelled (a phase
+timeout, a paused job) doesn't cancel it for the rest. It is cancelled
+only when every waiter has gone.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+class _Flight:
+    """An in-flight call and how many callers are waiting on it."""
+
+    def __init__(self, task: "asyncio.Task[Any]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Group of in-flight calls keyed by request identity."""
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Run fn for key, or join the call already running for it.
+
+        Args:
+            key: Request identity; equal keys must mean interchangeable results
+            fn: Makes the call; only invoked if none is in flight for key
+
+        Returns:
+            Tuple of (result, shared), where shared is True if this caller
+            joined another caller's call
+        """
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                # Later callers start afresh rather than join a cancelled call
+                self._forget(key, flight)
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
@@ -0,0 +1,108 @@
+"""Structured JSON output for phases with a fixed result shape.
+
+The SEO phase returns SEOMetadata as JSON rather than a freeform report.
+The schema goes to the backend with the request (see LLMClient.chat's
+response_schema), which constrains output where the backend supports it.
+Every response is then validated locally. A response that doesn't parse
+or validate gets one repair request quoting the errors, so title and
+description limits are enforced here rather than by the manager's review.
+"""
+import json
+import re
+from typing import Any, Dict, Optional, Type
+
+from pydantic import BaseModel, ValidationError
+
+from api.models.job import SEOMetadata
+
+
+# Phases whose output is structured, and the model it must validate against
+STRUCTURED_PHASES: Dict[str, Type[BaseModel]] = {
+    "seo": SEOMetadata,
+}
+
+REPAIR_PROMPT = (
+    "Your response could not be used: {errors}\n\n"
+    "Reply with only the corrected JSON object, keeping everything that was valid."
+)
+
+_CODE_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+
+class StructuredOutputError(ValueError):
+    """Raised when a structured phase's output doesn't match its schema."""
+    pass
+
+
+def response_schema(phase: str) -> Optional[Dict[str, Any]]:
+    """Return the {"name", "schema"} chat option for a phase, or None."""
+    model = STRUCTURED_PHASES.get(phase)
+    if model is None:
+        return None
+    return {"name": f"{phase}_output", "schema": model.model_json_schema()}
+
+
+def extract_json(text: str) -> str:
+    """Pull a JSON object out of a response that may wrap it in prose or a code fence."""
+    fenced = _CODE_FENCE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        return text.strip()
+    return text[start:end + 1]
+
+
+def parse_structured_output(phase: str, text: str) -> BaseModel:
+    """Parse and validate a structured phase's output.
+
+    Raises:
+        StructuredOutputError: If the output isn't JSON or doesn't match
+            the phase's schema; the message lists what to fix
+    """
+    model = STRUCTURED_PHASES[phase]
+    try:
+        data = json.loads(extract_json(text))
+    except json.JSONDecodeError as e:
+        raise StructuredOutputError(f"not valid JSON ({e.msg} at position {e.pos})") from e
+    try:
+        return model.model_validate(data)
+    except ValidationError as e:
+        problems = "; ".join(
+            f"{'.'.join(str(p) for p in err['loc']) or 'object'}: {err['msg']}" for err in e.errors()
+        )
+        raise StructuredOutputError(problems) from e
+
+
+def repair_prompt(error: StructuredOutputError) -> str:
+    """Build the follow-up asking the model to fix invalid output."""
+    return REPAIR_PROMPT.format(errors=error)
+
+
+def render_seo_markdown(metadata: SEOMetadata) -> str:
+    """Render SEO metadata as the markdown report saved to seo_output.md."""
+    lines = [
+        "# SEO Metadata",
+        "",
+        "## Title",
+        metadata.title,
+        "",
+        "## Short Description",
+        metadata.short_description,
+        "",
+        "## Long Description",
+        metadata.long_description,
+        "",
+        "## Tags",
+        ", ".join(metadata.tags),
+    ]
+    if metadata.categories:
+        lines += ["", "## Categories", ", ".join(metadata.categories)]
+    return "\n".join(lines) + "\n"
+
+
+def render_structured_output(phase: str, parsed: BaseModel) -> str:
+    """Render a validated structured output for the phase's .md file."""
+    if isinstance(parsed, SEOMetadata):
+        return render_seo_markdown(parsed)
+    return json.dumps(parsed.model_dump(), indent=2) + "\n"
@@ -8,6 +8,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+from api.services.estimator import count_tokens
+
 
 def utc_now() -> datetime:
     """Return current UTC time as timezone-aware datetime.
@@ -131,7 +133,8 @@ def calculate_transcript_metrics(
         long_form_threshold_minutes: Minutes threshold for long-form classification
 
     Returns:
-        Dict with word_count, estimated_duration_minutes, is_long_form
+        Dict with word_count, token_count, estimated_duration_minutes,
+        is_long_form
 
     Examples:
         >>> metrics = calculate_transcript_metrics("Hello world " * 1000)
@@ -158,6 +161,7 @@ def calculate_transcript_metrics(
 
     return {
         "word_count": word_count,
+        "token_count": count_tokens(transcript_content),
         "estimated_duration_minutes": estimated_duration_minutes,
         "is_long_form": is_long_form,
     }
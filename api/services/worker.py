@@ -5,25 +5,48 @@ Polls the queue for pending jobs and processes them through agent phases.
 import asyncio
 import json
 import os
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
-from api.models.job import JobStatus, JobPhase, PhaseStatus
+from pydantic import BaseModel
+
+from api.models.job import JobStatus, JobPhase, PhaseStatus, JobUpdate, SEOMetadata
 from api.services.database import (
     claim_next_job,
-    update_job_status,
+    get_job_status,
+    transition_job,
+    update_job,
     update_job_phase,
     update_job_heartbeat,
     log_event,
+    wait_for_job_available,
 )
 from api.services.llm import (
     get_llm_client,
     start_run_tracking,
     end_run_tracking,
     LLMResponse,
+    CACHE_CONTROL_EPHEMERAL,
 )
 from api.services.utils import calculate_transcript_metrics
+from api.services.context_budget import fit_phase_context
+from api.services.estimator import count_tokens
+from api.services.paths import (
+    AGENTS_DIR,
+    OUTPUT_DIR,
+    TRANSCRIPTS_ARCHIVE_DIR,
+    TRANSCRIPTS_DIR,
+    find_transcript,
+)
+from api.services.structured_output import (
+    StructuredOutputError,
+    parse_structured_output,
+    render_structured_output,
+    repair_prompt,
+    response_schema,
+)
 from api.models.events import EventType, EventCreate, EventData
 from api.services.logging import setup_logging, get_logger
 from api.services.airtable import get_airtable_client
@@ -33,12 +56,6 @@ from api.services.airtable import get_airtable_client
 setup_logging(log_file="worker.log")
 logger = get_logger(__name__)
 
-# Default paths
-OUTPUT_DIR = Path(os.getenv("OUTPUT_DIR", "OUTPUT"))
-TRANSCRIPTS_DIR = Path(os.getenv("TRANSCRIPTS_DIR", "transcripts"))
-TRANSCRIPTS_ARCHIVE_DIR = TRANSCRIPTS_DIR / "archive"
-AGENTS_DIR = Path(".claude/agents")
-
 
 class WorkerConfig:
     """Configuration for the job worker."""
@@ -50,15 +67,30 @@ class WorkerConfig:
         max_retries: int = 3,
         max_concurrent_jobs: int = 1,
         worker_id: Optional[str] = None,
+        control_check_interval: float = 5,
     ):
         self.poll_interval = poll_interval
         self.heartbeat_interval = heartbeat_interval
+        # How often a running job's status is checked for pause/cancel
+        self.control_check_interval = control_check_interval
         self.max_retries = max_retries
         self.max_concurrent_jobs = max_concurrent_jobs
         # Generate worker_id if not provided
         self.worker_id = worker_id or f"worker-{os.getpid()}"
 
 
+# Statuses set by the control endpoints that stop a running job
+INTERRUPT_STATUSES = {JobStatus.paused, JobStatus.cancelled}
+
+
+class JobInterrupted(Exception):
+    """Raised when a running job has been paused or cancelled externally."""
+
+    def __init__(self, status: JobStatus):
+        super().__init__(f"Job {status.value}")
+        self.status = status
+
+
 class JobWorker:
     """Processes jobs from the queue through agent phases.
 
@@ -74,11 +106,17 @@ class JobWorker:
     # Manager always runs on big-brain tier for quality oversight
     FORCE_BIG_BRAIN_PHASES = ["manager"]
 
+    # Phases whose prompts start with the full transcript. It is sent as a
+    # cacheable prefix ahead of the phase's system prompt so providers with
+    # prompt caching bill it at the cached rate after the first phase.
+    TRANSCRIPT_PREFIX_PHASES = ["analyst", "formatter"]
+
     def __init__(self, config: Optional[WorkerConfig] = None):
         self.config = config or WorkerConfig()
         self.llm = get_llm_client()
         self.running = False
-        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._heartbeat_tasks: Dict[int, asyncio.Task] = {}
+        self._interrupted: Dict[int, JobStatus] = {}
         self._current_job_id: Optional[int] = None
 
     async def start(self):
@@ -104,6 +142,8 @@ class JobWorker:
                 # Clean up completed tasks
                 done_tasks = {t for t in active_tasks if t.done()}
                 for task in done_tasks:
+                    if task.cancelled():
+                        continue  # Interrupted by a control request
                     # Check for exceptions
                     try:
                         task.result()
@@ -137,8 +177,9 @@ class JobWorker:
                         # No more pending jobs
                         break
 
-                # Wait before next poll
-                await asyncio.sleep(self.config.poll_interval)
+                # Wait before next poll (returns early when a backend
+                # notifies that a new job was queued)
+                await wait_for_job_available(self.config.poll_interval)
 
             except Exception as e:
                 logger.error(
@@ -159,8 +200,8 @@ class JobWorker:
     async def stop(self):
         """Stop the worker."""
         self.running = False
-        if self._heartbeat_task:
-            self._heartbeat_task.cancel()
+        for task in self._heartbeat_tasks.values():
+            task.cancel()
 
     async def process_job(self, job: Dict[str, Any]):
         """Process a single job through all phases."""
@@ -176,8 +217,10 @@ class JobWorker:
         # Start cost tracking for this run
         tracker = start_run_tracking(job_id)
 
-        # Start heartbeat
-        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop(job_id))
+        # Start heartbeat (also watches for pause/cancel and interrupts this task)
+        self._heartbeat_tasks[job_id] = asyncio.create_task(
+            self._heartbeat_loop(job_id, job_task=asyncio.current_task())
+        )
 
         try:
             # Status already set to in_progress by claim_next_job()
@@ -191,7 +234,9 @@ class JobWorker:
 
             # Set up project directory
             project_path = self._setup_project_dir(job)
-            await update_job_status(job_id, JobStatus.in_progress, project_path=str(project_path))
+            await self._transition_running_job(
+                job_id, JobStatus.in_progress, {"project_path": str(project_path)}
+            )
 
             # Check if all phases are already complete (recovery case)
             phases = job.get("phases") or []
@@ -203,10 +248,8 @@ class JobWorker:
                     "All phases already complete, marking job done",
                     extra={"job_id": job_id, "project_name": project_name}
                 )
-                await update_job_status(
-                    job_id,
-                    JobStatus.completed,
-                    actual_cost=job.get("actual_cost", 0),
+                await self._transition_running_job(
+                    job_id, JobStatus.completed, {"actual_cost": job.get("actual_cost") or 0}
                 )
                 return
 
@@ -265,8 +308,11 @@ class JobWorker:
                         context[f"{phase_name}_output"] = output_file.read_text()
                     continue
 
-                # Update current phase
-                await update_job_status(job_id, JobStatus.in_progress, current_phase=phase_name)
+                # Update current phase, unless the job was paused/cancelled
+                # since the last phase (conditional, so a pause is never overwritten)
+                await self._transition_running_job(
+                    job_id, JobStatus.in_progress, {"current_phase": phase_name}
+                )
 
                 # Process phase
                 logger.info(
@@ -288,6 +334,13 @@ class JobWorker:
                     "tier_reason": phase_result.get("tier_reason"),
                     "attempts": phase_result.get("attempts", 1),
                 }
+                metadata = {}
+                if phase_result.get("context_trimmed"):
+                    metadata["context_trimmed"] = phase_result["context_trimmed"]
+                if phase_result.get("structured"):
+                    metadata["structured"] = phase_result["structured"]
+                if metadata:
+                    phase_data["metadata"] = metadata
 
                 # Update or add phase
                 phase_updated = False
@@ -310,13 +363,14 @@ class JobWorker:
             # Create manifest
             await self._create_manifest(job, project_path, phases, tracker)
 
-            # Mark job completed
-            run_summary = await end_run_tracking()
-            await update_job_status(
+            # Mark job completed, unless paused/cancelled meanwhile.
+            # actual_cost is cumulative across runs (resumes, re-queues).
+            await self._transition_running_job(
                 job_id,
                 JobStatus.completed,
-                actual_cost=run_summary["total_cost"] if run_summary else 0,
+                {"actual_cost": (job.get("actual_cost") or 0) + tracker.total_cost},
             )
+            run_summary = await end_run_tracking()
 
             # Archive the transcript file (non-fatal if this fails)
             try:
@@ -336,6 +390,16 @@ class JobWorker:
                 }
             )
 
+        except JobInterrupted as e:
+            await self._finish_interrupted(job, e.status)
+
+        except asyncio.CancelledError:
+            status = self._interrupted.pop(job_id, None)
+            if status is None:
+                raise  # Worker shutdown, not a control request
+            asyncio.current_task().uncancel()
+            await self._finish_interrupted(job, status)
+
         except Exception as e:
             logger.error(
                 "Job failed",
@@ -343,16 +407,29 @@ class JobWorker:
                 exc_info=True,
             )
 
-            # End tracking for this attempt
-            run_summary = await end_run_tracking()
-            current_cost = run_summary["total_cost"] if run_summary else 0
+            # Set status to investigating while manager analyzes the failure,
+            # unless a pause or cancel landed first - then there's nothing to
+            # recover
+            try:
+                await self._transition_running_job(
+                    job_id, JobStatus.investigating, {"error_message": str(e)}
+                )
+            except JobInterrupted as interrupted:
+                await self._finish_interrupted(job, interrupted.status)
+                return
+            except Exception as status_error:
+                logger.warning(
+                    "Skipping recovery",
+                    extra={"job_id": job_id, "error": str(status_error)},
+                )
+                run_summary = await end_run_tracking()
+                run_cost = run_summary["total_cost"] if run_summary else 0
+                await update_job(job_id, JobUpdate(actual_cost=(job.get("actual_cost") or 0) + run_cost))
+                return
 
-            # Set status to investigating while manager analyzes the failure
-            await update_job_status(
-                job_id,
-                JobStatus.investigating,
-                error_message=str(e),
-            )
+            # End tracking for this attempt; costs are cumulative across runs
+            run_summary = await end_run_tracking()
+            current_cost = (job.get("actual_cost") or 0) + (run_summary["total_cost"] if run_summary else 0)
 
             # Run manager to analyze and decide on recovery action
             recovery_result = await self._analyze_and_recover(
@@ -376,13 +453,22 @@ class JobWorker:
                 )
                 return
 
-            # Recovery failed - mark job as failed
-            await update_job_status(
+            # Recovery failed - mark job as failed, if nothing else moved it
+            # out of investigating meanwhile
+            final_cost = recovery_result.get("total_cost", current_cost + recovery_result.get("cost", 0))
+            failed = await transition_job(
                 job_id,
+                {JobStatus.investigating},
                 JobStatus.failed,
-                error_message=str(e),
-                actual_cost=current_cost + recovery_result.get("cost", 0),
+                fields={"error_message": str(e), "actual_cost": final_cost},
             )
+            if failed is None:
+                await update_job(job_id, JobUpdate(actual_cost=final_cost))
+                logger.warning(
+                    "Job left investigating during recovery; status kept",
+                    extra={"job_id": job_id, "status": await get_job_status(job_id)},
+                )
+                return
 
             # Log error event with investigation summary
             await log_event(EventCreate(
@@ -397,11 +483,61 @@ class JobWorker:
 
         finally:
             # Stop heartbeat
-            if self._heartbeat_task:
-                self._heartbeat_task.cancel()
-                self._heartbeat_task = None
+            heartbeat_task = self._heartbeat_tasks.pop(job_id, None)
+            if heartbeat_task:
+                heartbeat_task.cancel()
+            self._interrupted.pop(job_id, None)
             self._current_job_id = None
 
+    async def _transition_running_job(
+        self,
+        job_id: int,
+        to: JobStatus,
+        fields: Dict[str, Any],
+    ) -> None:
+        """Move a running job to `to`, unless it was paused or cancelled.
+
+        Conditional on the job still being in_progress, so a pause or cancel
+        that lands between heartbeats is never overwritten.
+
+        Raises:
+            JobInterrupted: If the job was paused or cancelled
+        """
+        if await transition_job(job_id, {JobStatus.in_progress}, to, fields=fields) is None:
+            status = await get_job_status(job_id)
+            if status in INTERRUPT_STATUSES:
+                raise JobInterrupted(status)
+            raise Exception(f"Job left in_progress unexpectedly (status: {status})")
+
+    async def _finish_interrupted(self, job: Dict[str, Any], status: JobStatus):
+        """Record cost for a job stopped by pause/cancel.
+
+        The status itself was already written by the control endpoint and is
+        left alone. Paused jobs resume from their last completed phase.
+        """
+        job_id = job["id"]
+        run_summary = await end_run_tracking()
+        run_cost = run_summary["total_cost"] if run_summary else 0
+        await update_job(
+            job_id,
+            JobUpdate(actual_cost=(job.get("actual_cost") or 0) + run_cost),
+        )
+
+        await log_event(EventCreate(
+            job_id=job_id,
+            event_type=EventType.user_action,
+            data=EventData(
+                cost=run_cost,
+                reason=f"job_{status.value}",
+                extra={"interrupted_by": status.value},
+            ),
+        ))
+
+        logger.info(
+            "Job interrupted",
+            extra={"job_id": job_id, "status": status.value, "run_cost": run_cost},
+        )
+
     async def _fetch_sst_context(self, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Fetch SST metadata from Airtable if job has linked record.
 
@@ -452,12 +588,34 @@ class JobWorker:
             )
             return None
 
-    async def _heartbeat_loop(self, job_id: int):
-        """Send periodic heartbeats while processing."""
+    async def _heartbeat_loop(self, job_id: int, job_task: Optional[asyncio.Task] = None):
+        """Send periodic heartbeats and watch for pause/cancel while processing.
+
+        The job status is checked every control_check_interval seconds. When
+        the job has been paused or cancelled, job_task is cancelled so the
+        in-flight LLM call is abandoned and its concurrency slot freed.
+        """
+        tick = min(self.config.control_check_interval, self.config.heartbeat_interval)
+        loop = asyncio.get_running_loop()
+        next_heartbeat = loop.time() + self.config.heartbeat_interval
         while True:
             try:
-                await asyncio.sleep(self.config.heartbeat_interval)
-                await update_job_heartbeat(job_id)
+                await asyncio.sleep(tick)
+                if loop.time() >= next_heartbeat:
+                    await update_job_heartbeat(job_id)
+                    next_heartbeat = loop.time() + self.config.heartbeat_interval
+
+                if job_task is None:
+                    continue
+                status = await get_job_status(job_id)
+                if status in INTERRUPT_STATUSES:
+                    logger.info(
+                        "Job interrupted by control request",
+                        extra={"job_id": job_id, "status": status.value},
+                    )
+                    self._interrupted[job_id] = status
+                    job_task.cancel()
+                    break
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -513,34 +671,25 @@ class JobWorker:
         """
         transcript_file = job.get("transcript_file", "")
 
-        # Try various paths, including archive folder as fallback
-        paths_to_try = [
-            Path(transcript_file),
-            TRANSCRIPTS_DIR / transcript_file,
-            TRANSCRIPTS_DIR / Path(transcript_file).name,
-            # Archive folder fallback for re-processed jobs
-            TRANSCRIPTS_ARCHIVE_DIR / transcript_file,
-            TRANSCRIPTS_ARCHIVE_DIR / Path(transcript_file).name,
-        ]
-
-        for path in paths_to_try:
-            if path.exists():
-                # Log if we're using archive fallback
-                if TRANSCRIPTS_ARCHIVE_DIR in path.parents or path.parent == TRANSCRIPTS_ARCHIVE_DIR:
-                    logger.info(
-                        "Using archived transcript (re-processing)",
-                        extra={"job_id": job.get("id"), "source": str(path)}
-                    )
-                # Try different encodings
-                for encoding in ['utf-8', 'iso-8859-1', 'cp1252', 'latin-1']:
-                    try:
-                        return path.read_text(encoding=encoding)
-                    except UnicodeDecodeError:
-                        continue
-                # Last resort: read with errors='replace'
-                return path.read_text(encoding='utf-8', errors='replace')
+        # Tries the transcripts folder, then the archive for re-processed jobs
+        path = find_transcript(transcript_file, TRANSCRIPTS_DIR)
+        if path is None:
+            raise FileNotFoundError(f"Transcript not found: {transcript_file}")
 
-        raise FileNotFoundError(f"Transcript not found: {transcript_file}")
+        # Log if we're using archive fallback
+        if path.parent.name == "archive":
+            logger.info(
+                "Using archived transcript (re-processing)",
+                extra={"job_id": job.get("id"), "source": str(path)}
+            )
+        # Try different encodings
+        for encoding in ['utf-8', 'iso-8859-1', 'cp1252', 'latin-1']:
+            try:
+                return path.read_text(encoding=encoding)
+            except UnicodeDecodeError:
+                continue
+        # Last resort: read with errors='replace'
+        return path.read_text(encoding='utf-8', errors='replace')
 
     def _archive_transcript(self, job: Dict[str, Any]) -> None:
         """Move completed transcript to archive folder.
@@ -598,11 +747,16 @@ class JobWorker:
         phase_name: str,
         context: Dict[str, Any],
         project_path: Path,
+        refresh_cache: bool = False,
     ) -> Dict[str, Any]:
         """Run a single agent phase with tiered escalation on failure.
 
         Attempts to run with the initial tier based on transcript duration.
         On failure or timeout, escalates to the next tier and retries.
+
+        Args:
+            refresh_cache: Don't serve the phase's calls from the response
+                cache (for recovery retries of output judged bad)
         """
         # Get escalation config
         escalation_config = self.llm.get_escalation_config()
@@ -632,21 +786,47 @@ class JobWorker:
         tier_labels = routing_config.get("tier_labels", ["cheapskate", "default", "big-brain"])
 
         # Load prompts once (don't reload on each retry)
-        system_prompt = self._load_agent_prompt(phase_name)
-        user_message = self._build_phase_prompt(phase_name, context)
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_message},
-        ]
+        messages, context_trimmed = self._build_phase_messages(phase_name, context)
+
+        # Bound output to what the phase needs, planned from transcript size
+        transcript_metrics = context.get("transcript_metrics") or {}
+        transcript_tokens = transcript_metrics.get("token_count")
+        if transcript_tokens is None:
+            transcript_tokens = count_tokens(context.get("transcript", ""))
+        chat_options = {}
+        max_tokens = self.llm.plan_max_tokens(phase_name, transcript_tokens)
+        if max_tokens is not None:
+            chat_options["max_tokens"] = max_tokens
+        reasoning = self.llm.get_reasoning_settings(phase_name)
+        if reasoning:
+            chat_options["reasoning"] = reasoning
+        schema = response_schema(phase_name)
+        if schema is not None:
+            chat_options["response_schema"] = schema
+        if refresh_cache:
+            chat_options["refresh_cache"] = True
 
         total_cost = 0.0
         total_tokens = 0
         last_error = None
         attempts = 0
 
+        # In-tier fallback chain: backend/model candidates tried in turn,
+        # within the tier's budget, before escalating to the next tier
+        tier_candidates = None
+        tier_budget: Dict[str, Any] = {}
+        candidate_index = 0
+        tier_started = 0.0
+
         while True:
             # Get backend for current tier
-            backend = self.llm.get_backend_for_phase(phase_name, context, tier_override=current_tier)
+            if tier_candidates is None:
+                tier_backend = self.llm.get_backend_for_phase(phase_name, context, tier_override=current_tier)
+                tier_candidates, tier_budget = self.llm.get_fallback_chain(current_tier, tier_backend)
+                candidate_index = 0
+                tier_started = time.monotonic()
+            backend = tier_candidates[candidate_index]["backend"]
+            model = tier_candidates[candidate_index]["model"]
             tier_label = tier_labels[current_tier] if current_tier < len(tier_labels) else f"tier-{current_tier}"
             logger.info(
                 "Phase attempting with tier",
@@ -656,6 +836,7 @@ class JobWorker:
                     "tier": current_tier,
                     "tier_label": tier_label,
                     "backend": backend,
+                    "model": model,
                 }
             )
 
@@ -666,6 +847,7 @@ class JobWorker:
                 data=EventData(
                     phase=phase_name,
                     backend=backend,
+                    model=model,
                     extra={"tier": current_tier, "tier_label": tier_label, "attempt": attempts + 1}
                 ),
             ))
@@ -676,7 +858,11 @@ class JobWorker:
                     self.llm.chat(
                         messages=messages,
                         backend=backend,
+                        model=model,
                         job_id=job_id,
+                        phase=phase_name,
+                        tier=current_tier,
+                        **chat_options,
                     ),
                     timeout=timeout_seconds
                 )
@@ -685,11 +871,39 @@ class JobWorker:
                 total_cost += response.cost
                 total_tokens += response.total_tokens
 
+                # Structured phases are validated locally (one repair
+                # request if needed) and saved rendered, as JSON and on the job
+                output = response.content
+                structured = None
+                if schema is not None:
+                    parsed, structured, repair = await self._validate_structured_output(
+                        job_id, phase_name, messages, response.content,
+                        backend, model, {**chat_options, "tier": current_tier}, timeout_seconds,
+                    )
+                    if repair is not None:
+                        total_cost += repair.cost
+                        total_tokens += repair.total_tokens
+                    if parsed is not None:
+                        output = render_structured_output(phase_name, parsed)
+                        (project_path / f"{phase_name}_output.json").write_text(parsed.model_dump_json(indent=2))
+                        if isinstance(parsed, SEOMetadata):
+                            await update_job(job_id, JobUpdate(seo_metadata=parsed))
+
                 # Save output
                 output_file = project_path / f"{phase_name}_output.md"
-                output_file.write_text(response.content)
+                output_file.write_text(output)
 
                 # Log phase completed
+                completed_extra = {"tier": current_tier, "tier_label": tier_label, "total_attempts": attempts + 1}
+                if response.continuations:
+                    completed_extra["continuations"] = response.continuations
+                if response.reasoning_tokens:
+                    completed_extra["reasoning_tokens"] = response.reasoning_tokens
+                if structured is not None:
+                    completed_extra["structured"] = structured
+                if response.truncated:
+                    # Continuation budget ran out; output is incomplete
+                    completed_extra["truncated"] = True
                 await log_event(EventCreate(
                     job_id=job_id,
                     event_type=EventType.phase_completed,
@@ -698,13 +912,13 @@ class JobWorker:
                         cost=response.cost,
                         tokens=response.total_tokens,
                         model=response.model,
-                        extra={"tier": current_tier, "tier_label": tier_label, "total_attempts": attempts + 1}
+                        extra=completed_extra,
                     ),
                 ))
 
                 return {
                     "success": True,
-                    "output": response.content,
+                    "output": output,
                     "cost": total_cost,
                     "tokens": total_tokens,
                     "model": response.model,
@@ -712,6 +926,8 @@ class JobWorker:
                     "tier_label": tier_label,
                     "tier_reason": tier_reason,
                     "attempts": attempts + 1,
+                    "context_trimmed": context_trimmed or None,
+                    "structured": structured,
                 }
 
             except asyncio.TimeoutError:
@@ -727,8 +943,7 @@ class JobWorker:
                 )
 
                 # Check if we should escalate on timeout
-                if not escalation_enabled or not escalate_on_timeout:
-                    break
+                can_escalate = escalation_enabled and escalate_on_timeout
 
             except Exception as e:
                 last_error = str(e)
@@ -744,11 +959,47 @@ class JobWorker:
                 )
 
                 # Check if we should escalate on failure
-                if not escalation_enabled or not escalate_on_failure:
-                    break
+                can_escalate = escalation_enabled and escalate_on_failure
 
             attempts += 1
 
+            # Try the next backend/model in this tier's chain first
+            if self._within_fallback_budget(
+                tier_budget, candidate_index + 1, len(tier_candidates), tier_started
+            ):
+                candidate_index += 1
+                next_candidate = tier_candidates[candidate_index]
+                logger.info(
+                    "Falling back within tier",
+                    extra={
+                        "job_id": job_id,
+                        "phase": phase_name,
+                        "tier_label": tier_label,
+                        "to_backend": next_candidate["backend"],
+                        "to_model": next_candidate["model"],
+                        "reason": last_error,
+                    }
+                )
+                await log_event(EventCreate(
+                    job_id=job_id,
+                    event_type=EventType.model_fallback,
+                    data=EventData(
+                        phase=phase_name,
+                        backend=next_candidate["backend"],
+                        model=next_candidate["model"],
+                        reason=last_error,
+                        extra={
+                            "tier": current_tier,
+                            "from_backend": backend,
+                            "from_model": model,
+                        },
+                    ),
+                ))
+                continue
+
+            if not can_escalate:
+                break
+
             # Try to escalate to next tier
             next_tier = self.llm.get_next_tier(current_tier)
             if next_tier is None:
@@ -793,6 +1044,7 @@ class JobWorker:
             ))
 
             current_tier = next_tier
+            tier_candidates = None
 
         # All attempts failed
         await log_event(EventCreate(
@@ -805,6 +1057,86 @@ class JobWorker:
         ))
         return {"success": False, "error": last_error, "attempts": attempts, "cost": total_cost}
 
+    def _within_fallback_budget(
+        self,
+        budget: Dict[str, Any],
+        next_index: int,
+        chain_length: int,
+        tier_started: float,
+    ) -> bool:
+        """Return True if the candidate at next_index may still be tried."""
+        if next_index >= chain_length:
+            return False
+        max_attempts = budget.get("max_attempts")
+        if max_attempts is not None and next_index >= max_attempts:
+            return False
+        max_seconds = budget.get("max_seconds")
+        if max_seconds is not None and time.monotonic() - tier_started >= max_seconds:
+            return False
+        return True
+
+    async def _validate_structured_output(
+        self,
+        job_id: int,
+        phase_name: str,
+        messages: List[Dict[str, Any]],
+        content: str,
+        backend: str,
+        model: Optional[str],
+        chat_options: Dict[str, Any],
+        timeout_seconds: float,
+    ) -> Tuple[Optional[BaseModel], Dict[str, Any], Optional[LLMResponse]]:
+        """Validate a structured phase's output, asking once for a repair.
+
+        Output that still doesn't validate is kept as it came back; the
+        phase doesn't fail over it.
+
+        Returns:
+            Tuple of (parsed output or None, record for the phase metadata,
+            the repair response if one was requested)
+        """
+        try:
+            return parse_structured_output(phase_name, content), {"valid": True, "repaired": False}, None
+        except StructuredOutputError as e:
+            error = e
+
+        logger.warning(
+            "Structured output invalid, requesting repair",
+            extra={"job_id": job_id, "phase": phase_name, "error": str(error)},
+        )
+        repair_messages = messages + [
+            {"role": "assistant", "content": content},
+            {"role": "user", "content": repair_prompt(error)},
+        ]
+        try:
+            repair = await asyncio.wait_for(
+                self.llm.chat(
+                    messages=repair_messages,
+                    backend=backend,
+                    model=model,
+                    job_id=job_id,
+                    phase=phase_name,
+                    **chat_options,
+                ),
+                timeout=timeout_seconds,
+            )
+        except Exception as e:
+            logger.warning(
+                "Structured output repair failed",
+                extra={"job_id": job_id, "phase": phase_name, "error": str(e)},
+            )
+            return None, {"valid": False, "repaired": False, "error": str(error)}, None
+
+        try:
+            parsed = parse_structured_output(phase_name, repair.content)
+        except StructuredOutputError as e:
+            logger.warning(
+                "Structured output still invalid after repair",
+                extra={"job_id": job_id, "phase": phase_name, "error": str(e)},
+            )
+            return None, {"valid": False, "repaired": False, "error": str(e)}, repair
+        return parsed, {"valid": True, "repaired": True}, repair
+
     async def _analyze_and_recover(
         self,
         job: Dict[str, Any],
@@ -900,9 +1232,7 @@ REASON: [Brief explanation - 1-2 sentences]
             system_prompt = self._load_agent_prompt("manager")
 
             # Use big-brain tier for recovery decisions
-            routing_config = self.llm.config.get("routing", {})
-            tier_backends = routing_config.get("tiers", ["openrouter-cheapskate", "openrouter", "openrouter-big-brain"])
-            backend_name = tier_backends[2] if len(tier_backends) > 2 else tier_backends[-1]
+            backend_name = self.llm.get_backend_for_tier(2)
 
             logger.info(
                 "Running recovery analysis",
@@ -1005,12 +1335,13 @@ REASON: [Brief explanation - 1-2 sentences]
                     phases[failed_phase_idx]["error_message"] = None
                     await update_job_phase(job_id, phases)
 
-                    # Re-run the phase
+                    # Re-run the phase, bypassing any cached output
                     retry_result = await self._run_phase(
                         job_id=job_id,
                         phase_name=failed_phase.get("name"),
                         context=context,
                         project_path=project_path,
+                        refresh_cache=True,
                     )
 
                     if retry_result["success"]:
@@ -1059,6 +1390,7 @@ REASON: [Brief explanation - 1-2 sentences]
                             phase_name=failed_phase.get("name"),
                             context=context,
                             project_path=project_path,
+                            refresh_cache=True,
                         )
 
                         # Clean up
@@ -1181,7 +1513,7 @@ REASON: [Brief explanation - 1-2 sentences]
                         "recovered": False,
                         "action": "FAIL",
                         "reason": f"Phase {phase_name} failed after recovery",
-                        "cost": total_cost,
+                        "total_cost": total_cost,
                     }
 
                 # Update phase as completed
@@ -1204,11 +1536,14 @@ REASON: [Brief explanation - 1-2 sentences]
 
             await self._create_manifest(job, project_path, phases, tracker)
 
-            await update_job_status(
+            completed = await transition_job(
                 job_id,
+                {JobStatus.investigating},
                 JobStatus.completed,
-                actual_cost=total_cost,
+                fields={"actual_cost": total_cost},
             )
+            if completed is None:
+                raise Exception("Job left investigating during recovery")
 
             # Archive transcript
             try:
@@ -1227,7 +1562,7 @@ REASON: [Brief explanation - 1-2 sentences]
                 "recovered": False,
                 "action": "FAIL",
                 "reason": str(e),
-                "cost": total_cost,
+                "total_cost": total_cost,
             }
 
     def _load_agent_prompt(self, phase_name: str) -> str:
@@ -1286,7 +1621,7 @@ Output the polished transcript with any notes on changes made.""",
 
 Check:
 1. Formatter: Speaker labels use first+last name only (no titles like Dr./Mr./Ms.), review notes only at top
-2. SEO: Title <60 chars, descriptions are engaging, tags relevant
+2. SEO: Descriptions are engaging, tags relevant (title and description lengths are validated before review)
 3. Analyst: Speakers identified, topics captured
 
 Output a QA report with:
@@ -1298,8 +1633,80 @@ Output a QA report with:
 
         return fallback_prompts.get(phase_name, f"You are the {phase_name} agent. Process the input and provide appropriate output.")
 
+    def _build_transcript_prefix(self, context: Dict[str, Any]) -> str:
+        """Build the transcript block shared verbatim by TRANSCRIPT_PREFIX_PHASES."""
+        return f"""## Transcript
+
+---
+{context.get("transcript", "")}
+---
+
+"""
+
+    def _build_phase_messages(
+        self, phase_name: str, context: Dict[str, Any]
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """Build the chat messages for a phase.
+
+        For TRANSCRIPT_PREFIX_PHASES the transcript block leads the system
+        message as its own content block, marked with cache_control, so every
+        phase of a job shares the same prompt prefix. The LLM client flattens
+        the blocks for backends that don't take explicit markers.
+
+        Returns:
+            Tuple of (messages, what was trimmed to fit the context budgets)
+        """
+        system_prompt = self._load_agent_prompt(phase_name)
+        context, trimmed = self._fit_phase_context(phase_name, context)
+        user_message = self._build_phase_prompt(phase_name, context)
+
+        prefix = self._build_transcript_prefix(context)
+        if (
+            phase_name in self.TRANSCRIPT_PREFIX_PHASES
+            and context.get("transcript")
+            and user_message.startswith(prefix)
+        ):
+            return [
+                {"role": "system", "content": [
+                    {"type": "text", "text": prefix, "cache_control": CACHE_CONTROL_EPHEMERAL},
+                    {"type": "text", "text": system_prompt},
+                ]},
+                {"role": "user", "content": user_message[len(prefix):]},
+            ], trimmed
+
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message},
+        ], trimmed
+
+    def _fit_phase_context(
+        self, phase_name: str, context: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """Trim a phase's inputs to its context budgets (see context_budget).
+
+        Returns (fitted copy of context, what was trimmed) and leaves context
+        itself untouched.
+        """
+        fitted, trimmed = fit_phase_context(context, self.llm.get_context_budgets(phase_name))
+        if trimmed:
+            logger.info(
+                "Trimmed phase context to budget",
+                extra={
+                    "phase": phase_name,
+                    "trimmed": {
+                        name: f"{r['original_tokens']} -> {r['kept_tokens']} tokens ({r['strategy']})"
+                        for name, r in trimmed.items()
+                    },
+                },
+            )
+        return fitted, trimmed
+
     def _build_phase_prompt(self, phase_name: str, context: Dict[str, Any]) -> str:
-        """Build the user prompt for a phase with relevant context."""
+        """Build the user prompt for a phase with relevant context.
+
+        Phases in TRANSCRIPT_PREFIX_PHASES start with the transcript block so
+        it forms a stable, cacheable prefix; everything phase-specific follows.
+        """
         transcript = context.get("transcript", "")
         sst_context = context.get("sst_context")
 
@@ -1329,31 +1736,24 @@ Output a QA report with:
             sst_section += "\n*Use this context to align your analysis with existing metadata.*\n\n"
 
         if phase_name == "analyst":
-            prompt = f"""Please analyze the following transcript:
-"""
+            prompt = self._build_transcript_prefix(context)
+            prompt += "Please analyze the transcript above.\n"
             if sst_section:
                 prompt += sst_section
-            prompt += f"""---
-{transcript}
----
-
-Provide a detailed analysis document."""
+            prompt += "\nProvide a detailed analysis document."
             return prompt
 
         elif phase_name == "formatter":
             analysis = context.get("analyst_output", "")
-            prompt = "Using the following analysis as guidance:\n\n"
+            prompt = self._build_transcript_prefix(context)
+            prompt += "Using the following analysis as guidance:\n\n"
             if sst_section:
                 prompt += sst_section
             prompt += f"""---
 {analysis}
 ---
 
-Please format this transcript:
-
----
-{transcript}
----"""
+Please format the transcript above."""
             return prompt
 
         elif phase_name == "seo":
@@ -1369,10 +1769,12 @@ Please format this transcript:
 And this formatted transcript:
 
 ---
-{formatted[:2000]}...
+{formatted}
 ---
 
-Generate SEO metadata as a markdown report."""
+Generate SEO metadata as a single JSON object with keys: title (at most 60
+characters), short_description (at most 150 characters), long_description,
+tags (list of strings) and categories (list of strings). Output only the JSON."""
             return prompt
 
         elif phase_name == "copy_editor":
@@ -1394,7 +1796,7 @@ Apply PBS style guidelines and improve readability while preserving speaker voic
                 prompt += sst_section
             prompt += f"""## Original Transcript (for reference):
 ---
-{transcript[:3000]}{"..." if len(transcript) > 3000 else ""}
+{transcript}
 ---
 
 ## Analyst Output:
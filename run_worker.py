@@ -10,6 +10,12 @@ With custom options:
 Run multiple workers for parallel processing:
     ./venv/bin/python run_worker.py --worker-id worker-1 --concurrent 2 &
     ./venv/bin/python run_worker.py --worker-id worker-2 --concurrent 2 &
+
+Record every LLM call, then re-run the same jobs against the recording
+(at the recorded latency, or with --replay-speed max to measure worker and
+database overhead alone):
+    ./venv/bin/python run_worker.py --record runs/baseline.jsonl.gz
+    ./venv/bin/python run_worker.py --replay runs/baseline.jsonl.gz --replay-speed max
 """
 import argparse
 import asyncio
@@ -23,6 +29,9 @@ load_dotenv()
 from api.services.worker import JobWorker, WorkerConfig
 from api.services.database import init_db, close_db
 from api.services.llm import get_llm_client, close_llm_client
+from api.services.cassette import (
+    CASSETTE_RECORD, CASSETTE_REPLAY, LATENCY_NONE, LATENCY_RECORDED, Cassette,
+)
 import json
 from pathlib import Path
 
@@ -42,8 +51,15 @@ async def main(args):
     # Initialize database
     await init_db()
 
-    # Initialize LLM client
-    get_llm_client()
+    # Initialize LLM client and open backend connections before the first job
+    llm = get_llm_client()
+    if args.record:
+        llm.set_cassette(Cassette(Path(args.record), CASSETTE_RECORD))
+    elif args.replay:
+        latency = LATENCY_NONE if args.replay_speed == "max" else LATENCY_RECORDED
+        llm.set_cassette(Cassette(Path(args.replay), CASSETTE_REPLAY, latency))
+    if llm.cassette is None or llm.cassette.recording:
+        await llm.warm_up()
 
     # Load defaults from config file
     defaults = load_worker_defaults()
@@ -87,6 +103,8 @@ async def main(args):
         print(f"[{worker_id}] Heartbeat interval: {config.heartbeat_interval}s")
         print(f"[{worker_id}] Concurrent jobs: {config.max_concurrent_jobs}")
         print(f"[{worker_id}] Max retries: {config.max_retries}")
+        if llm.cassette is not None:
+            print(f"[{worker_id}] LLM cassette: {llm.cassette.mode} {llm.cassette.path}")
         print(f"[{worker_id}] Press Ctrl+C to stop")
         print()
 
@@ -133,5 +151,27 @@ if __name__ == "__main__":
         help="Unique worker identifier (default: worker-{pid})",
     )
 
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument(
+        "--record",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Record every LLM call to a compressed cassette file",
+    )
+    cassette_group.add_argument(
+        "--replay",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Answer LLM calls from a recorded cassette instead of the backends",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        choices=["recorded", "max"],
+        default="recorded",
+        help="Replay with the recorded model latency, or at max speed (default: recorded)",
+    )
+
     args = parser.parse_args()
     asyncio.run(main(args))
@@ -0,0 +1,173 @@
+"""Tests for LLM call rollups and the analytics service/router."""
+import os
+import tempfile
+
+import numpy as np
+import pytest
+import pytest_asyncio
+
+from api.services.database import (
+    init_db,
+    close_db,
+    log_event,
+    get_event_rollups,
+    get_latency_histograms,
+    latency_bucket,
+    LATENCY_BUCKET_EDGES_MS,
+)
+from api.services.analytics import histogram_percentiles, aggregate_rollups
+from api.routers import analytics as analytics_router
+from api.models.events import EventCreate, EventType, EventData
+
+
+@pytest_asyncio.fixture
+async def test_db():
+    """Create a temporary test database."""
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    os.environ["DATABASE_PATH"] = db_path
+
+    await init_db()
+
+    from api.services.database import metadata, _engine
+    async with _engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+
+    yield db_path
+
+    await close_db()
+
+    try:
+        os.unlink(db_path)
+    except Exception:
+        pass
+
+
+async def _log_call(cost, tokens, duration_ms, model="m1", backend="openrouter", phase="analyst"):
+    await log_event(EventCreate(
+        event_type=EventType.cost_update,
+        data=EventData(
+            cost=cost, tokens=tokens, duration_ms=duration_ms,
+            model=model, backend=backend, phase=phase,
+        ),
+    ))
+
+
+class TestHistogramPercentiles:
+    """Tests for histogram-based percentile estimation."""
+
+    def test_single_bucket_interpolates(self):
+        """Percentiles fall within the bucket holding all calls."""
+        counts = np.zeros((1, len(LATENCY_BUCKET_EDGES_MS) + 1))
+        bucket = latency_bucket(1000)
+        counts[0, bucket] = 10
+
+        p50, p95 = histogram_percentiles(counts, (0.5, 0.95))[0]
+
+        lower = LATENCY_BUCKET_EDGES_MS[bucket - 1]
+        upper = LATENCY_BUCKET_EDGES_MS[bucket]
+        assert lower <= p50 <= upper
+        assert p50 < p95 <= upper
+
+    def test_vectorized_over_groups(self):
+        """Each row is treated as an independent histogram."""
+        counts = np.zeros((3, len(LATENCY_BUCKET_EDGES_MS) + 1))
+        counts[0, latency_bucket(100)] = 5
+        counts[1, latency_bucket(100)] = 95
+        counts[1, latency_bucket(60000)] = 5
+
+        result = histogram_percentiles(counts, (0.5, 0.95))
+
+        assert result.shape == (3, 2)
+        assert result[0, 0] < 200
+        assert result[1, 0] < 200
+        assert result[1, 1] < 200  # 95th call is still in the fast bucket
+        assert np.isnan(result[2]).all()  # Empty group
+
+
+class TestRollupMaintenance:
+    """Tests for incremental rollup updates in log_event."""
+
+    @pytest.mark.asyncio
+    async def test_cost_update_events_roll_up(self, test_db):
+        """cost_update events accumulate into one rollup row per key."""
+        await _log_call(0.01, 100, 500)
+        await _log_call(0.02, 200, 1500)
+        await _log_call(0.05, 300, 800, model="m2")
+        await log_event(EventCreate(
+            event_type=EventType.phase_started,
+            data=EventData(phase="analyst", backend="openrouter"),
+        ))
+
+        rollups = await get_event_rollups(model="m1")
+        assert len(rollups) == 1
+        assert rollups[0]["calls"] == 2
+        assert rollups[0]["tokens"] == 300
+        assert rollups[0]["cost"] == pytest.approx(0.03)
+        assert rollups[0]["duration_ms"] == 2000
+
+        histograms = await get_latency_histograms(model="m1")
+        assert sum(h["count"] for h in histograms) == 2
+
+        assert len(await get_event_rollups()) == 2
+
+
+class TestAnalyticsEndpoints:
+    """Tests for /api/analytics endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_summary(self, test_db):
+        """Summary totals all calls in the window."""
+        await _log_call(0.01, 100, 500)
+        await _log_call(0.02, 200, 1500, model="m2", phase="seo")
+
+        summary = await analytics_router.get_summary(days=7)
+
+        assert summary.calls == 2
+        assert summary.tokens == 300
+        assert summary.cost == pytest.approx(0.03)
+        assert summary.avg_latency_ms == 1000
+        assert summary.p50_latency_ms is not None
+        assert summary.p95_latency_ms >= summary.p50_latency_ms
+
+    @pytest.mark.asyncio
+    async def test_summary_empty(self, test_db):
+        """Summary with no calls returns zeros and no percentiles."""
+        summary = await analytics_router.get_summary(days=7)
+
+        assert summary.calls == 0
+        assert summary.p50_latency_ms is None
+
+    @pytest.mark.asyncio
+    async def test_breakdown_by_model(self, test_db):
+        """Breakdown returns one row per model."""
+        await _log_call(0.01, 100, 500)
+        await _log_call(0.02, 200, 1500)
+        await _log_call(0.05, 300, 800, model="m2")
+
+        response = await analytics_router.get_breakdown(group_by="model", days=7)
+
+        by_model = {row.model: row for row in response.rows}
+        assert set(by_model) == {"m1", "m2"}
+        assert by_model["m1"].calls == 2
+        assert by_model["m2"].cost == pytest.approx(0.05)
+
+    @pytest.mark.asyncio
+    async def test_daily_with_filter(self, test_db):
+        """Daily series respects dimension filters."""
+        await _log_call(0.01, 100, 500, phase="analyst")
+        await _log_call(0.02, 200, 1500, phase="formatter")
+
+        response = await analytics_router.get_daily(
+            days=7, backend=None, model=None, phase="formatter"
+        )
+
+        assert len(response.rows) == 1
+        assert response.rows[0].day is not None
+        assert response.rows[0].tokens == 200
+
+    @pytest.mark.asyncio
+    async def test_invalid_group_by_rejected(self, test_db):
+        """Unknown dimensions raise ValueError."""
+        with pytest.raises(ValueError):
+            await aggregate_rollups(group_by=("job_id",))
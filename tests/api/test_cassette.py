@@ -0,0 +1,64 @@
+"""Tests for LLM call cassettes in api/services/cassette.py."""
+import gzip
+import json
+
+import pytest
+
+from api.services.cassette import (
+    CASSETTE_RECORD, CASSETTE_REPLAY, Cassette, CassetteMissError, cassette_key,
+)
+
+
+MESSAGES = [{"role": "user", "content": "Hello"}]
+
+
+class TestCassetteKey:
+    """Tests for cassette_key()."""
+
+    def test_key_covers_request(self):
+        """Messages, overrides, params and phase all change the key."""
+        base = cassette_key(MESSAGES, None, None, {}, "analyst")
+        assert cassette_key(MESSAGES, None, None, {}, "analyst") == base
+        assert cassette_key([{"role": "user", "content": "Hi"}], None, None, {}, "analyst") != base
+        assert cassette_key(MESSAGES, "m", None, {}, "analyst") != base
+        assert cassette_key(MESSAGES, None, "p", {}, "analyst") != base
+        assert cassette_key(MESSAGES, None, None, {"max_tokens": 5}, "analyst") != base
+        assert cassette_key(MESSAGES, None, None, {}, "seo") != base
+
+
+class TestCassette:
+    """Tests for Cassette."""
+
+    def test_record_then_replay_in_order(self, tmp_path):
+        """Entries are gzip JSON lines, replayed per key in recorded order."""
+        path = tmp_path / "run.jsonl.gz"
+        recorder = Cassette(path, CASSETTE_RECORD)
+        recorder.record({"key": "a", "n": 1})
+        recorder.record({"key": "b", "n": 2})
+        recorder.record({"key": "a", "n": 3})
+        recorder.close()
+
+        with gzip.open(path, "rt") as f:
+            assert [json.loads(line)["n"] for line in f] == [1, 2, 3]
+
+        player = Cassette(path, CASSETTE_REPLAY)
+        assert player.next("a")["n"] == 1
+        assert player.next("a")["n"] == 3
+        assert player.next("b")["n"] == 2
+        with pytest.raises(CassetteMissError):
+            player.next("a")
+
+    def test_from_env(self, tmp_path, monkeypatch):
+        """LLM_CASSETTE* variables configure the cassette; unset means none."""
+        monkeypatch.delenv("LLM_CASSETTE", raising=False)
+        assert Cassette.from_env() is None
+
+        monkeypatch.setenv("LLM_CASSETTE", str(tmp_path / "run.jsonl.gz"))
+        monkeypatch.setenv("LLM_CASSETTE_MODE", "record")
+        cassette = Cassette.from_env()
+        assert cassette.recording
+        assert cassette.latency == "recorded"
+
+    def test_invalid_mode(self, tmp_path):
+        with pytest.raises(ValueError):
+            Cassette(tmp_path / "run.jsonl.gz", "rewind")
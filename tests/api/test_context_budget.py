@@ -0,0 +1,95 @@
+"""Tests for fitting phase context to token budgets in api/services/context_budget.py."""
+import pytest
+
+from api.services.context_budget import fit_phase_context, fit_to_budget, merge_context_budgets
+from api.services.estimator import count_tokens
+
+
+REPORT = "\n".join([
+    "# Analysis",
+    "Intro line.",
+    "## Topics",
+    *["Topic detail sentence here." for _ in range(40)],
+    "## Speakers",
+    "Jane Doe, host.",
+    "## Review Items",
+    "Check spelling of Oconomowoc.",
+])
+
+
+class TestFitToBudget:
+    """Tests for fit_to_budget()."""
+
+    def test_fitting_text_untouched(self):
+        assert fit_to_budget("Short text.", 100, "head") == ("Short text.", None)
+
+    def test_head_keeps_beginning(self):
+        text = "\n".join(f"Line number {i}." for i in range(500))
+        fitted, record = fit_to_budget(text, 100, "head")
+
+        assert fitted.startswith("Line number 0.")
+        assert "Line number 499." not in fitted
+        assert record["strategy"] == "head"
+        assert record["kept_tokens"] <= 100 < record["original_tokens"]
+
+    def test_head_splits_unbroken_text(self):
+        """Text without line breaks is cut at sentence boundaries."""
+        text = "This is one sentence. " * 500
+        fitted, record = fit_to_budget(text, 100, "head")
+        assert fitted.startswith("This is one sentence.")
+        assert count_tokens(fitted) <= 100
+
+    def test_sections_drop_whole_sections(self):
+        """Sections that don't fit are left out and listed by heading."""
+        fitted, record = fit_to_budget(REPORT, 60, "sections")
+
+        assert "## Speakers" in fitted
+        assert "Oconomowoc" in fitted
+        assert "Topic detail" not in fitted
+        assert record["omitted_sections"] == ["Topics"]
+
+    def test_sample_spans_text(self):
+        """Sampled excerpts come from the start, middle and end."""
+        text = "\n".join(f"Line number {i}." for i in range(1000))
+        fitted, record = fit_to_budget(text, 300, "sample")
+
+        assert "Line number 0." in fitted
+        assert "Line number 400." in fitted
+        assert "Line number 800." in fitted
+        assert "lines omitted" in fitted
+        assert record["kept_tokens"] <= 300
+
+    def test_deterministic(self):
+        text = "\n".join(f"Line number {i}." for i in range(1000))
+        assert fit_to_budget(text, 300, "sample") == fit_to_budget(text, 300, "sample")
+
+    def test_unknown_strategy(self):
+        with pytest.raises(ValueError):
+            fit_to_budget("x " * 100, 10, "random")
+
+
+class TestPhaseBudgets:
+    """Tests for merge_context_budgets() and fit_phase_context()."""
+
+    def test_overrides(self):
+        """Ints set tokens, dicts merge, None removes a default."""
+        budgets = merge_context_budgets("manager", {
+            "transcript": None,
+            "seo_output": 100,
+            "formatter_output": {"strategy": "head"},
+        })
+        assert "transcript" not in budgets
+        assert budgets["seo_output"] == {"tokens": 100, "strategy": "head"}
+        assert budgets["formatter_output"] == {"tokens": 8000, "strategy": "head"}
+
+    def test_fit_phase_context(self):
+        """Only over-budget inputs are trimmed and recorded."""
+        context = {"transcript": "word " * 50, "seo_output": "word " * 500}
+        fitted, trimmed = fit_phase_context(context, {
+            "transcript": {"tokens": 100, "strategy": "head"},
+            "seo_output": {"tokens": 100, "strategy": "head"},
+        })
+
+        assert fitted["transcript"] == context["transcript"]
+        assert list(trimmed) == ["seo_output"]
+        assert count_tokens(fitted["seo_output"]) <= 100
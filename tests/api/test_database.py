@@ -13,6 +13,8 @@ from api.services.database import (
     list_jobs,
     update_job,
     delete_job,
+    transition_job,
+    bulk_transition_jobs,
     get_next_pending_job,
     update_heartbeat,
     get_stale_jobs,
@@ -173,6 +175,64 @@ async def test_update_job(test_db):
     assert updated.completed_at is not None
 
 
+@pytest.mark.asyncio
+async def test_transition_job(test_db):
+    """Test conditional status transitions."""
+    job = await create_job(JobCreate(
+        project_name="Transition",
+        project_path="/projects/transition",
+        transcript_file="/transcripts/transition.txt",
+    ))
+
+    # Allowed transition applies and stamps completed_at
+    cancelled = await transition_job(
+        job.id, {JobStatus.pending, JobStatus.paused}, JobStatus.cancelled
+    )
+    assert cancelled.status == JobStatus.cancelled
+    assert cancelled.completed_at is not None
+
+    # Disallowed transition leaves the job untouched
+    assert await transition_job(job.id, {JobStatus.failed}, JobStatus.pending) is None
+    assert (await get_job(job.id)).status == JobStatus.cancelled
+
+    # Missing job
+    assert await transition_job(99999, {JobStatus.pending}, JobStatus.paused) is None
+
+    # Extra fields are written in the same statement
+    retried = await transition_job(
+        job.id, {JobStatus.cancelled}, JobStatus.pending,
+        fields={"error_message": "", "current_phase": None},
+    )
+    assert retried.status == JobStatus.pending
+    assert retried.error_message == ""
+    assert retried.current_phase is None
+
+
+@pytest.mark.asyncio
+async def test_bulk_transition_jobs(test_db):
+    """Test bulk conditional status transitions."""
+    jobs = []
+    for i in range(3):
+        jobs.append(await create_job(JobCreate(
+            project_name=f"Bulk {i}",
+            project_path=f"/projects/bulk{i}",
+            transcript_file=f"/transcripts/bulk{i}.txt",
+        )))
+    await update_job(jobs[2].id, JobUpdate(status=JobStatus.completed))
+
+    paused = await bulk_transition_jobs({JobStatus.pending}, JobStatus.paused)
+    assert {j.id for j in paused} == {jobs[0].id, jobs[1].id}
+
+    resumed = await bulk_transition_jobs(
+        {JobStatus.paused}, JobStatus.pending, job_ids=[jobs[0].id, jobs[2].id]
+    )
+    assert [j.id for j in resumed] == [jobs[0].id]
+    assert (await get_job(jobs[1].id)).status == JobStatus.paused
+    assert (await get_job(jobs[2].id)).status == JobStatus.completed
+
+    assert await bulk_transition_jobs({JobStatus.paused}, JobStatus.pending, job_ids=[]) == []
+
+
 @pytest.mark.asyncio
 async def test_delete_job(test_db):
     """Test deleting a job."""
@@ -264,6 +324,56 @@ async def test_log_event(test_db):
     assert event.timestamp is not None
 
 
+@pytest.mark.asyncio
+async def test_log_event_populates_metric_columns(test_db):
+    """Test that log_event copies cost/token fields into typed columns."""
+    from sqlalchemy import select, func
+    from api.services.database import get_session, session_stats_table
+
+    job = await create_job(JobCreate(
+        project_name="Metrics Project",
+        project_path="/projects/metrics",
+        transcript_file="/transcripts/metrics.txt",
+    ))
+
+    await log_event(EventCreate(
+        job_id=job.id,
+        event_type=EventType.cost_update,
+        data=EventData(cost=0.02, tokens=400, backend="openrouter", model="m1",
+                       duration_ms=1200, phase="analyst", extra={"tier": 1}),
+    ))
+    await log_event(EventCreate(
+        job_id=job.id,
+        event_type=EventType.cost_update,
+        data=EventData(cost=0.03, tokens=600, backend="openrouter", model="m1"),
+    ))
+    await log_event(EventCreate(job_id=job.id, event_type=EventType.job_started))
+
+    async with get_session() as session:
+        result = await session.execute(
+            select(
+                session_stats_table.c.model,
+                func.sum(session_stats_table.c.cost),
+                func.sum(session_stats_table.c.tokens),
+            )
+            .where(session_stats_table.c.event_type == EventType.cost_update.value)
+            .group_by(session_stats_table.c.model)
+        )
+        rows = result.fetchall()
+
+        tier_row = (await session.execute(
+            select(session_stats_table.c.tier, session_stats_table.c.phase)
+            .where(session_stats_table.c.duration_ms == 1200)
+        )).fetchone()
+
+    assert len(rows) == 1
+    assert rows[0][0] == "m1"
+    assert rows[0][1] == pytest.approx(0.05)
+    assert rows[0][2] == 1000
+    assert tier_row.tier == 1
+    assert tier_row.phase == "analyst"
+
+
 @pytest.mark.asyncio
 async def test_get_events_for_job(test_db):
     """Test retrieving events for a job."""
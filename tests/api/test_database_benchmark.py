@@ -0,0 +1,110 @@
+"""Micro-benchmarks for the prebuilt hot-path statements in database.py.
+
+Compares the per-call cost of building a statement the old way (a fresh
+Core construct on every call) against reusing the module-level statement.
+Timing-dependent, so skipped unless RUN_BENCHMARKS=1; timings are saved as
+test properties (see --junitxml).
+"""
+import os
+import time
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+from api.services import database
+from api.services.database import (
+    create_job,
+    get_job,
+    update_heartbeat,
+    log_event,
+    jobs_table,
+)
+from api.models.job import JobCreate
+from api.models.events import EventCreate, EventType, EventData
+from tests.api.test_database import test_db  # noqa: F401
+
+
+pytestmark = pytest.mark.skipif(
+    os.environ.get("RUN_BENCHMARKS") != "1",
+    reason="benchmark; set RUN_BENCHMARKS=1 to run",
+)
+
+ITERATIONS = 2000
+
+
+def _per_call_us(fn, iterations: int = ITERATIONS) -> float:
+    """Return mean microseconds per call of fn()."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def test_prebuilt_statements_skip_construction_overhead(record_property):
+    """Reusing a prebuilt statement avoids rebuilding the expression and cache key."""
+
+    def rebuilt_get_job():
+        stmt = select(jobs_table).where(jobs_table.c.id == 1)
+        stmt._generate_cache_key()
+
+    def rebuilt_heartbeat():
+        stmt = (
+            update(jobs_table)
+            .where(jobs_table.c.id == 1)
+            .values(last_heartbeat=datetime.now(timezone.utc))
+        )
+        stmt._generate_cache_key()
+
+    def prebuilt_get_job():
+        database._GET_JOB_STMT._generate_cache_key()
+
+    def prebuilt_heartbeat():
+        database._UPDATE_HEARTBEAT_STMT._generate_cache_key()
+
+    results = {
+        "get_job": (_per_call_us(rebuilt_get_job), _per_call_us(prebuilt_get_job)),
+        "update_heartbeat": (_per_call_us(rebuilt_heartbeat), _per_call_us(prebuilt_heartbeat)),
+    }
+
+    for name, (before, after) in results.items():
+        record_property(f"{name}_rebuilt_us", round(before, 1))
+        record_property(f"{name}_prebuilt_us", round(after, 1))
+        assert after < before
+
+
+@pytest.mark.asyncio
+async def test_hot_path_round_trip_timings(test_db, record_property):  # noqa: F811
+    """Report end-to-end per-call latency of the hot database calls."""
+    job = await create_job(JobCreate(
+        project_name="Benchmark",
+        project_path="/projects/benchmark",
+        transcript_file="/transcripts/benchmark.txt",
+    ))
+
+    iterations = 200
+    timings = {}
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await get_job(job.id)
+    timings["get_job"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await update_heartbeat(job.id)
+    timings["update_heartbeat"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await log_event(EventCreate(
+            job_id=job.id,
+            event_type=EventType.cost_update,
+            data=EventData(cost=0.001, tokens=10, model="m", backend="b", duration_ms=100),
+        ))
+    timings["log_event"] = time.perf_counter() - start
+
+    for name, elapsed in timings.items():
+        record_property(f"{name}_us", round(elapsed / iterations * 1_000_000))
+
+    assert (await get_job(job.id)).last_heartbeat is not None
@@ -0,0 +1,62 @@
+"""Tests for offline token estimates in api/services/estimator.py."""
+from api.services.estimator import (
+    ESTIMATED_PHASES,
+    count_message_tokens,
+    count_tokens,
+    estimate_phase_tokens,
+)
+from api.services.paths import find_transcript
+
+
+class TestCountTokens:
+    """Tests for count_tokens()."""
+
+    def test_words_digits_and_punctuation(self):
+        """Short words are one token; punctuation and digit groups count too."""
+        assert count_tokens("") == 0
+        assert count_tokens("Hello world") == 2
+        assert count_tokens("Hello, world!") == 4
+        assert count_tokens("1234567") == 3
+
+    def test_long_words_split(self):
+        assert count_tokens("internationalization") > 1
+
+    def test_message_blocks(self):
+        """Text blocks count like plain strings."""
+        plain = [{"role": "system", "content": "Be brief."}]
+        blocks = [{"role": "system", "content": [{"type": "text", "text": "Be brief."}]}]
+        assert count_message_tokens(plain) == count_message_tokens(blocks)
+
+
+class TestPhaseEstimates:
+    """Tests for estimate_phase_tokens()."""
+
+    def test_default_phases(self):
+        estimates = estimate_phase_tokens("Welcome back to the show. " * 500)
+        assert list(estimates) == ESTIMATED_PHASES
+
+    def test_formatter_scales_with_transcript(self):
+        """Formatter output tracks transcript length; SEO output is fixed."""
+        short = estimate_phase_tokens("Welcome back to the show. " * 500)
+        long = estimate_phase_tokens("Welcome back to the show. " * 5000)
+
+        assert long["formatter"]["output_tokens"] > 5 * short["formatter"]["output_tokens"]
+        assert long["seo"]["output_tokens"] == short["seo"]["output_tokens"]
+        assert long["manager"]["input_tokens"] > short["manager"]["input_tokens"]
+
+
+class TestFindTranscript:
+    """Tests for find_transcript()."""
+
+    def test_finds_existing_path(self, tmp_path):
+        transcript = tmp_path / "show.txt"
+        transcript.write_text("Hello")
+        assert find_transcript(str(transcript)) == transcript
+        assert find_transcript(str(tmp_path / "missing.txt")) is None
+
+    def test_falls_back_to_archive(self, tmp_path):
+        """Re-processed jobs find their transcript in the archive folder."""
+        (tmp_path / "archive").mkdir()
+        archived = tmp_path / "archive" / "show.txt"
+        archived.write_text("Hello")
+        assert find_transcript("show.txt", tmp_path) == archived
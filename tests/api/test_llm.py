@@ -3,6 +3,7 @@
 Tests backend selection, tier calculation, cost tracking, safety guards,
 and error handling for LLM API interactions.
 """
+import asyncio
 import os
 import pytest
 import json
@@ -21,6 +22,23 @@ from api.services.llm import (
     CostCapExceededError,
     ModelNotAllowedError,
     TokenCostTooHighError,
+    DEFAULT_RETRY_SETTINGS,
+    CircuitBreaker,
+    CircuitOpenError,
+    CIRCUIT_CLOSED,
+    CIRCUIT_OPEN,
+    CIRCUIT_HALF_OPEN,
+    is_retryable_error,
+    parse_retry_after,
+    CACHE_CONTROL_EPHEMERAL,
+    estimate_request_tokens,
+)
+from api.services.cassette import (
+    CASSETTE_RECORD,
+    CASSETTE_REPLAY,
+    Cassette,
+    CassetteMissError,
+    ReplayedError,
 )
 
 
@@ -180,6 +198,718 @@ class TestBackendSelection:
         assert backend == "openrouter-big-brain"
 
 
+class TestLatencyAwareSelection:
+    """Tests for choosing among equivalent backends within a tier."""
+
+    @pytest.fixture
+    def pooled_client(self, llm_client):
+        """Tier 0 lists two equivalent backends."""
+        llm_client.config["backends"]["openrouter-cheapskate-alt"] = dict(
+            llm_client.config["backends"]["openrouter-cheapskate"]
+        )
+        llm_client.config["routing"]["tiers"][0] = [
+            "openrouter-cheapskate", "openrouter-cheapskate-alt"
+        ]
+        llm_client.compile_routing()
+        return llm_client
+
+    def _record(self, client, name, calls, duration_ms, tokens, failures=0):
+        stats = client.get_backend_stats(name)
+        for _ in range(calls):
+            stats.record_success(duration_ms, tokens)
+        for _ in range(failures):
+            stats.record_failure(duration_ms)
+
+    def test_unmeasured_backends_tried_first(self, pooled_client):
+        """Each backend is sampled before ranking applies."""
+        self._record(pooled_client, "openrouter-cheapskate", 3, 1000, 100)
+
+        assert pooled_client.get_backend_for_phase("analyst") == "openrouter-cheapskate-alt"
+
+    def test_best_throughput_wins(self, pooled_client):
+        """The backend with the best recent tokens/second is chosen."""
+        self._record(pooled_client, "openrouter-cheapskate", 3, 4000, 100)
+        self._record(pooled_client, "openrouter-cheapskate-alt", 3, 1000, 100)
+
+        assert pooled_client.get_backend_for_phase("analyst") == "openrouter-cheapskate-alt"
+
+        # Errors discount throughput
+        self._record(pooled_client, "openrouter-cheapskate-alt", 0, 1000, 0, failures=17)
+        assert pooled_client.get_backend_for_phase("analyst") == "openrouter-cheapskate"
+
+    def test_open_circuit_skipped(self, pooled_client):
+        """Backends with an open circuit are not selected."""
+        self._record(pooled_client, "openrouter-cheapskate", 3, 4000, 100)
+        self._record(pooled_client, "openrouter-cheapskate-alt", 3, 1000, 100)
+        breaker = pooled_client.get_breaker("openrouter-cheapskate-alt")
+        for _ in range(breaker.consecutive_failures):
+            breaker.record_failure()
+
+        assert pooled_client.get_backend_for_phase("analyst") == "openrouter-cheapskate"
+
+    def test_old_samples_expire(self):
+        """Samples older than max_age_seconds no longer count."""
+        from api.services.llm import BackendStats
+
+        stats = BackendStats(max_age_seconds=60)
+        with patch("api.services.llm.time.monotonic", return_value=1000.0):
+            stats.record_success(1000, 50)
+        with patch("api.services.llm.time.monotonic", return_value=1100.0):
+            assert stats.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_chat_records_telemetry(self, llm_client, monkeypatch):
+        """Successful and failed calls feed the backend's stats."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        ok = _http_response(200, json_data={
+            "model": "google/gemini-2.0-flash-exp",
+            "choices": [{"message": {"content": "ok"}}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 40, "total_tokens": 50},
+        })
+        start_run_tracking(job_id=40)
+
+        with patch("api.services.llm.log_event"), \
+             patch.object(httpx.AsyncClient, "post", new_callable=AsyncMock, return_value=ok):
+            await llm_client.chat(messages=[{"role": "user", "content": "Hi"}], backend="openrouter")
+
+        with patch("api.services.llm.log_event"), \
+             patch("api.services.llm.asyncio.sleep", new_callable=AsyncMock), \
+             patch.object(httpx.AsyncClient, "post", new_callable=AsyncMock,
+                          side_effect=httpx.ConnectError("down")):
+            with pytest.raises(httpx.ConnectError):
+                await llm_client.chat(messages=[{"role": "user", "content": "Hi"}], backend="openrouter")
+
+        summary = llm_client.get_status()["backend_stats"]["openrouter"]
+        assert summary["calls"] == 2
+        assert summary["error_rate"] == 0.5
+
+
+class TestHedging:
+    """Tests for hedged requests."""
+
+    @pytest.fixture
+    def hedging_client(self, llm_client):
+        llm_client.config["hedging"] = {"enabled": True, "min_samples": 5, "min_delay_ms": 0}
+        for duration_ms in (10, 10, 10, 10, 20):
+            llm_client._record_stats("openrouter-cheapskate", "analyst", duration_ms, 100)
+        return llm_client
+
+    def test_latency_percentile(self):
+        """Percentiles come from successful calls only."""
+        from api.services.llm import BackendStats
+
+        stats = BackendStats()
+        for duration_ms in range(100, 1100, 100):
+            stats.record_success(duration_ms, 10)
+        stats.record_failure(99999)
+
+        assert stats.latency_percentile(95) == 1000.0
+        assert stats.latency_percentile(50) == 600.0
+        assert stats.latency_percentile(95, min_samples=20) is None
+
+    def test_hedge_delay(self, hedging_client):
+        """Delay is the phase's p95, falling back to backend-wide stats."""
+        assert hedging_client.get_hedge_delay("openrouter-cheapskate", "analyst") == pytest.approx(0.02)
+        assert hedging_client.get_hedge_delay("openrouter-cheapskate", "seo") == pytest.approx(0.02)
+        assert hedging_client.get_hedge_delay("openrouter", "analyst") is None
+
+        hedging_client.config["hedging"]["enabled"] = False
+        assert hedging_client.get_hedge_delay("openrouter-cheapskate", "analyst") is None
+
+    def test_hedge_backend(self, llm_client):
+        """Explicit hedge backend, else a tier peer, else the next tier."""
+        assert llm_client.get_hedge_backend("openrouter-cheapskate") == "openrouter"
+        assert llm_client.get_hedge_backend("openrouter-big-brain") is None
+
+        llm_client.config["routing"]["tiers"][0] = ["openrouter-cheapskate", "openrouter-big-brain"]
+        llm_client.compile_routing()
+        assert llm_client.get_hedge_backend("openrouter-cheapskate") == "openrouter-big-brain"
+
+        llm_client.config["backends"]["openrouter-cheapskate"]["hedge_backend"] = "openrouter"
+        assert llm_client.get_hedge_backend("openrouter-cheapskate") == "openrouter"
+
+    @pytest.mark.asyncio
+    async def test_slow_call_is_hedged(self, hedging_client):
+        """The hedge wins, the slow call is cancelled and charged an estimate."""
+        cancelled = []
+        fast = LLMResponse(
+            content="hedged", model="m", input_tokens=10, output_tokens=5,
+            total_tokens=15, cost=0.001, duration_ms=5, backend="openrouter",
+        )
+
+        async def fake_chat_once(messages, backend, model, preset, job_id, phase, hedge=False, **kwargs):
+            if backend == "openrouter-cheapskate":
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(backend)
+                    raise
+            return fast
+
+        hedging_client._chat_once = fake_chat_once
+        start_run_tracking(job_id=60)
+
+        with patch("api.services.llm.log_event") as log:
+            response = await hedging_client.chat(
+                messages=[{"role": "user", "content": "x" * 400}],
+                backend="openrouter-cheapskate",
+                phase="analyst",
+            )
+            await asyncio.sleep(0)
+
+        assert response is fast
+        assert cancelled == ["openrouter-cheapskate"]
+        tracker = get_run_tracker()
+        assert tracker.call_count == 1
+        assert tracker.calls[0]["backend"] == "openrouter-cheapskate"
+        assert tracker.total_input_tokens == estimate_request_tokens([{"role": "user", "content": "x" * 400}])
+        extras = [call.args[0].data.extra for call in log.call_args_list]
+        assert {"hedge_cancelled": True, "estimated": True} in extras
+
+    @pytest.mark.asyncio
+    async def test_fast_call_not_hedged(self, hedging_client):
+        """Calls finishing inside the delay never start a hedge."""
+        calls = []
+        fast = LLMResponse(
+            content="ok", model="m", input_tokens=1, output_tokens=1,
+            total_tokens=2, cost=0.0, duration_ms=1, backend="openrouter-cheapskate",
+        )
+
+        async def fake_chat_once(messages, backend, *args, **kwargs):
+            calls.append(backend)
+            return fast
+
+        hedging_client._chat_once = fake_chat_once
+
+        response = await hedging_client.chat(
+            messages=[{"role": "user", "content": "Hi"}],
+            backend="openrouter-cheapskate",
+            phase="analyst",
+        )
+
+        assert response is fast
+        assert calls == ["openrouter-cheapskate"]
+
+
+class TestResponseCache:
+    """Tests for serving repeated requests from the response cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_request_served_from_cache(self, llm_client, monkeypatch, tmp_path):
+        """The second identical call costs nothing and skips the provider."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        llm_client.config["response_cache"] = {
+            "enabled": True,
+            "directory": str(tmp_path),
+            "phases": ["analyst"],
+        }
+        ok = _http_response(200, json_data={
+            "model": "google/gemini-2.5-flash",
+            "choices": [{"message": {"content": "Analysis"}}],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150},
+        })
+        tracker = start_run_tracking(job_id=70)
+        messages = [{"role": "user", "content": "Analyze"}]
+
+        with patch("api.services.llm.log_event") as log, \
+             patch.object(httpx.AsyncClient, "post", new_callable=AsyncMock, return_value=ok) as post:
+            first = await llm_client.chat(messages=messages, backend="openrouter", phase="analyst")
+            second = await llm_client.chat(messages=messages, backend="openrouter", phase="analyst")
+            # Other phases are not opted in
+            await llm_client.chat(messages=messages, backend="openrouter", phase="seo")
+
+        assert post.call_count == 2
+        assert first.cache_hit is False
+        assert second.cache_hit is True
+        assert second.content == "Analysis"
+        assert second.total_tokens == 150
+        assert second.cost == 0.0
+        assert tracker.cache_hits == 1
+        assert tracker.cache_saved_cost == pytest.approx(first.cost)
+        hit_events = [c.args[0] for c in log.call_args_list if c.args[0].event_type == "api_call"]
+        assert len(hit_events) == 1
+        assert hit_events[0].data.extra["cache_hit"] is True
+
+    @pytest.mark.asyncio
+    async def test_refresh_and_invalid_structured_output(self, llm_client, monkeypatch, tmp_path):
+        """refresh_cache skips the read; invalid structured output is never stored."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        llm_client.config["response_cache"] = {
+            "enabled": True,
+            "directory": str(tmp_path),
+            "phases": ["analyst", "seo"],
+        }
+        start_run_tracking(job_id=72)
+        messages = [{"role": "user", "content": "Analyze"}]
+
+        def reply(content):
+            return _http_response(200, json_data={
+                "model": "google/gemini-2.5-flash",
+                "choices": [{"message": {"content": content}}],
+                "usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150},
+            })
+
+        with patch("api.services.llm.log_event"), \
+             patch.object(httpx.AsyncClient, "post", new_callable=AsyncMock, return_value=reply("Analysis")) as post:
+            await llm_client.chat(messages=messages, backend="openrouter", phase="analyst")
+            refreshed = await llm_client.chat(
+                messages=messages, backend="openrouter", phase="analyst", refresh_cache=True
+            )
+            assert refreshed.cache_hit is False
+            assert "refresh_cache" not in post.call_args.kwargs["json"]
+
+            post.return_value = reply('{"title": "Unclosed')
+            schema = {"name": "seo_output", "schema": {"type": "object"}}
+            for _ in range(2):
+                seo = await llm_client.chat(
+                    messages=messages, backend="openrouter", phase="seo", response_schema=schema
+                )
+                assert seo.cache_hit is False
+
+        assert post.call_count == 4
+
+    def test_disabled_by_default(self, llm_client):
+        """No cache unless enabled and the phase opts in."""
+        assert llm_client.get_response_cache("analyst") is None
+
+
+class TestPreflightEstimates:
+    """Tests for pre-flight cost estimates and the per-call cost cap check."""
+
+    def test_free_and_local_models_cost_nothing(self, llm_client):
+        assert llm_client.estimate_call_cost("openrouter", "mistralai/devstral-2-2512:free", 10_000, 1_000) == 0.0
+        assert llm_client.estimate_call_cost("openrouter", "vendor/unlisted-model:free", 10_000, 1_000) == 0.0
+        assert calculate_cost("vendor/unlisted-model:free", 10_000, 1_000) == 0.0
+
+    def test_free_preset_costs_nothing(self, llm_client):
+        """A preset on a zero-cost backend isn't priced as its fallback model."""
+        llm_client.config["backends"]["free-preset"] = {
+            **llm_client.config["backends"]["openrouter"], "cost_per_project": 0.0,
+        }
+        assert llm_client.estimate_call_cost("free-preset", "@preset/free", 10_000, 1_000) == 0.0
+        assert llm_client.estimate_call_cost("openrouter", "@preset/paid", 10_000, 1_000) > 0.0
+        assert llm_client.estimate_call_cost("openrouter", "gpt-4o", 10_000, 1_000) == pytest.approx(
+            calculate_cost("gpt-4o", 10_000, 1_000)
+        )
+
+    @pytest.mark.asyncio
+    async def test_call_refused_before_sending(self, llm_client, monkeypatch):
+        """A call whose estimate would pass the cap is never sent."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        llm_client.run_cost_cap = 0.01
+        tracker = start_run_tracking(job_id=72)
+        tracker.total_cost = 0.009
+        messages = [{"role": "user", "content": "word " * 2000}]
+
+        with patch("api.services.llm.log_event"), \
+             patch.object(httpx.AsyncClient, "post", new_callable=AsyncMock) as post:
+            with pytest.raises(CostCapExceededError, match="estimated"):
+                await llm_client.chat(messages=messages, backend="openrouter", max_tokens=4000)
+
+        post.assert_not_called()
+
+    def test_estimate_transcript(self, llm_client):
+        """Long transcripts estimate more tokens, cost and time than short ones."""
+        short = llm_client.estimate_transcript("Hello there, welcome to the program. " * 200)
+        long = llm_client.estimate_transcript("Hello there, welcome to the program. " * 2000)
+
+        assert set(short["phases"]) == {"analyst", "formatter", "seo", "manager"}
+        assert long["input_tokens"] > short["input_tokens"]
+        assert long["phases"]["formatter"]["output_tokens"] > short["phases"]["formatter"]["output_tokens"]
+        assert long["estimated_seconds"] > short["estimated_seconds"]
+        assert long["estimated_cost"] >= short["estimated_cost"]
+        assert short["estimated_cost"] == pytest.approx(
+            sum(p["estimated_cost"] for p in short["phases"].values())
+        )
+
+
+class TestMaxTokensPlanning:
+    """Tests for per-phase output token caps."""
+
+    def test_plan_scales_with_transcript(self, llm_client):
+        """The formatter cap tracks the transcript; SEO stays small."""
+        assert llm_client.plan_max_tokens("formatter", 20_000) == 30_000
+        assert llm_client.plan_max_tokens("formatter", 100) == 2000
+        assert llm_client.plan_max_tokens("seo", 20_000) == 1500
+        assert llm_client.plan_max_tokens("unknown-phase", 20_000) is None
+
+    def test_config_overrides(self, llm_client):
+        llm_client.config["max_tokens"] = {"seo": 800, "formatter": {"max": 16000}}
+        assert llm_client.plan_max_tokens("seo", 20_000) == 800
+        assert llm_client.plan_max_tokens("formatter", 20_000) == 16000
+
+    @pytest.mark.asyncio
+    async def test_backend_output_limit_caps_request(self, llm_client, monkeypatch):
+        """A backend's max_output_tokens caps the max_tokens sent to it."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        llm_client.config["backends"]["openrouter"]["max_output_tokens"] = 8192
+
+        with patch("api.services.llm.log_event"), \
+             patch.object(httpx.AsyncClient, "post", new_callable=AsyncMock,
+                          return_value=_http_response(200)) as post:
+            await llm_client.chat(
+                messages=[{"role": "user", "content": "Format"}],
+                backend="openrouter",
+                max_tokens=30_000,
+            )
+
+        assert post.call_args.kwargs["json"]["max_tokens"] == 8192
+
+    def test_shipped_backends_declare_output_limits(self):
+        """Every backend in the shipped config caps the planned max_tokens."""
+        config = json.loads((Path(__file__).parents[2] / "config" / "llm-config.json").read_text())
+        for name, backend in config["backends"].items():
+            assert backend.get("max_output_tokens"), name
+
+
+class TestContinuation:
+    """Tests for completing outputs truncated at the length limit."""
+
+    @staticmethod
+    def _completion(content, finish_reason, output_tokens=100):
+        return _http_response(200, json_data={
+            "model": "google/gemini-2.5-flash",
+            "choices": [{"message": {"content": content}, "finish_reason": finish_reason}],
+            "usage": {"prompt_tokens": 1000, "completion_tokens": output_tokens,
+                      "total_tokens": 1000 + output_tokens},
+        })
+
+    @pytest.mark.asyncio
+    async def test_truncated_output_is_continued(self, llm_client, monkeypatch):
+        """Continuations are joined, usage summed, and the prompt carries the partial."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        seam = "and the river keeps rising through the night"
+        responses = [
+            self._completion(f"Part one {seam}", "length"),
+            self._completion(f"{seam}, part two.", "stop"),
+        ]
+        messages = [{"role": "user", "content": "Format"}]
+
+        with patch("api.services.llm.log_event"), \
+             patch.object(httpx.AsyncClient, "post", new_callable=AsyncMock, side_effect=responses) as post:
+            response = await llm_client.chat(messages=messages, backend="openrouter", max_tokens=100)
+
+        assert response.content == f"Part one {seam}, part two."
+        assert response.continuations == 1
+        assert response.truncated is False
+        assert response.output_tokens == 200
+        follow_up = post.call_args_list[1].kwargs["json"]["messages"]
+        assert follow_up[:1] == messages
+        assert follow_up[1] == {"role": "assistant", "content": f"Part one {seam}"}
+        assert follow_up[2]["role"] == "user"
+
+    @pytest.mark.asyncio
+    async def test_continuations_bounded(self, llm_client, monkeypatch):
+        """At most max_continuations follow-ups; the result stays marked truncated."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        llm_client.config["continuation"] = {"max_continuations": 2}
+
+        with patch("api.services.llm.log_event"), \
+             patch.object(httpx.AsyncClient, "post", new_callable=AsyncMock,
+                          side_effect=lambda *a, **kw: self._completion("more ", "length")) as post:
+            response = await llm_client.chat(
+                messages=[{"role": "user", "content": "Format"}], backend="openrouter"
+            )
+
+        assert post.call_count == 3
+        assert response.continuations == 2
+        assert response.truncated is True
+        assert response.content == "more more more "
+
+    @pytest.mark.asyncio
+    async def test_disabled(self, llm_client, monkeypatch):
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        llm_client.config["continuation"] = {"enabled": False}
+
+        with patch("api.services.llm.log_event"), \
+             patch.object(httpx.AsyncClient, "post", new_callable=AsyncMock,
+                          return_value=self._completion("partial", "length")) as post:
+            response = await llm_client.chat(
+                messages=[{"role": "user", "content": "Format"}], backend="openrouter"
+            )
+
+        assert post.call_count == 1
+        assert response.truncated is True
+
+
+class TestReasoning:
+    """Tests for per-phase reasoning controls."""
+
+    def test_settings_merge_over_defaults(self, llm_client):
+        assert llm_client.get_reasoning_settings("formatter") == {"effort": "low", "exclude": True}
+        assert llm_client.get_reasoning_settings("analyst") is None
+
+        llm_client.config["reasoning"] = {"formatter": {"effort": "none"}, "seo": None,
+                                          "manager": {"max_tokens": 4000}}
+        assert llm_client.get_reasoning_settings("formatter") == {"effort": "none", "exclude": True}
+        assert llm_client.get_reasoning_settings("seo") is None
+        assert llm_client.get_reasoning_settings("manager") == {"max_tokens": 4000}
+
+    @pytest.mark.asyncio
+    async def test_openrouter_reasoning(self, llm_client, monkeypatch):
+        """Reasoning is sent to OpenRouter and its tokens reported separately."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        tracker = start_run_tracking(job_id=81)
+        ok = _http_response(200, json_data={
+            "model": "deepseek/deepseek-r1-0528:free",
+            "choices": [{"message": {"content": "Formatted"}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 300, "total_tokens": 400,
+                      "completion_tokens_details": {"reasoning_tokens": 250}},
+        })
+
+        with patch("api.services.llm.log_event") as log, \
+             patch.object(httpx.AsyncClient, "post", new_callable=AsyncMock, return_value=ok) as post:
+            response = await llm_client.chat(
+                messages=[{"role": "user", "content": "Format"}],
+                backend="openrouter",
+                reasoning={"effort": "low", "max_tokens": 500, "exclude": True},
+            )
+
+        assert post.call_args.kwargs["json"]["reasoning"] == {"max_tokens": 500, "exclude": True}
+        assert response.reasoning_tokens == 250
+        assert response.reasoning is None
+        assert tracker.total_reasoning_tokens == 250
+        assert log.call_args.args[0].data.extra["reasoning_tokens"] == 250
+
+    @pytest.mark.asyncio
+    async def test_anthropic_thinking_budget(self, llm_client, monkeypatch):
+        """Anthropic gets a thinking budget only when the backend opts in."""
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        base = {
+            "type": "anthropic",
+            "endpoint": "https://api.anthropic.com/v1/messages",
+            "api_key_env": "ANTHROPIC_API_KEY",
+            "model": "claude-3-5-sonnet-latest",
+        }
+        llm_client.config["backends"]["claude"] = base
+        llm_client.config["backends"]["claude-thinking"] = {**base, "reasoning": True}
+        ok = _http_response(200, json_data={
+            "content": [
+                {"type": "thinking", "thinking": "Work through the headings first."},
+                {"type": "text", "text": "Answer"},
+            ],
+            "usage": {"input_tokens": 100, "output_tokens": 50},
+            "stop_reason": "end_turn",
+        })
+        messages = [{"role": "user", "content": "Analyze"}]
+        reasoning = {"effort": "medium", "exclude": False}
+
+        with patch("api.services.llm.log_event"), \
+             patch.object(httpx.AsyncClient, "post", new_callable=AsyncMock, return_value=ok) as post:
+            plain = await llm_client.chat(messages=messages, backend="claude",
+                                          max_tokens=1000, reasoning=reasoning)
+            plain_payload = post.call_args.kwargs["json"]
+            thinking = await llm_client.chat(messages=messages, backend="claude-thinking",
+                                             max_tokens=1000, reasoning=reasoning)
+            thinking_payload = post.call_args.kwargs["json"]
+
+        assert "thinking" not in plain_payload
+        assert plain.content == "Answer"
+        assert thinking_payload["thinking"] == {"type": "enabled", "budget_tokens": 1024}
+        assert thinking_payload["max_tokens"] == 2048
+        assert thinking.content == "Answer"
+        assert thinking.reasoning == "Work through the headings first."
+        assert thinking.reasoning_tokens > 0
+
+
+class TestResponseSchema:
+    """Tests for requesting structured JSON output."""
+
+    @pytest.mark.asyncio
+    async def test_openrouter_response_format(self, llm_client, monkeypatch):
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        schema = {"name": "seo_output", "schema": {"type": "object"}}
+
+        with patch("api.services.llm.log_event"), \
+             patch.object(httpx.AsyncClient, "post", new_callable=AsyncMock,
+                          return_value=_http_response(200)) as post:
+            await llm_client.chat(
+                messages=[{"role": "user", "content": "SEO"}],
+                backend="openrouter",
+                response_schema=schema,
+            )
+
+        payload = post.call_args.kwargs["json"]
+        assert payload["response_format"] == {
+            "type": "json_schema",
+            "json_schema": {"name": "seo_output", "schema": {"type": "object"}, "strict": False},
+        }
+        assert "response_schema" not in payload
+
+    @pytest.mark.asyncio
+    async def test_continuation_drops_schema(self, llm_client, monkeypatch):
+        """A continuation is the rest of a document, not a JSON document of its own."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        responses = [
+            TestContinuation._completion('{"title": "A', "length"),
+            TestContinuation._completion('"}', "stop"),
+        ]
+
+        with patch("api.services.llm.log_event"), \
+             patch.object(httpx.AsyncClient, "post", new_callable=AsyncMock, side_effect=responses) as post:
+            await llm_client.chat(
+                messages=[{"role": "user", "content": "SEO"}],
+                backend="openrouter",
+                response_schema={"name": "seo_output", "schema": {"type": "object"}},
+            )
+
+        assert "response_format" in post.call_args_list[0].kwargs["json"]
+        assert "response_format" not in post.call_args_list[1].kwargs["json"]
+
+
+class TestCoalescing:
+    """Tests for sharing identical in-flight chat() calls."""
+
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_calls_share_one_request(self, llm_client, monkeypatch):
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        tracker = start_run_tracking(job_id=91)
+        ok = _http_response(200, json_data={
+            "model": "google/gemini-2.5-flash",
+            "choices": [{"message": {"content": "Shared"}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 1000, "completion_tokens": 100, "total_tokens": 1100},
+        })
+
+        async def slow_post(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return ok
+
+        messages = [{"role": "user", "content": "Analyze"}]
+        with patch("api.services.llm.log_event") as log, \
+             patch.object(httpx.AsyncClient, "post", new_callable=AsyncMock, side_effect=slow_post) as post:
+            first, second, other_job = await asyncio.gather(
+                llm_client.chat(messages=messages, backend="openrouter", job_id=1, phase="analyst"),
+                llm_client.chat(messages=messages, backend="openrouter", job_id=1, phase="analyst"),
+                llm_client.chat(messages=messages, backend="openrouter", job_id=2, phase="analyst"),
+            )
+            different = await llm_client.chat(
+                messages=[{"role": "user", "content": "Other"}], backend="openrouter"
+            )
+
+        # The shared call, the other job's own call and the different prompt
+        assert post.await_count == 3
+        assert first.content == second.content == different.content == "Shared"
+        coalesced = second if second.coalesced else first
+        assert coalesced.cost == 0.0
+        assert not other_job.coalesced and other_job.cost > 0.0
+        assert tracker.call_count == 3
+        events = [c.args[0] for c in log.call_args_list]
+        assert [e.data.extra.get("coalesced") for e in events if e.event_type == "api_call"] == [True]
+
+
+class TestCassette:
+    """Tests for recording and replaying chat() calls."""
+
+    @pytest.mark.asyncio
+    async def test_record_then_replay(self, llm_client, monkeypatch, tmp_path):
+        """A recorded run replays without calling the provider, costs included."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        path = tmp_path / "run.jsonl.gz"
+        ok = _http_response(200, json_data={
+            "model": "google/gemini-2.5-flash",
+            "choices": [{"message": {"content": "Analysis"}}],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150},
+        })
+        messages = [{"role": "user", "content": "Analyze"}]
+
+        llm_client.set_cassette(Cassette(path, CASSETTE_RECORD))
+        with patch("api.services.llm.log_event"), \
+             patch.object(httpx.AsyncClient, "post", new_callable=AsyncMock, return_value=ok):
+            recorded = await llm_client.chat(messages=messages, backend="openrouter", phase="analyst")
+        await llm_client.close()
+
+        llm_client.set_cassette(Cassette(path, CASSETTE_REPLAY, latency="none"))
+        tracker = start_run_tracking(job_id=71)
+        with patch("api.services.llm.log_event") as log, \
+             patch.object(httpx.AsyncClient, "post", new_callable=AsyncMock) as post:
+            replayed = await llm_client.chat(messages=messages, backend="openrouter", phase="analyst")
+            with pytest.raises(CassetteMissError):
+                await llm_client.chat(messages=messages, backend="openrouter", phase="analyst")
+
+        post.assert_not_called()
+        assert replayed.content == "Analysis"
+        assert replayed.cost == pytest.approx(recorded.cost)
+        assert replayed.duration_ms == recorded.duration_ms
+        assert tracker.total_cost == pytest.approx(recorded.cost)
+        event = log.call_args_list[0].args[0]
+        assert event.event_type == "cost_update"
+        assert event.data.extra["replayed"] is True
+
+    @pytest.mark.asyncio
+    async def test_recorded_failure_replays(self, llm_client, monkeypatch, tmp_path):
+        """Failures are recorded and raised again, at the recorded latency."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        path = tmp_path / "run.jsonl.gz"
+        messages = [{"role": "user", "content": "Analyze"}]
+
+        llm_client.set_cassette(Cassette(path, CASSETTE_RECORD))
+        with patch("api.services.llm.log_event"), \
+             patch.object(httpx.AsyncClient, "post", new_callable=AsyncMock,
+                          return_value=_http_response(400)):
+            with pytest.raises(httpx.HTTPStatusError):
+                await llm_client.chat(messages=messages, backend="openrouter", phase="seo")
+        await llm_client.close()
+
+        llm_client.set_cassette(Cassette(path, CASSETTE_REPLAY))
+        with patch("api.services.llm.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            with pytest.raises(ReplayedError, match="HTTP 400"):
+                await llm_client.chat(messages=messages, backend="openrouter", phase="seo")
+        sleep.assert_awaited_once()
+
+
+class TestFallbackChains:
+    """Tests for in-tier fallback chains."""
+
+    def test_chain_from_config(self, llm_client):
+        """Chains are keyed by tier label; strings are models on the tier backend."""
+        llm_client.config["routing"]["fallback_chains"] = {
+            "cheapskate": {
+                "chain": [
+                    "mistralai/devstral-2-2512:free",
+                    {"backend": "openrouter", "model": "google/gemini-2.5-flash"},
+                    {"backend": "missing-backend"},
+                ],
+                "max_attempts": 3,
+            }
+        }
+        llm_client.compile_routing()
+
+        candidates, budget = llm_client.get_fallback_chain(0, "openrouter-cheapskate")
+
+        assert candidates == [
+            {"backend": "openrouter-cheapskate", "model": None},
+            {"backend": "openrouter-cheapskate", "model": "mistralai/devstral-2-2512:free"},
+            {"backend": "openrouter", "model": "google/gemini-2.5-flash"},
+        ]
+        assert budget == {"max_attempts": 3, "max_seconds": None}
+
+    def test_no_chain_configured(self, llm_client):
+        """Without a chain only the tier's backend is tried."""
+        candidates, _ = llm_client.get_fallback_chain(2, "openrouter-big-brain")
+        assert candidates == [{"backend": "openrouter-big-brain", "model": None}]
+
+    @pytest.mark.asyncio
+    async def test_model_overrides_backend_preset(self, llm_client, monkeypatch):
+        """An explicit model is sent instead of the backend's preset."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        ok = _http_response(200, json_data={
+            "model": "mistralai/devstral-2-2512:free",
+            "choices": [{"message": {"content": "ok"}}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+        })
+        start_run_tracking(job_id=50)
+
+        with patch("api.services.llm.log_event"), \
+             patch.object(httpx.AsyncClient, "post", new_callable=AsyncMock, return_value=ok) as post:
+            await llm_client.chat(
+                messages=[{"role": "user", "content": "Hi"}],
+                backend="openrouter-cheapskate",
+                model="mistralai/devstral-2-2512:free",
+            )
+
+        assert post.call_args.kwargs["json"]["model"] == "mistralai/devstral-2-2512:free"
+
+
 class TestTierCalculation:
     """Tests for tier calculation logic."""
 
@@ -232,6 +962,71 @@ class TestTierCalculation:
         assert "timeout_seconds" in config
 
 
+class TestConfigHotReload:
+    """Tests for the compiled routing table and reloading it when the config file changes."""
+
+    def _rewrite(self, config_path, config):
+        """Write config and move its mtime forward so the change is seen."""
+        config_path.write_text(config if isinstance(config, str) else json.dumps(config))
+        stat = config_path.stat()
+        os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_phase_tiers_compiled_per_duration_bucket(self, llm_client):
+        routing = llm_client.routing
+        assert routing.phase_tiers["analyst"] == (0, 1, 2, 2)
+        assert routing.phase_tiers["manager"] == (2, 2, 2, 2)
+        assert routing.tier_for("analyst", 20) == (1, "duration 20min (threshold: ≤30min → tier 1)")
+        assert routing.tier_for("copy_editor", None) == (0, "phase default (base tier 0)")
+
+    def test_routing_change_on_disk_reaches_running_client(self, llm_client, mock_config, monkeypatch):
+        monkeypatch.setattr("api.services.llm.CONFIG_CHECK_INTERVAL", 0)
+        config = json.loads(mock_config.read_text())
+        config["routing"]["phase_base_tiers"]["manager"] = 1
+        config["routing"]["escalation"]["enabled"] = False
+        self._rewrite(mock_config, config)
+
+        assert llm_client.get_tier_for_phase("manager") == 1
+        assert llm_client.get_escalation_config()["enabled"] is False
+        assert llm_client.config["routing"]["phase_base_tiers"]["manager"] == 1
+
+    def test_checks_are_throttled(self, llm_client, mock_config):
+        config = json.loads(mock_config.read_text())
+        config["routing"]["phase_base_tiers"]["manager"] = 1
+        self._rewrite(mock_config, config)
+
+        assert llm_client.get_tier_for_phase("manager") == 2
+
+    def test_unreadable_config_keeps_current_routing(self, llm_client, mock_config, monkeypatch):
+        """A half-written file is ignored until a later check finds it valid."""
+        monkeypatch.setattr("api.services.llm.CONFIG_CHECK_INTERVAL", 0)
+        config = json.loads(mock_config.read_text())
+        self._rewrite(mock_config, '{"routing": {')
+
+        assert llm_client.get_tier_for_phase("manager") == 2
+
+        config["routing"]["phase_base_tiers"]["manager"] = 0
+        self._rewrite(mock_config, config)
+        assert llm_client.get_tier_for_phase("manager") == 0
+
+    def test_reload_resets_only_changed_backends_breakers(self, llm_client, mock_config, monkeypatch):
+        """An unrelated config save leaves an open circuit open."""
+        monkeypatch.setattr("api.services.llm.CONFIG_CHECK_INTERVAL", 0)
+        for name in ("openrouter", "openrouter-cheapskate"):
+            breaker = llm_client.get_breaker(name)
+            for _ in range(breaker.consecutive_failures):
+                breaker.record_failure()
+            assert breaker.state == "open"
+
+        config = json.loads(mock_config.read_text())
+        config["routing"]["phase_base_tiers"]["manager"] = 1
+        config["backends"]["openrouter"]["timeout"] = 240
+        self._rewrite(mock_config, config)
+        assert llm_client.get_tier_for_phase("manager") == 1
+
+        assert llm_client.get_breaker("openrouter").state == "closed"
+        assert llm_client.get_breaker("openrouter-cheapskate").state == "open"
+
+
 class TestCostCalculation:
     """Tests for cost calculation."""
 
@@ -283,6 +1078,36 @@ class TestCostCalculation:
 
         assert cost == 0.0
 
+    def test_calculate_cost_with_cached_tokens(self):
+        """Cached input tokens bill at the model's cached rate."""
+        cost = calculate_cost(
+            model="gpt-4o",
+            input_tokens=1000,
+            output_tokens=500,
+            cached_tokens=800,
+        )
+
+        # 200 uncached at $2.50/M + 800 cached at $1.25/M + 500 out at $10/M
+        assert cost == pytest.approx(0.0005 + 0.001 + 0.005)
+
+    def test_calculate_cost_cache_writes_and_default_discount(self):
+        """Cache writes use their own rate; unpriced models get the default discount."""
+        cost = calculate_cost(
+            model="claude-3-5-sonnet-latest",
+            input_tokens=1000,
+            output_tokens=0,
+            cache_write_tokens=1000,
+        )
+        assert cost == pytest.approx(1000 / 1_000_000 * 3.75)
+
+        cost = calculate_cost(
+            model="unknown-model",
+            input_tokens=1000,
+            output_tokens=0,
+            cached_tokens=1000,
+        )
+        assert cost == pytest.approx(1000 / 1_000_000 * 0.25)
+
 
 class TestCostTracking:
     """Tests for run cost tracking."""
@@ -457,6 +1282,34 @@ class TestAPIInteractions:
         assert response.model == "google/gemini-2.0-flash-exp"
         assert response.total_tokens == 150
 
+    @pytest.mark.asyncio
+    async def test_chat_records_tier(self, llm_client, monkeypatch):
+        """The routing tier is logged on the cost_update event, not sent."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        start_run_tracking(job_id=1)
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "choices": [{"message": {"content": "Test"}}],
+            "model": "google/gemini-2.0-flash-exp",
+            "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+        }
+
+        with patch.object(httpx.AsyncClient, "post", return_value=mock_response) as mock_post:
+            with patch("api.services.llm.log_event") as log:
+                await llm_client.chat(
+                    messages=[{"role": "user", "content": "Hello"}],
+                    backend="openrouter",
+                    phase="analyst",
+                    tier=1,
+                )
+
+        assert "tier" not in mock_post.call_args.kwargs["json"]
+        event = log.call_args.args[0]
+        assert event.event_type == "cost_update"
+        assert event.data.extra["tier"] == 1
+
     @pytest.mark.asyncio
     async def test_chat_with_preset(self, llm_client, monkeypatch):
         """Test chat with OpenRouter preset."""
@@ -509,16 +1362,587 @@ class TestAPIInteractions:
 
         mock_response = MagicMock()
         mock_response.status_code = 500
+        mock_response.headers = {}
         mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
             "Server error", request=MagicMock(), response=mock_response
         )
 
-        with patch.object(httpx.AsyncClient, "post", return_value=mock_response):
+        with patch.object(httpx.AsyncClient, "post", return_value=mock_response) as mock_post, \
+             patch("api.services.llm.asyncio.sleep", new=AsyncMock()):
             with pytest.raises(httpx.HTTPStatusError):
                 await llm_client.chat(
                     messages=[{"role": "user", "content": "Hello"}]
                 )
 
+        # 500 is transient, so every attempt is used before giving up
+        assert mock_post.call_count == DEFAULT_RETRY_SETTINGS["max_attempts"]
+
+
+def _http_response(status_code: int, headers=None, json_data=None) -> MagicMock:
+    """Build a mock httpx response whose raise_for_status matches its status."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = json_data or {
+        "choices": [{"message": {"content": "ok"}}],
+        "model": "google/gemini-2.0-flash-exp",
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    }
+    if status_code >= 400:
+        response.raise_for_status.side_effect = httpx.HTTPStatusError(
+            f"HTTP {status_code}", request=MagicMock(), response=response
+        )
+    return response
+
+
+class TestRetries:
+    """Tests for transport-level retries in LLMClient._post."""
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_then_success(self, llm_client):
+        """A 429 is retried and honours Retry-After."""
+        responses = [_http_response(429, {"Retry-After": "7"}), _http_response(200)]
+        sleep = AsyncMock()
+
+        with patch.object(httpx.AsyncClient, "post", side_effect=responses), \
+             patch("api.services.llm.asyncio.sleep", new=sleep):
+            client = await llm_client.get_client("openrouter")
+            response = await llm_client._post(client, "openrouter", "https://example.test")
+
+        assert response.status_code == 200
+        assert sleep.call_args.args[0] >= 7
+        await llm_client.close()
+
+    @pytest.mark.asyncio
+    async def test_fatal_error_not_retried(self, llm_client):
+        """Client errors such as 401 fail on the first attempt."""
+        with patch.object(httpx.AsyncClient, "post", return_value=_http_response(401)) as mock_post, \
+             patch("api.services.llm.asyncio.sleep", new=AsyncMock()) as sleep:
+            client = await llm_client.get_client("openrouter")
+            with pytest.raises(httpx.HTTPStatusError):
+                await llm_client._post(client, "openrouter", "https://example.test")
+
+        assert mock_post.call_count == 1
+        sleep.assert_not_called()
+        await llm_client.close()
+
+    @pytest.mark.asyncio
+    async def test_long_retry_after_not_waited(self, llm_client):
+        """A Retry-After beyond max_retry_after is raised for escalation."""
+        response = _http_response(429, {"Retry-After": "3600"})
+
+        with patch.object(httpx.AsyncClient, "post", return_value=response) as mock_post, \
+             patch("api.services.llm.asyncio.sleep", new=AsyncMock()):
+            client = await llm_client.get_client("openrouter")
+            with pytest.raises(httpx.HTTPStatusError):
+                await llm_client._post(client, "openrouter", "https://example.test")
+
+        assert mock_post.call_count == 1
+        await llm_client.close()
+
+    @pytest.mark.asyncio
+    async def test_connect_error_retried(self, llm_client):
+        """Connection failures are retried; backend retry settings apply."""
+        llm_client.config["backends"]["openrouter"]["retry"] = {"max_attempts": 2}
+
+        with patch.object(
+            httpx.AsyncClient, "post", side_effect=httpx.ConnectError("refused")
+        ) as mock_post, patch("api.services.llm.asyncio.sleep", new=AsyncMock()):
+            client = await llm_client.get_client("openrouter")
+            with pytest.raises(httpx.ConnectError):
+                await llm_client._post(client, "openrouter", "https://example.test")
+
+        assert mock_post.call_count == 2
+        await llm_client.close()
+
+    def test_retry_classification(self):
+        """Read timeouts and 4xx errors are fatal; 5xx and transport errors are not."""
+        assert is_retryable_error(httpx.ConnectError("x"))
+        assert not is_retryable_error(httpx.ReadTimeout("x"))
+        assert is_retryable_error(_http_response(503).raise_for_status.side_effect)
+        assert not is_retryable_error(_http_response(400).raise_for_status.side_effect)
+
+    def test_parse_retry_after(self):
+        """Retry-After accepts seconds and HTTP dates."""
+        assert parse_retry_after("12") == 12
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("garbage") is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+
+class TestCircuitBreaker:
+    """Tests for per-backend circuit breakers and failover."""
+
+    def test_opens_after_consecutive_failures(self):
+        """The circuit opens after the configured run of failures."""
+        breaker = CircuitBreaker(consecutive_failures=3, open_seconds=60)
+        for _ in range(3):
+            assert breaker.begin_call()
+            breaker.record_failure()
+
+        assert breaker.state == CIRCUIT_OPEN
+        assert not breaker.can_attempt()
+
+    def test_opens_on_failure_rate(self):
+        """The circuit opens when the windowed failure rate is too high."""
+        breaker = CircuitBreaker(
+            consecutive_failures=100, failure_rate=0.5, window_size=4, min_calls=4
+        )
+        for ok in (True, False, True, False):
+            breaker.begin_call()
+            if ok:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+
+        assert breaker.state == CIRCUIT_OPEN
+
+    def test_slow_calls_count_as_failures(self):
+        """Successful calls above slow_call_ms are recorded as failures."""
+        breaker = CircuitBreaker(consecutive_failures=2, slow_call_ms=1000)
+        breaker.record_success(duration_ms=5000)
+        breaker.record_success(duration_ms=5000)
+
+        assert breaker.state == CIRCUIT_OPEN
+
+    def test_slow_calls_allowed_by_default(self):
+        """Without slow_call_ms, long successful calls are successes."""
+        breaker = CircuitBreaker(consecutive_failures=1)
+        breaker.record_success(duration_ms=240_000)
+
+        assert breaker.state == CIRCUIT_CLOSED
+
+    def test_half_open_probe(self):
+        """After open_seconds a single probe is allowed; success closes."""
+        breaker = CircuitBreaker(consecutive_failures=1, open_seconds=0)
+        breaker.record_failure()
+        assert breaker.state == CIRCUIT_OPEN
+
+        assert breaker.begin_call()
+        assert breaker.state == CIRCUIT_HALF_OPEN
+        assert not breaker.begin_call()  # Only one probe at a time
+
+        breaker.record_success()
+        assert breaker.state == CIRCUIT_CLOSED
+
+    def test_failed_probe_reopens(self):
+        """A failed probe re-opens the circuit."""
+        breaker = CircuitBreaker(consecutive_failures=1, open_seconds=0)
+        breaker.record_failure()
+        breaker.begin_call()
+        breaker.record_failure()
+
+        assert breaker.state == CIRCUIT_OPEN
+
+    @pytest.mark.asyncio
+    async def test_chat_fails_over_when_open(self, llm_client, monkeypatch):
+        """An open circuit routes the call to fallback_backend."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        start_run_tracking(job_id=20)
+        llm_client.config["fallback_backend"] = "openrouter"
+        llm_client.get_breaker("openrouter-cheapskate").state = CIRCUIT_OPEN
+        llm_client.get_breaker("openrouter-cheapskate").opened_at = float("inf")
+
+        with patch.object(httpx.AsyncClient, "post", return_value=_http_response(200)) as mock_post, \
+             patch("api.services.llm.log_event") as mock_log:
+            response = await llm_client.chat(
+                messages=[{"role": "user", "content": "Hello"}],
+                backend="openrouter-cheapskate",
+            )
+
+        assert response.backend == "openrouter"
+        assert mock_post.call_args.kwargs["json"]["model"] == "@preset/cheapskate"
+        event_types = [c.args[0].event_type.value for c in mock_log.call_args_list]
+        assert "model_fallback" in event_types
+        await llm_client.close()
+
+    @pytest.mark.asyncio
+    async def test_chat_fails_fast_without_fallback(self, llm_client):
+        """With no usable fallback an open circuit raises immediately."""
+        start_run_tracking(job_id=21)
+        llm_client.config["fallback_backend"] = "openrouter"
+        breaker = llm_client.get_breaker("openrouter")
+        breaker.state = CIRCUIT_OPEN
+        breaker.opened_at = float("inf")
+
+        with patch.object(httpx.AsyncClient, "post") as mock_post:
+            with pytest.raises(CircuitOpenError):
+                await llm_client.chat(
+                    messages=[{"role": "user", "content": "Hello"}],
+                    backend="openrouter",
+                )
+
+        mock_post.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_chat_records_failures(self, llm_client, monkeypatch):
+        """Transient failures count against the circuit; fatal 4xx do not."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        start_run_tracking(job_id=22)
+        llm_client.config["retry"] = {"max_attempts": 1}
+
+        for status in (401, 503):
+            with patch.object(httpx.AsyncClient, "post", return_value=_http_response(status)):
+                with pytest.raises(httpx.HTTPStatusError):
+                    await llm_client.chat(
+                        messages=[{"role": "user", "content": "Hello"}],
+                        backend="openrouter",
+                    )
+
+        assert llm_client.get_breaker("openrouter").failures_in_row == 1
+        await llm_client.close()
+
+    @pytest.mark.asyncio
+    async def test_fatal_error_does_not_close_half_open_circuit(self, llm_client, monkeypatch):
+        """A 4xx on the probe call leaves the circuit open for another probe."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        start_run_tracking(job_id=23)
+        llm_client.config["retry"] = {"max_attempts": 1}
+        breaker = llm_client.get_breaker("openrouter")
+        breaker.state = CIRCUIT_OPEN
+        breaker.opened_at = 0.0
+
+        with patch.object(httpx.AsyncClient, "post", return_value=_http_response(400)):
+            with pytest.raises(httpx.HTTPStatusError):
+                await llm_client.chat(
+                    messages=[{"role": "user", "content": "Hello"}],
+                    backend="openrouter",
+                )
+
+        assert breaker.state == CIRCUIT_OPEN
+        assert breaker.can_attempt()
+        await llm_client.close()
+
+
+class TestOllamaBackend:
+    """Tests for the native Ollama backend."""
+
+    @pytest.fixture
+    def ollama_client(self, llm_client):
+        llm_client.config["backends"]["local-ollama"] = {
+            "type": "ollama",
+            "endpoint": "http://localhost:11434",
+            "model": "qwen2.5:14b",
+            "timeout": 180,
+        }
+        return llm_client
+
+    def _use_transport(self, llm_client, handler):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        llm_client.get_client = AsyncMock(return_value=client)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_streamed_chat(self, ollama_client):
+        """Streamed chunks are joined and usage comes from the final chunk."""
+        requests = []
+
+        def handler(request):
+            requests.append(json.loads(request.content))
+            lines = [
+                {"message": {"content": "Hel"}, "done": False},
+                {"message": {"content": "lo"}, "done": False},
+                {"message": {"content": ""}, "done": True, "model": "qwen2.5:14b",
+                 "prompt_eval_count": 12, "eval_count": 3},
+            ]
+            return httpx.Response(200, text="\n".join(json.dumps(l) for l in lines))
+
+        client = self._use_transport(ollama_client, handler)
+        start_run_tracking(job_id=10)
+
+        with patch("api.services.llm.log_event"):
+            response = await ollama_client.chat(
+                messages=[{"role": "user", "content": "Hi"}],
+                backend="local-ollama",
+                max_tokens=64,
+            )
+        await client.aclose()
+
+        assert response.content == "Hello"
+        assert response.input_tokens == 12
+        assert response.output_tokens == 3
+        assert response.cost == 0.0
+        assert requests[0]["stream"] is True
+        assert requests[0]["options"] == {"num_predict": 64}
+
+    @pytest.mark.asyncio
+    async def test_non_streamed_chat(self, ollama_client):
+        """stream: false uses a single JSON response."""
+        ollama_client.config["backends"]["local-ollama"]["stream"] = False
+
+        def handler(request):
+            assert request.url.path == "/api/chat"
+            return httpx.Response(200, json={
+                "model": "qwen2.5:14b",
+                "message": {"role": "assistant", "content": "Done"},
+                "done": True,
+                "prompt_eval_count": 5,
+                "eval_count": 2,
+            })
+
+        client = self._use_transport(ollama_client, handler)
+        start_run_tracking(job_id=11)
+
+        with patch("api.services.llm.log_event"):
+            response = await ollama_client.chat(
+                messages=[{"role": "user", "content": "Hi"}],
+                backend="local-ollama",
+            )
+        await client.aclose()
+
+        assert response.content == "Done"
+        assert response.total_tokens == 7
+
+    @pytest.mark.asyncio
+    async def test_stream_error_raises(self, ollama_client):
+        """An error chunk in the stream fails the call."""
+        def handler(request):
+            return httpx.Response(200, text=json.dumps({"error": "model not found"}))
+
+        client = self._use_transport(ollama_client, handler)
+        start_run_tracking(job_id=12)
+
+        with pytest.raises(RuntimeError, match="model not found"):
+            await ollama_client.chat(
+                messages=[{"role": "user", "content": "Hi"}],
+                backend="local-ollama",
+            )
+        await client.aclose()
+
+
+CACHED_MESSAGES = [
+    {"role": "system", "content": [
+        {"type": "text", "text": "## Transcript\n\n---\nHello\n---\n\n",
+         "cache_control": CACHE_CONTROL_EPHEMERAL},
+        {"type": "text", "text": "You are an analyst."},
+    ]},
+    {"role": "user", "content": "Please analyze the transcript above."},
+]
+
+
+class TestPromptCaching:
+    """Tests for cache_control markers and cached-token accounting."""
+
+    def _use_transport(self, llm_client, handler):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        llm_client.get_client = AsyncMock(return_value=client)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_anthropic_keeps_markers_and_counts_cache(self, llm_client, monkeypatch):
+        """Anthropic gets cache_control blocks; cache reads and writes are billed."""
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        llm_client.config["backends"]["anthropic"] = {
+            "type": "anthropic",
+            "endpoint": "https://api.anthropic.com/v1/messages",
+            "api_key_env": "ANTHROPIC_API_KEY",
+            "model": "claude-3-5-sonnet-latest",
+        }
+        requests = []
+
+        def handler(request):
+            requests.append(json.loads(request.content))
+            return httpx.Response(200, json={
+                "content": [{"type": "text", "text": "Analysis"}],
+                "usage": {
+                    "input_tokens": 100,
+                    "cache_read_input_tokens": 2000,
+                    "cache_creation_input_tokens": 0,
+                    "output_tokens": 50,
+                },
+            })
+
+        client = self._use_transport(llm_client, handler)
+        start_run_tracking(job_id=20)
+
+        with patch("api.services.llm.log_event"):
+            response = await llm_client.chat(messages=CACHED_MESSAGES, backend="anthropic")
+        await client.aclose()
+
+        assert requests[0]["system"][0]["cache_control"] == {"type": "ephemeral"}
+        assert response.input_tokens == 2100
+        assert response.cached_tokens == 2000
+        assert response.cost == pytest.approx(
+            calculate_cost("claude-3-5-sonnet-latest", 2100, 50, cached_tokens=2000)
+        )
+        assert get_run_tracker().total_cached_tokens == 2000
+
+    @pytest.mark.asyncio
+    async def test_openai_gets_plain_strings(self, llm_client):
+        """Backends without explicit markers get flattened content, same prefix."""
+        llm_client.config["backends"]["openai"] = {
+            "type": "openai",
+            "endpoint": "https://api.openai.com/v1/chat/completions",
+            "model": "gpt-4o",
+        }
+        requests = []
+
+        def handler(request):
+            requests.append(json.loads(request.content))
+            return httpx.Response(200, json={
+                "choices": [{"message": {"content": "Analysis"}}],
+                "usage": {
+                    "prompt_tokens": 1500,
+                    "completion_tokens": 10,
+                    "prompt_tokens_details": {"cached_tokens": 1024},
+                },
+            })
+
+        client = self._use_transport(llm_client, handler)
+        start_run_tracking(job_id=21)
+
+        with patch("api.services.llm.log_event"):
+            response = await llm_client.chat(messages=CACHED_MESSAGES, backend="openai")
+        await client.aclose()
+
+        system = requests[0]["messages"][0]["content"]
+        assert isinstance(system, str)
+        assert system.startswith("## Transcript")
+        assert system.endswith("You are an analyst.")
+        assert response.cached_tokens == 1024
+
+    def test_openrouter_markers_depend_on_model(self, llm_client):
+        """OpenRouter keeps markers only for models that need them."""
+        config = llm_client.get_backend_config("openrouter")
+
+        kept = llm_client._prepare_messages(
+            "openrouter", config, "anthropic/claude-sonnet-4.5", CACHED_MESSAGES
+        )
+        stripped = llm_client._prepare_messages(
+            "openrouter", config, "openai/gpt-4o", CACHED_MESSAGES
+        )
+        disabled = llm_client._prepare_messages(
+            "anthropic", {"prompt_caching": False}, "claude-3-5-sonnet-latest", CACHED_MESSAGES
+        )
+
+        assert kept[0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert isinstance(stripped[0]["content"], str)
+        assert isinstance(disabled[0]["content"], str)
+
+    @pytest.mark.asyncio
+    async def test_openrouter_preset_keeps_markers(self, llm_client, monkeypatch):
+        """Preset backends send the markers; the preset may route to a caching model."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        requests = []
+
+        def handler(request):
+            requests.append(json.loads(request.content))
+            return httpx.Response(200, json={
+                "choices": [{"message": {"content": "Analysis"}}],
+                "usage": {"prompt_tokens": 1500, "completion_tokens": 10},
+            })
+
+        client = self._use_transport(llm_client, handler)
+
+        with patch("api.services.llm.log_event"):
+            await llm_client.chat(messages=CACHED_MESSAGES, backend="openrouter")
+        await client.aclose()
+
+        assert requests[0]["model"] == "@preset/cheapskate"
+        assert requests[0]["messages"][0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+
+
+class TestRateLimiting:
+    """Tests for the shared per-backend rate limiter."""
+
+    def test_settings_and_shared_bucket(self, llm_client):
+        """Limits are off by default; backends can share a named bucket."""
+        assert llm_client.get_rate_limit_settings("openrouter")["requests_per_minute"] is None
+        assert llm_client.get_rate_limit_settings("openrouter")["bucket"] == "openrouter"
+
+        llm_client.config["rate_limit"] = {"requests_per_minute": 60}
+        llm_client.config["backends"]["openrouter-big-brain"]["rate_limit"] = {"bucket": "openrouter"}
+
+        settings = llm_client.get_rate_limit_settings("openrouter-big-brain")
+        assert settings["requests_per_minute"] == 60
+        assert settings["bucket"] == "openrouter"
+
+    @pytest.mark.asyncio
+    async def test_unlimited_backend_skips_database(self, llm_client):
+        """Without limits no reservation is made."""
+        with patch("api.services.llm.reserve_rate_limit", new_callable=AsyncMock) as reserve:
+            assert await llm_client._acquire_rate_limit("openrouter", []) is None
+        reserve.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_chat_waits_and_settles(self, llm_client, monkeypatch):
+        """chat() waits out the reservation and corrects the token estimate."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        llm_client.config["backends"]["openrouter"]["rate_limit"] = {
+            "requests_per_minute": 30,
+            "tokens_per_minute": 6000,
+        }
+        messages = [{"role": "user", "content": "word " * 96}]
+        estimate = estimate_request_tokens(messages, 100)
+        assert estimate == 200
+
+        mock_response = _http_response(200, json_data={
+            "model": "google/gemini-2.0-flash-exp",
+            "choices": [{"message": {"content": "ok"}}],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150},
+        })
+        start_run_tracking(job_id=30)
+
+        with patch("api.services.llm.reserve_rate_limit", new_callable=AsyncMock, return_value=2.5) as reserve, \
+             patch("api.services.llm.adjust_rate_limit", new_callable=AsyncMock) as adjust, \
+             patch("api.services.llm.asyncio.sleep", new_callable=AsyncMock) as sleep, \
+             patch("api.services.llm.log_event"), \
+             patch.object(httpx.AsyncClient, "post", new_callable=AsyncMock, return_value=mock_response):
+            await llm_client.chat(messages=messages, backend="openrouter", max_tokens=100)
+
+        reserve.assert_awaited_once_with(
+            "openrouter", request_cost=2.0, token_cost=2.0, burst_seconds=60.0
+        )
+        sleep.assert_awaited_once_with(2.5)
+        adjust.assert_awaited_once_with("openrouter", pytest.approx(-0.5))
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_reserves_nothing(self, llm_client):
+        """A call refused by the circuit breaker draws no capacity."""
+        start_run_tracking(job_id=31)
+        llm_client.config["rate_limit"] = {"requests_per_minute": 30, "tokens_per_minute": 6000}
+        llm_client.config["fallback_backend"] = "openrouter"
+        breaker = llm_client.get_breaker("openrouter")
+        breaker.state = CIRCUIT_OPEN
+        breaker.opened_at = float("inf")
+
+        with patch("api.services.llm.reserve_rate_limit", new_callable=AsyncMock) as reserve:
+            with pytest.raises(CircuitOpenError):
+                await llm_client.chat(messages=[{"role": "user", "content": "Hi"}], backend="openrouter")
+
+        reserve.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_call_settles_to_prompt(self, llm_client, monkeypatch):
+        """A failed call gives back the output part of its reservation."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        start_run_tracking(job_id=32)
+        llm_client.config["retry"] = {"max_attempts": 1}
+        llm_client.config["backends"]["openrouter"]["rate_limit"] = {"tokens_per_minute": 6000}
+        messages = [{"role": "user", "content": "word " * 96}]
+
+        with patch("api.services.llm.reserve_rate_limit", new_callable=AsyncMock, return_value=0.0), \
+             patch("api.services.llm.adjust_rate_limit", new_callable=AsyncMock) as adjust, \
+             patch.object(httpx.AsyncClient, "post", return_value=_http_response(503)):
+            with pytest.raises(httpx.HTTPStatusError):
+                await llm_client.chat(messages=messages, backend="openrouter", max_tokens=100)
+
+        # 100 reserved output tokens returned at 6000 tokens/minute
+        adjust.assert_awaited_once_with("openrouter", pytest.approx(-1.0))
+        await llm_client.close()
+
+    @pytest.mark.asyncio
+    async def test_database_errors_fail_open(self, llm_client):
+        """An unavailable database does not block LLM calls."""
+        llm_client.config["rate_limit"] = {"requests_per_minute": 10}
+
+        with patch(
+            "api.services.llm.reserve_rate_limit",
+            new_callable=AsyncMock,
+            side_effect=RuntimeError("Database not initialized"),
+        ):
+            assert await llm_client._acquire_rate_limit("openrouter", []) is None
+
 
 class TestClientManagement:
     """Tests for client lifecycle management."""
@@ -545,7 +1969,68 @@ class TestClientManagement:
         client = await llm_client.get_client()
         await llm_client.close()
 
-        assert llm_client._http_client is None
+        assert client.is_closed
+        assert llm_client._http_clients == {}
+
+    @pytest.mark.asyncio
+    async def test_client_per_backend(self, llm_client):
+        """Each backend gets its own connection pool."""
+        cheap = await llm_client.get_client("openrouter-cheapskate")
+        big = await llm_client.get_client("openrouter-big-brain")
+
+        assert cheap is not big
+        assert await llm_client.get_client("openrouter-cheapskate") is cheap
+        await llm_client.close()
+
+    @pytest.mark.asyncio
+    async def test_client_uses_backend_timeouts(self, llm_client):
+        """Backend timeout and global http settings are applied to the client."""
+        llm_client.config["http"] = {"connect_timeout": 3, "max_connections": 4}
+        llm_client.config["backends"]["openrouter-big-brain"]["timeout"] = 300
+
+        client = await llm_client.get_client("openrouter-big-brain")
+
+        assert client.timeout.read == 300
+        assert client.timeout.connect == 3
+        assert llm_client.get_http_settings("openrouter-big-brain")["max_connections"] == 4
+        await llm_client.close()
+
+    @pytest.mark.asyncio
+    async def test_client_rebuilt_when_settings_change(self, llm_client):
+        """Changing a backend's settings replaces its client.
+
+        The old client stays open for requests in flight on it until close().
+        """
+        client = await llm_client.get_client("openrouter")
+        llm_client.config["backends"]["openrouter"]["timeout"] = 42
+
+        rebuilt = await llm_client.get_client("openrouter")
+
+        assert rebuilt is not client
+        assert not client.is_closed
+        assert rebuilt.timeout.read == 42
+        await llm_client.close()
+        assert client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_warm_up_routed_backends(self, llm_client):
+        """Warm-up opens one connection per routed backend and tolerates failures."""
+        async def fake_head(self, url, **kwargs):
+            if "fail" in url:
+                raise httpx.ConnectError("unreachable")
+            return MagicMock(status_code=200)
+
+        llm_client.config["backends"]["openrouter-big-brain"]["endpoint"] = "https://fail.example/v1"
+
+        with patch.object(httpx.AsyncClient, "head", fake_head):
+            results = await llm_client.warm_up()
+
+        assert results == {
+            "openrouter": True,
+            "openrouter-cheapskate": True,
+            "openrouter-big-brain": False,
+        }
+        await llm_client.close()
 
     def test_reload_config(self, llm_client, mock_config):
         """Test reloading configuration."""
@@ -0,0 +1,68 @@
+"""Tests for the on-disk LLM response cache in api/services/response_cache.py."""
+import os
+
+from api.services.response_cache import ResponseCache, response_cache_key
+
+
+MESSAGES = [{"role": "user", "content": "Hello"}]
+
+
+class TestCacheKey:
+    """Tests for response_cache_key()."""
+
+    def test_key_is_stable(self):
+        """Parameter order does not change the key."""
+        a = response_cache_key("b", "m", MESSAGES, {"max_tokens": 10, "temperature": 0})
+        b = response_cache_key("b", "m", MESSAGES, {"temperature": 0, "max_tokens": 10})
+        assert a == b
+        assert len(a) == 64
+
+    def test_key_covers_request(self):
+        """Backend, model, messages and params all change the key."""
+        base = response_cache_key("b", "m", MESSAGES, {})
+        assert response_cache_key("other", "m", MESSAGES, {}) != base
+        assert response_cache_key("b", "other", MESSAGES, {}) != base
+        assert response_cache_key("b", "m", [{"role": "user", "content": "Hi"}], {}) != base
+        assert response_cache_key("b", "m", MESSAGES, {"max_tokens": 5}) != base
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    def test_round_trip(self, tmp_path):
+        """Stored entries are returned; unknown keys miss."""
+        cache = ResponseCache(tmp_path, max_bytes=1_000_000)
+        cache.put("ab" + "0" * 62, {"content": "cached"})
+
+        assert cache.get("ab" + "0" * 62) == {"content": "cached"}
+        assert cache.get("cd" + "0" * 62) is None
+        assert (tmp_path / "ab").is_dir()
+
+    def test_corrupt_entry_discarded(self, tmp_path):
+        """Unreadable entries are treated as misses and removed."""
+        cache = ResponseCache(tmp_path, max_bytes=1_000_000)
+        key = "ef" + "0" * 62
+        cache.put(key, {"content": "x"})
+        path = tmp_path / "ef" / f"{key}.json"
+        path.write_text("{not json")
+
+        assert cache.get(key) is None
+        assert not path.exists()
+
+    def test_lru_eviction(self, tmp_path):
+        """Least recently used entries are evicted once over max_bytes."""
+        cache = ResponseCache(tmp_path, max_bytes=600)
+        keys = [f"{i:02d}" + "0" * 62 for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, {"content": "x" * 150})
+            path = tmp_path / key[:2] / f"{key}.json"
+            os.utime(path, (1000 + i, 1000 + i))
+
+        # Touch the oldest so the middle entry becomes least recently used
+        assert cache.get(keys[0]) is not None
+
+        cache.put("99" + "0" * 62, {"content": "x" * 150})
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.get("99" + "0" * 62) is not None
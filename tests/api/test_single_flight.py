@@ -0,0 +1,124 @@
+"""Tests for coalescing concurrent calls in api/services/single_flight.py."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from api.services.airtable import AirtableClient
+from api.services.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight.do()."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one(self):
+        flights = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "result"
+
+        waiters = [asyncio.create_task(flights.do("key", fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert calls == 1
+        assert [r[0] for r in results] == ["result"] * 3
+        assert sorted(r[1] for r in results) == [False, True, True]
+        assert len(flights) == 0
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_not_shared(self):
+        flights = SingleFlight()
+        fetch = AsyncMock(return_value="result")
+
+        await flights.do("key", fetch)
+        _, shared = await flights.do("key", fetch)
+
+        assert fetch.await_count == 2
+        assert shared is False
+
+    @pytest.mark.asyncio
+    async def test_exception_shared(self):
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def fail():
+            await release.wait()
+            raise ValueError("upstream down")
+
+        waiters = [asyncio.create_task(flights.do("key", fail)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_call_running(self):
+        """Only the last waiter leaving cancels the underlying call."""
+        flights = SingleFlight()
+        release = asyncio.Event()
+        started = asyncio.Event()
+        cancelled = False
+
+        async def fetch():
+            nonlocal cancelled
+            started.set()
+            try:
+                await release.wait()
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            return "result"
+
+        first = asyncio.create_task(flights.do("key", fetch))
+        second = asyncio.create_task(flights.do("key", fetch))
+        await started.wait()
+
+        first.cancel()
+        await asyncio.sleep(0)
+        assert not cancelled
+        release.set()
+        assert await second == ("result", True)
+
+        release.clear()
+        started.clear()
+        third = asyncio.create_task(flights.do("other", fetch))
+        await started.wait()
+        third.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await third
+        await asyncio.sleep(0)
+        assert cancelled
+        assert len(flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_airtable_record_fetches_coalesced():
+    """Concurrent fetches of one SST record make one request and get their own copies."""
+    response = MagicMock()
+    response.raise_for_status.return_value = None
+    response.json.return_value = {"id": "rec123", "fields": {"Title": "Lakes"}}
+
+    async def slow_get(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return response
+
+    client = AirtableClient(api_key="test-key")
+    with patch.object(httpx.AsyncClient, "get", new_callable=AsyncMock, side_effect=slow_get) as get:
+        first, second = await asyncio.gather(
+            client.get_sst_record("rec123"),
+            AirtableClient(api_key="test-key").get_sst_record("rec123"),
+        )
+
+    assert get.await_count == 1
+    assert first == second == {"id": "rec123", "fields": {"Title": "Lakes"}}
+    assert first is not second
@@ -0,0 +1,198 @@
+"""Conformance tests run against every storage backend.
+
+SQLite always runs. PostgreSQL runs when TEST_POSTGRES_URL points at a
+disposable database, e.g.
+
+    TEST_POSTGRES_URL=postgresql+asyncpg://postgres@localhost/editorial_test
+"""
+import asyncio
+import os
+import tempfile
+
+import pytest
+import pytest_asyncio
+
+from api.services import database
+from api.services.database import (
+    init_db,
+    close_db,
+    create_job,
+    get_job,
+    claim_next_job,
+    update_heartbeat,
+    log_event,
+    get_event_rollups,
+    wait_for_job_available,
+    reserve_rate_limit,
+    adjust_rate_limit,
+)
+from api.services.storage import get_storage_backend, PostgresBackend, SQLiteBackend
+from api.models.job import JobCreate, JobStatus
+from api.models.events import EventCreate, EventType, EventData
+
+
+BACKENDS = ["sqlite", "postgresql"]
+
+
+@pytest_asyncio.fixture(params=BACKENDS)
+async def storage_db(request, monkeypatch):
+    """Initialize a clean database for each storage backend."""
+    db_path = None
+    if request.param == "sqlite":
+        fd, db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        monkeypatch.delenv("DATABASE_URL", raising=False)
+        monkeypatch.setenv("DATABASE_PATH", db_path)
+    else:
+        pg_url = os.getenv("TEST_POSTGRES_URL")
+        if not pg_url:
+            pytest.skip("TEST_POSTGRES_URL not set")
+        monkeypatch.setenv("DATABASE_URL", pg_url)
+
+    await init_db()
+
+    async with database._engine.begin() as conn:
+        await conn.run_sync(database.metadata.drop_all)
+        await conn.run_sync(database.metadata.create_all)
+
+    yield request.param
+
+    await close_db()
+
+    if db_path:
+        try:
+            os.unlink(db_path)
+        except Exception:
+            pass
+
+
+def _job(name: str, priority: int = 0) -> JobCreate:
+    return JobCreate(
+        project_name=name,
+        project_path=f"/projects/{name}",
+        transcript_file=f"/transcripts/{name}.txt",
+        priority=priority,
+    )
+
+
+class TestBackendSelection:
+    """Tests for get_storage_backend()."""
+
+    def test_backend_from_url(self):
+        """The URL scheme selects the backend."""
+        assert isinstance(get_storage_backend("sqlite+aiosqlite:///x.db"), SQLiteBackend)
+        assert isinstance(
+            get_storage_backend("postgresql+asyncpg://u@h/db"), PostgresBackend
+        )
+
+    def test_unknown_scheme_rejected(self):
+        """Unsupported databases raise ValueError."""
+        with pytest.raises(ValueError):
+            get_storage_backend("mysql+aiomysql://u@h/db")
+
+
+class TestStorageConformance:
+    """Behaviour every backend must share."""
+
+    @pytest.mark.asyncio
+    async def test_create_and_get(self, storage_db):
+        """Created jobs round-trip with timezone-aware timestamps."""
+        job = await create_job(_job("roundtrip"))
+        fetched = await get_job(job.id)
+
+        assert fetched.project_name == "roundtrip"
+        assert fetched.status == JobStatus.pending
+        assert fetched.queued_at is not None
+
+    @pytest.mark.asyncio
+    async def test_claim_respects_priority(self, storage_db):
+        """Higher priority jobs are claimed first, then FIFO."""
+        low = await create_job(_job("low", priority=0))
+        high = await create_job(_job("high", priority=5))
+
+        first = await claim_next_job()
+        second = await claim_next_job()
+
+        assert first.id == high.id
+        assert second.id == low.id
+        assert first.status == JobStatus.in_progress
+        assert first.started_at is not None
+        assert await claim_next_job() is None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_claims_never_duplicate(self, storage_db):
+        """Concurrent claimers each get a distinct job."""
+        for i in range(5):
+            await create_job(_job(f"job{i}"))
+
+        claimed = await asyncio.gather(*(claim_next_job() for _ in range(8)))
+        ids = [job.id for job in claimed if job is not None]
+
+        assert len(ids) == 5
+        assert len(set(ids)) == 5
+
+    @pytest.mark.asyncio
+    async def test_heartbeat(self, storage_db):
+        """Heartbeats are recorded on claimed jobs."""
+        await create_job(_job("beat"))
+        job = await claim_next_job()
+
+        assert await update_heartbeat(job.id) is True
+        assert (await get_job(job.id)).last_heartbeat is not None
+
+    @pytest.mark.asyncio
+    async def test_rollup_upserts(self, storage_db):
+        """cost_update events accumulate via the backend's upsert."""
+        for cost in (0.01, 0.02):
+            await log_event(EventCreate(
+                event_type=EventType.cost_update,
+                data=EventData(cost=cost, tokens=100, model="m1", duration_ms=500),
+            ))
+
+        rollups = await get_event_rollups(model="m1")
+
+        assert len(rollups) == 1
+        assert rollups[0]["calls"] == 2
+        assert rollups[0]["cost"] == pytest.approx(0.03)
+
+    @pytest.mark.asyncio
+    async def test_wait_for_job_available(self, storage_db):
+        """Postgres wakes on new jobs; SQLite times out and falls back to polling."""
+        if storage_db == "sqlite":
+            assert await wait_for_job_available(0.05) is False
+            return
+
+        # Establish the listener before the job is created
+        assert await wait_for_job_available(0.05) is False
+
+        waiter = asyncio.create_task(wait_for_job_available(5.0))
+        await asyncio.sleep(0.05)
+        await create_job(_job("notify"))
+
+        assert await asyncio.wait_for(waiter, timeout=5.0) is True
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_reservations(self, storage_db):
+        """Reservations beyond the burst capacity are told to wait."""
+        waits = [
+            await reserve_rate_limit("b", request_cost=1.0, token_cost=0.0, burst_seconds=2.0)
+            for _ in range(3)
+        ]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2] == pytest.approx(1.0, abs=0.2)
+
+        # Returning unused token capacity never makes the bucket wait longer
+        await adjust_rate_limit("b", -5.0)
+        wait = await reserve_rate_limit("b", request_cost=0.0, token_cost=1.0, burst_seconds=2.0)
+        assert wait == pytest.approx(1.0, abs=0.2)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_rate_limit_reservations(self, storage_db):
+        """Concurrent reservations each see the others' costs."""
+        waits = await asyncio.gather(*(
+            reserve_rate_limit("c", request_cost=1.0, token_cost=0.0, burst_seconds=0.0)
+            for _ in range(4)
+        ))
+
+        assert sorted(round(w) for w in waits) == [1, 2, 3, 4]
@@ -0,0 +1,65 @@
+"""Tests for structured phase output in api/services/structured_output.py."""
+import json
+
+import pytest
+
+from api.models.job import SEOMetadata
+from api.services.structured_output import (
+    StructuredOutputError,
+    extract_json,
+    parse_structured_output,
+    render_structured_output,
+    response_schema,
+)
+
+
+SEO = {
+    "title": "Wisconsin Lakes in Winter",
+    "short_description": "Ice fishing, science and community on Wisconsin's frozen lakes.",
+    "long_description": "A look at how Wisconsin's lakes change when they freeze.",
+    "tags": ["wisconsin", "lakes", "winter"],
+    "categories": ["Nature"],
+}
+
+
+class TestParseStructuredOutput:
+    """Tests for parse_structured_output()."""
+
+    def test_plain_json(self):
+        parsed = parse_structured_output("seo", json.dumps(SEO))
+        assert parsed == SEOMetadata(**SEO)
+
+    def test_fenced_json_with_prose(self):
+        text = f"Here is the metadata:\n\n```json\n{json.dumps(SEO, indent=2)}\n```\nLet me know!"
+        assert parse_structured_output("seo", text).title == SEO["title"]
+
+    def test_invalid_json(self):
+        with pytest.raises(StructuredOutputError, match="not valid JSON"):
+            parse_structured_output("seo", '{"title": "Unclosed')
+
+    def test_schema_violations_listed(self):
+        """Every problem is named so a repair request can fix them all."""
+        data = {**SEO, "title": "x" * 61}
+        del data["tags"]
+        with pytest.raises(StructuredOutputError) as error:
+            parse_structured_output("seo", json.dumps(data))
+        assert "title" in str(error.value)
+        assert "tags" in str(error.value)
+
+
+def test_extract_json_without_object():
+    assert extract_json("  no json here ") == "no json here"
+
+
+def test_response_schema():
+    schema = response_schema("seo")
+    assert schema["name"] == "seo_output"
+    assert schema["schema"]["properties"]["title"]["maxLength"] == 60
+    assert response_schema("analyst") is None
+
+
+def test_render_seo_markdown():
+    rendered = render_structured_output("seo", SEOMetadata(**SEO))
+    assert rendered.startswith("# SEO Metadata")
+    assert "## Title\nWisconsin Lakes in Winter" in rendered
+    assert "wisconsin, lakes, winter" in rendered
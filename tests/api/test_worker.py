@@ -11,6 +11,9 @@ from datetime import datetime, timezone
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch, PropertyMock
 
+from api.models.job import JobStatus
+from api.services.context_budget import merge_context_budgets
+from api.services.estimator import count_tokens
 from api.services.worker import JobWorker, WorkerConfig
 
 
@@ -34,7 +37,14 @@ def mock_llm_client():
     }
     client.get_tier_for_phase_with_reason.return_value = (0, "short transcript")
     client.get_backend_for_phase.return_value = "openrouter-cheapskate"
+    client.get_fallback_chain.side_effect = lambda tier, backend: (
+        [{"backend": backend, "model": None}],
+        {"max_attempts": None, "max_seconds": None},
+    )
     client.get_next_tier.return_value = 1
+    client.get_context_budgets.side_effect = merge_context_budgets
+    client.plan_max_tokens.return_value = 4096
+    client.get_reasoning_settings.return_value = None
     return client
 
 
@@ -46,6 +56,9 @@ def mock_llm_response():
     response.cost = 0.001
     response.total_tokens = 500
     response.model = "test-model"
+    response.continuations = 0
+    response.truncated = False
+    response.reasoning_tokens = 0
     return response
 
 
@@ -356,6 +369,57 @@ class TestBuildPhasePrompt:
         assert "Formatted" in result
         assert "Test" in result
 
+    @patch("api.services.worker.get_llm_client")
+    def test_transcript_phases_share_cacheable_prefix(self, mock_get_llm, mock_llm_client):
+        """Analyst and formatter messages start with the same cache-marked transcript."""
+        mock_get_llm.return_value = mock_llm_client
+
+        worker = JobWorker()
+        context = {
+            "transcript": "Test transcript",
+            "analyst_output": "Analysis",
+        }
+
+        analyst, _ = worker._build_phase_messages("analyst", context)
+        formatter, _ = worker._build_phase_messages("formatter", context)
+
+        prefix = analyst[0]["content"][0]
+        assert prefix == formatter[0]["content"][0]
+        assert "Test transcript" in prefix["text"]
+        assert prefix["cache_control"] == {"type": "ephemeral"}
+        assert "Test transcript" not in formatter[1]["content"]
+        assert "Analysis" in formatter[1]["content"]
+
+        seo, _ = worker._build_phase_messages("seo", context)
+        assert isinstance(seo[0]["content"], str)
+
+
+    @patch("api.services.worker.get_llm_client")
+    def test_manager_context_fitted_to_budget(self, mock_get_llm, mock_llm_client):
+        """Long manager inputs are trimmed and the trim is recorded."""
+        mock_get_llm.return_value = mock_llm_client
+
+        worker = JobWorker()
+        paragraphs = [f"SPEAKER {i}: Paragraph {i} of the formatted show." for i in range(3000)]
+        context = {
+            "transcript": "Raw transcript line.\n" * 2000,
+            "analyst_output": "## Topics\nTopic list\n\n## Speakers\nSpeaker list",
+            "formatter_output": "\n".join(paragraphs),
+            "seo_output": "Title",
+        }
+
+        messages, trimmed = worker._build_phase_messages("manager", context)
+
+        user_message = messages[1]["content"]
+        assert "Paragraph 0 of" in user_message
+        assert "Paragraph 2999 of" not in user_message
+        assert "lines omitted" in user_message
+        assert "Topic list" in user_message
+        assert context["formatter_output"] == "\n".join(paragraphs)
+        assert set(trimmed) == {"transcript", "formatter_output"}
+        assert trimmed["formatter_output"]["strategy"] == "sample"
+        assert trimmed["formatter_output"]["kept_tokens"] <= 8000
+
 
 class TestRunPhase:
     """Tests for _run_phase method."""
@@ -388,6 +452,9 @@ class TestRunPhase:
         assert result["cost"] == 0.001
         assert result["tokens"] == 500
         assert (tmp_path / "analyst_output.md").exists()
+        # Output is bounded by the phase's planned max_tokens
+        mock_llm_client.plan_max_tokens.assert_called_once_with("analyst", count_tokens("Test transcript"))
+        assert mock_llm_client.chat.call_args.kwargs["max_tokens"] == 4096
 
     @pytest.mark.asyncio
     @patch("api.services.worker.get_llm_client")
@@ -454,6 +521,125 @@ class TestRunPhase:
         assert result["success"] is False
         assert "LLM Error" in result["error"]
 
+    @pytest.mark.asyncio
+    @patch("api.services.worker.get_llm_client")
+    @patch("api.services.worker.log_event")
+    @patch("api.services.worker.AGENTS_DIR")
+    async def test_fallback_chain_before_escalation(
+        self, mock_agents_dir, mock_log_event, mock_get_llm, mock_llm_client, mock_llm_response, tmp_path
+    ):
+        """Models in the tier's chain are tried before escalating."""
+        mock_get_llm.return_value = mock_llm_client
+        mock_log_event.return_value = None
+        mock_agents_dir.__truediv__ = lambda self, name: tmp_path / name
+
+        mock_llm_client.get_fallback_chain.side_effect = lambda tier, backend: (
+            [
+                {"backend": backend, "model": None},
+                {"backend": backend, "model": "mistralai/devstral-2-2512:free"},
+                {"backend": backend, "model": "deepseek/deepseek-r1-0528:free"},
+            ],
+            {"max_attempts": 2, "max_seconds": None},
+        )
+        mock_llm_client.chat = AsyncMock(
+            side_effect=[Exception("rate limited"), Exception("model down"), mock_llm_response]
+        )
+
+        worker = JobWorker()
+        result = await worker._run_phase(
+            job_id=1,
+            phase_name="analyst",
+            context={"transcript": "Test transcript"},
+            project_path=tmp_path,
+        )
+
+        assert result["success"] is True
+        models = [call.kwargs["model"] for call in mock_llm_client.chat.call_args_list]
+        # Budget allows two attempts in tier 0; the third call is tier 1's backend default
+        assert models == [None, "mistralai/devstral-2-2512:free", None]
+        assert mock_llm_client.get_next_tier.call_count == 1
+
+    @pytest.mark.asyncio
+    @patch("api.services.worker.get_llm_client")
+    @patch("api.services.worker.log_event")
+    @patch("api.services.worker.AGENTS_DIR")
+    async def test_seo_output_repaired_and_stored(
+        self, mock_agents_dir, mock_log_event, mock_get_llm, mock_llm_client, mock_llm_response, tmp_path
+    ):
+        """Invalid SEO JSON gets one repair request; the valid result is stored."""
+        mock_get_llm.return_value = mock_llm_client
+        mock_log_event.return_value = None
+        mock_agents_dir.__truediv__ = lambda self, name: tmp_path / name
+
+        seo = {
+            "title": "Wisconsin Lakes in Winter",
+            "short_description": "Life on frozen lakes.",
+            "long_description": "How Wisconsin's lakes change when they freeze.",
+            "tags": ["lakes", "winter"],
+            "categories": [],
+        }
+        invalid = MagicMock()
+        invalid.model = "test-model"
+        invalid.content = json.dumps({**seo, "title": "x" * 80})
+        invalid.cost = 0.001
+        invalid.total_tokens = 500
+        invalid.continuations = 0
+        invalid.truncated = False
+        invalid.reasoning_tokens = 0
+        mock_llm_response.content = json.dumps(seo)
+        mock_llm_client.chat = AsyncMock(side_effect=[invalid, mock_llm_response])
+
+        worker = JobWorker()
+        with patch("api.services.worker.update_job", new=AsyncMock()) as mock_update_job:
+            result = await worker._run_phase(
+                job_id=1,
+                phase_name="seo",
+                context={"transcript": "Test transcript", "analyst_output": "A", "formatter_output": "F"},
+                project_path=tmp_path,
+            )
+
+        assert result["success"] is True
+        assert result["structured"] == {"valid": True, "repaired": True}
+        assert result["cost"] == pytest.approx(0.002)
+        first_call, repair_call = mock_llm_client.chat.call_args_list
+        assert first_call.kwargs["response_schema"]["name"] == "seo_output"
+        assert "title" in repair_call.kwargs["messages"][-1]["content"]
+        assert json.loads((tmp_path / "seo_output.json").read_text())["title"] == seo["title"]
+        assert (tmp_path / "seo_output.md").read_text().startswith("# SEO Metadata")
+        stored = mock_update_job.call_args.args[1].seo_metadata
+        assert stored.title == seo["title"]
+
+    @pytest.mark.asyncio
+    @patch("api.services.worker.get_llm_client")
+    @patch("api.services.worker.log_event")
+    @patch("api.services.worker.AGENTS_DIR")
+    async def test_fallback_chain_without_escalation(
+        self, mock_agents_dir, mock_log_event, mock_get_llm, mock_llm_client, mock_llm_response, tmp_path
+    ):
+        """The chain still applies when tier escalation is disabled."""
+        mock_get_llm.return_value = mock_llm_client
+        mock_log_event.return_value = None
+        mock_agents_dir.__truediv__ = lambda self, name: tmp_path / name
+
+        mock_llm_client.get_escalation_config.return_value = {"enabled": False}
+        mock_llm_client.get_fallback_chain.side_effect = lambda tier, backend: (
+            [{"backend": backend, "model": None}, {"backend": "openrouter", "model": None}],
+            {"max_attempts": None, "max_seconds": None},
+        )
+        mock_llm_client.chat = AsyncMock(side_effect=[Exception("down"), mock_llm_response])
+
+        worker = JobWorker()
+        result = await worker._run_phase(
+            job_id=1,
+            phase_name="analyst",
+            context={"transcript": "Test transcript"},
+            project_path=tmp_path,
+        )
+
+        assert result["success"] is True
+        assert mock_llm_client.chat.call_args_list[1].kwargs["backend"] == "openrouter"
+        mock_llm_client.get_next_tier.assert_not_called()
+
 
 class TestHeartbeatLoop:
     """Tests for _heartbeat_loop method."""
@@ -489,12 +675,10 @@ class TestAnalyzeAndRecover:
     @patch("api.services.worker.get_llm_client")
     @patch("api.services.worker.log_event")
     @patch("api.services.worker.update_job_phase")
-    @patch("api.services.worker.update_job_status")
     @patch("api.services.worker.AGENTS_DIR")
     async def test_recovery_action_fail(
         self,
         mock_agents_dir,
-        mock_update_status,
         mock_update_phase,
         mock_log_event,
         mock_get_llm,
@@ -505,7 +689,6 @@ class TestAnalyzeAndRecover:
         mock_get_llm.return_value = mock_llm_client
         mock_log_event.return_value = None
         mock_update_phase.return_value = None
-        mock_update_status.return_value = None
         mock_agents_dir.__truediv__ = lambda self, name: tmp_path / name
 
         # Manager returns FAIL action
@@ -534,7 +717,7 @@ class TestProcessJob:
 
     @pytest.mark.asyncio
     @patch("api.services.worker.get_llm_client")
-    @patch("api.services.worker.update_job_status")
+    @patch("api.services.worker.transition_job")
     @patch("api.services.worker.update_job_phase")
     @patch("api.services.worker.update_job_heartbeat")
     @patch("api.services.worker.log_event")
@@ -553,7 +736,7 @@ class TestProcessJob:
         mock_log_event,
         mock_update_heartbeat,
         mock_update_phase,
-        mock_update_status,
+        mock_transition,
         mock_get_llm,
         mock_llm_client,
         mock_llm_response,
@@ -563,12 +746,12 @@ class TestProcessJob:
         """Should successfully process a job through all phases."""
         mock_get_llm.return_value = mock_llm_client
         mock_llm_client.chat = AsyncMock(return_value=mock_llm_response)
-        mock_update_status.return_value = None
         mock_update_phase.return_value = None
         mock_update_heartbeat.return_value = None
         mock_log_event.return_value = None
-        mock_start_tracking.return_value = MagicMock(total_cost=0, total_tokens=0)
+        mock_start_tracking.return_value = MagicMock(total_cost=0.01, total_tokens=2000)
         mock_end_tracking.return_value = {"total_cost": 0.01, "total_tokens": 2000}
+        mock_transition.return_value = MagicMock()
 
         # Set up paths
         mock_transcripts_dir.__truediv__ = lambda self, name: tmp_path / name
@@ -579,16 +762,168 @@ class TestProcessJob:
         (tmp_path / sample_job["transcript_file"]).write_text("Test transcript content")
 
         worker = JobWorker()
-        await worker.process_job(sample_job)
-
-        # Verify job was marked completed
-        calls = mock_update_status.call_args_list
-        final_call = calls[-1]
-        # The final status should be completed
-        assert any(
-            call.args[1].value == "completed" if hasattr(call.args[1], "value") else call.args[1] == "completed"
-            for call in calls
-        ) or mock_update_status.called
+        await worker.process_job({**sample_job, "actual_cost": 0.5})
+
+        # Verify job was marked completed, conditionally on still running,
+        # with the run's cost added to the previous total
+        final_call = mock_transition.call_args
+        assert final_call.args[1] == {JobStatus.in_progress}
+        assert final_call.args[2] == JobStatus.completed
+        assert final_call.kwargs["fields"]["actual_cost"] == pytest.approx(0.51)
+
+
+class TestJobInterruption:
+    """Tests for pause/cancel propagation into running jobs."""
+
+    def _patches(self):
+        return [
+            patch("api.services.worker.update_job_phase", new=AsyncMock()),
+            patch("api.services.worker.update_job_heartbeat", new=AsyncMock()),
+            patch("api.services.worker.log_event", new=AsyncMock()),
+            patch("api.services.worker.start_run_tracking"),
+            patch(
+                "api.services.worker.end_run_tracking",
+                new=AsyncMock(return_value={"total_cost": 0.02, "total_tokens": 100}),
+            ),
+        ]
+
+    @pytest.mark.asyncio
+    @patch("api.services.worker.get_llm_client")
+    @patch("api.services.worker.TRANSCRIPTS_DIR")
+    @patch("api.services.worker.OUTPUT_DIR")
+    @patch("api.services.worker.AGENTS_DIR")
+    async def test_cancel_interrupts_in_flight_call(
+        self,
+        mock_agents_dir,
+        mock_output_dir,
+        mock_transcripts_dir,
+        mock_get_llm,
+        mock_llm_client,
+        tmp_path,
+        sample_job,
+    ):
+        """A cancel observed by the heartbeat loop abandons the running LLM call."""
+        mock_get_llm.return_value = mock_llm_client
+
+        async def slow_chat(*args, **kwargs):
+            await asyncio.sleep(30)
+
+        mock_llm_client.chat = AsyncMock(side_effect=slow_chat)
+        mock_transcripts_dir.__truediv__ = lambda self, name: tmp_path / name
+        mock_output_dir.__truediv__ = lambda self, name: tmp_path / name
+        mock_agents_dir.__truediv__ = lambda self, name: tmp_path / name
+        (tmp_path / sample_job["transcript_file"]).write_text("Test transcript content")
+
+        patches = self._patches()
+        for p in patches:
+            p.start()
+        try:
+            with patch("api.services.worker.transition_job", new=AsyncMock(return_value=MagicMock())) as mock_transition, \
+                 patch("api.services.worker.get_job_status", new=AsyncMock(return_value=JobStatus.cancelled)), \
+                 patch("api.services.worker.update_job", new=AsyncMock()) as mock_update_job:
+                worker = JobWorker(config=WorkerConfig(control_check_interval=0.05))
+                await asyncio.wait_for(
+                    worker.process_job({**sample_job, "actual_cost": 0.5}), timeout=5
+                )
+
+                # Partial cost is added to the previous total; status is left as cancelled
+                job_update = mock_update_job.call_args.args[1]
+                assert job_update.actual_cost == pytest.approx(0.52)
+                assert job_update.status is None
+                statuses = [c.args[2] for c in mock_transition.call_args_list]
+                assert JobStatus.failed not in statuses
+                assert JobStatus.completed not in statuses
+                assert worker._heartbeat_tasks == {}
+        finally:
+            for p in patches:
+                p.stop()
+
+    @pytest.mark.asyncio
+    @patch("api.services.worker.get_llm_client")
+    @patch("api.services.worker.TRANSCRIPTS_DIR")
+    @patch("api.services.worker.OUTPUT_DIR")
+    @patch("api.services.worker.AGENTS_DIR")
+    async def test_pause_between_phases(
+        self,
+        mock_agents_dir,
+        mock_output_dir,
+        mock_transcripts_dir,
+        mock_get_llm,
+        mock_llm_client,
+        tmp_path,
+        sample_job,
+    ):
+        """A paused job is not flipped back to in_progress at the next phase."""
+        mock_get_llm.return_value = mock_llm_client
+        mock_llm_client.chat = AsyncMock()
+        mock_transcripts_dir.__truediv__ = lambda self, name: tmp_path / name
+        mock_output_dir.__truediv__ = lambda self, name: tmp_path / name
+        mock_agents_dir.__truediv__ = lambda self, name: tmp_path / name
+        (tmp_path / sample_job["transcript_file"]).write_text("Test transcript content")
+
+        patches = self._patches()
+        for p in patches:
+            p.start()
+        try:
+            with patch("api.services.worker.transition_job", new=AsyncMock(return_value=None)), \
+                 patch("api.services.worker.get_job_status", new=AsyncMock(return_value=JobStatus.paused)), \
+                 patch("api.services.worker.update_job", new=AsyncMock()) as mock_update_job:
+                worker = JobWorker()
+                await worker.process_job(sample_job)
+
+                mock_llm_client.chat.assert_not_called()
+                assert mock_update_job.call_args.args[1].actual_cost == pytest.approx(0.02)
+        finally:
+            for p in patches:
+                p.stop()
+
+    @pytest.mark.asyncio
+    @patch("api.services.worker.get_llm_client")
+    @patch("api.services.worker.TRANSCRIPTS_DIR")
+    @patch("api.services.worker.OUTPUT_DIR")
+    @patch("api.services.worker.AGENTS_DIR")
+    async def test_cancel_then_phase_failure_skips_recovery(
+        self,
+        mock_agents_dir,
+        mock_output_dir,
+        mock_transcripts_dir,
+        mock_get_llm,
+        mock_llm_client,
+        tmp_path,
+        sample_job,
+    ):
+        """A failure after a cancel leaves the job cancelled and never calls the manager."""
+        mock_get_llm.return_value = mock_llm_client
+        mock_llm_client.generate = AsyncMock()
+        mock_transcripts_dir.__truediv__ = lambda self, name: tmp_path / name
+        mock_output_dir.__truediv__ = lambda self, name: tmp_path / name
+        mock_agents_dir.__truediv__ = lambda self, name: tmp_path / name
+        (tmp_path / sample_job["transcript_file"]).write_text("Test transcript content")
+
+        async def transition(job_id, allowed_from, to, fields=None):
+            # The cancel lands while the first phase runs
+            return None if to == JobStatus.investigating else MagicMock()
+
+        patches = self._patches()
+        for p in patches:
+            p.start()
+        try:
+            with patch("api.services.worker.transition_job", new=AsyncMock(side_effect=transition)) as mock_transition, \
+                 patch("api.services.worker.get_job_status", new=AsyncMock(return_value=JobStatus.cancelled)), \
+                 patch("api.services.worker.update_job", new=AsyncMock()) as mock_update_job:
+                worker = JobWorker()
+                worker._run_phase = AsyncMock(return_value={"success": False, "error": "Phase failed"})
+                await worker.process_job(sample_job)
+
+                mock_llm_client.generate.assert_not_called()
+                statuses = [c.args[2] for c in mock_transition.call_args_list]
+                assert statuses[-1] == JobStatus.investigating
+                assert JobStatus.failed not in statuses
+                assert mock_update_job.call_args.args[1].status is None
+                assert mock_update_job.call_args.args[1].actual_cost == pytest.approx(0.02)
+        finally:
+            for p in patches:
+                p.stop()
 
 
 class TestWorkerStart:
@@ -14,7 +14,7 @@ interface EscalationConfig {
 }
 
 interface RoutingConfig {
-  tiers: string[]
+  tiers: Array<string | string[]>
   tier_labels: string[]
   duration_thresholds: DurationThreshold[]
   phase_base_tiers: Record<string, number>